@@ -0,0 +1,27 @@
+# Distributed under the OSI-approved BSD 3-Clause License.  See accompanying
+# file LICENSE.rst or https://cmake.org/licensing for details.
+
+cmake_minimum_required(VERSION ${CMAKE_VERSION}) # this file comes with cmake
+
+# If CMAKE_DISABLE_SOURCE_CHANGES is set to true and the source directory is an
+# existing directory in our source tree, calling file(MAKE_DIRECTORY) on it
+# would cause a fatal error, even though it would be a no-op.
+if(NOT EXISTS "/root/package/.setuptools-cmake-build/_deps/nanobind-src")
+  file(MAKE_DIRECTORY "/root/package/.setuptools-cmake-build/_deps/nanobind-src")
+endif()
+file(MAKE_DIRECTORY
+  "/root/package/.setuptools-cmake-build/_deps/nanobind-build"
+  "/root/package/.setuptools-cmake-build/_deps/nanobind-subbuild/nanobind-populate-prefix"
+  "/root/package/.setuptools-cmake-build/_deps/nanobind-subbuild/nanobind-populate-prefix/tmp"
+  "/root/package/.setuptools-cmake-build/_deps/nanobind-subbuild/nanobind-populate-prefix/src/nanobind-populate-stamp"
+  "/root/package/.setuptools-cmake-build/_deps/nanobind-subbuild/nanobind-populate-prefix/src"
+  "/root/package/.setuptools-cmake-build/_deps/nanobind-subbuild/nanobind-populate-prefix/src/nanobind-populate-stamp"
+)
+
+set(configSubDirs )
+foreach(subDir IN LISTS configSubDirs)
+    file(MAKE_DIRECTORY "/root/package/.setuptools-cmake-build/_deps/nanobind-subbuild/nanobind-populate-prefix/src/nanobind-populate-stamp/${subDir}")
+endforeach()
+if(cfgdir)
+  file(MAKE_DIRECTORY "/root/package/.setuptools-cmake-build/_deps/nanobind-subbuild/nanobind-populate-prefix/src/nanobind-populate-stamp${cfgdir}") # cfgdir has leading slash
+endif()
@@ -0,0 +1,4 @@
+# This file is generated by 'gen_proto.py'. DO NOT EDIT!
+
+
+from .onnx_ml_pb2 import *  # noqa
@@ -1175,7 +1175,17 @@ void check_model(
     bool full_check,
     bool skip_opset_compatibility_check,
     bool check_custom_domain) {
+  check_model_with_dir(model, "", full_check, skip_opset_compatibility_check, check_custom_domain);
+}
+
+void check_model_with_dir(
+    const ModelProto& model,
+    const std::string& model_dir,
+    bool full_check,
+    bool skip_opset_compatibility_check,
+    bool check_custom_domain) {
   CheckerContext ctx;
+  ctx.set_model_dir(model_dir);
   ctx.set_skip_opset_compatibility_check(skip_opset_compatibility_check);
   ctx.set_check_custom_domain(check_custom_domain);
   check_model(model, ctx);
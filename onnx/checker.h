@@ -187,6 +187,14 @@ ONNX_API void check_model(
     bool full_check = false,
     bool skip_opset_compatibility_check = false,
     bool check_custom_domain = false);
+// Checks a model loaded from a file in model_dir, external data
+// locations are resolved relative to that directory.
+ONNX_API void check_model_with_dir(
+    const ModelProto& model,
+    const std::string& model_dir,
+    bool full_check = false,
+    bool skip_opset_compatibility_check = false,
+    bool check_custom_domain = false);
 std::filesystem::path resolve_external_data_location(
     const std::string& base_dir,
     const std::string& location,
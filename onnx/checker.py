@@ -25,6 +25,7 @@ import os
 from typing import TYPE_CHECKING
 
 import onnx.defs
+import onnx.external_data_helper
 import onnx.onnx_cpp2py_export.checker as C  # noqa: N812
 from onnx.onnx_pb import IR_VERSION
 
@@ -122,6 +123,7 @@ def check_model(
     full_check: bool = False,
     skip_opset_compatibility_check: bool = False,
     check_custom_domain: bool = False,
+    initializer_size_threshold: int | None = None,
 ) -> None:
     """Check the consistency of a model.
 
@@ -141,6 +143,11 @@ def check_model(
             opset compatibility.
         check_custom_domain: If True, the function will check all domains. Otherwise
             only check built-in domains.
+        initializer_size_threshold: If not None and model is a ModelProto, the raw data
+            of the initializers of the main graph holding at least this number of bytes
+            is not serialized, only their name, dims, data type and length are checked.
+            Models bigger than 2GB can then be checked in memory. With full_check,
+            shape inference fails if it needs the values of one of them.
     """
     # If model is a path instead of ModelProto
     if isinstance(model, (str, os.PathLike)):
@@ -151,9 +158,15 @@ def check_model(
             check_custom_domain,
         )
     else:
-        protobuf_string = (
-            model if isinstance(model, bytes) else model.SerializeToString()
-        )
+        if isinstance(model, bytes):
+            protobuf_string = model
+        elif initializer_size_threshold is not None:
+            model, _ = onnx.external_data_helper._strip_initializer_data(
+                model, initializer_size_threshold
+            )
+            protobuf_string = model.SerializeToString()
+        else:
+            protobuf_string = model.SerializeToString()
         # If the protobuf is larger than 2GiB,
         # remind users should use the model path to check
         if len(protobuf_string) > MAXIMUM_PROTOBUF:
@@ -22,7 +22,9 @@
 #include <vector>
 
 #include "onnx/checker.h"
+#include "onnx/common/file_utils.h"
 #include "onnx/common/ir_pb_converter.h"
+#include "onnx/common/path.h"
 #include "onnx/defs/parser.h"
 #include "onnx/defs/printer.h"
 #include "onnx/defs/schema.h"
@@ -218,6 +220,15 @@ static auto MakeChecker(void (*check_fn)(const ProtoType&, const Ctx&...)) {
   };
 }
 
+// A model parsed once and kept in C++. The checker, shape inference, the version
+// converter and the inliner run on it in place, the model is serialized again
+// only when Python asks for the result.
+struct ModelSession {
+  ModelProto model;
+  // Directory of the file the model was loaded from, external data are checked relative to it.
+  std::string model_dir;
+};
+
 NB_MODULE(onnx_cpp2py_export, onnx_cpp2py_export) {
   // Disabling nanobind leak warnings
   // TODO(#7283): Avoid leaks if possible
@@ -792,6 +803,132 @@ NB_MODULE(onnx_cpp2py_export, onnx_cpp2py_export) {
         return result;
       });
 
+  nb::class_<shape_inference::IncrementalShapeInference>(
+      shape_inference, "IncrementalShapeInference", "Types of the values seen so far kept in C++ between the nodes.")
+      .def(
+          "__init__",
+          [](shape_inference::IncrementalShapeInference* self,
+             const std::unordered_map<std::string, int>& opset_imports,
+             const std::vector<nb::bytes>& functions_bytes,
+             int ir_version,
+             bool check_type,
+             bool strict_mode,
+             bool data_prop) {
+            ShapeInferenceOptions options{check_type, strict_mode ? 1 : 0, data_prop};
+            new (self) shape_inference::IncrementalShapeInference(
+                opset_imports,
+                options,
+                ParseProtoVector<FunctionProto>(functions_bytes),
+                OpSchemaRegistry::Instance(),
+                ir_version);
+          },
+          nb::arg("opset_imports"),
+          nb::arg("functions"),
+          nb::arg("ir_version"),
+          nb::arg("check_type") = false,
+          nb::arg("strict_mode") = false,
+          nb::arg("data_prop") = false)
+      .def(
+          "add_value_info",
+          [](shape_inference::IncrementalShapeInference& self, const nb::bytes& bytes) {
+            ValueInfoProto proto{};
+            ParseProtoFromPyBytes(&proto, bytes);
+            self.AddValueInfo(proto);
+          })
+      .def(
+          "add_initializer",
+          [](shape_inference::IncrementalShapeInference& self, const nb::bytes& bytes) {
+            TensorProto proto{};
+            ParseProtoFromPyBytes(&proto, bytes);
+            self.AddInitializer(proto);
+          })
+      .def(
+          "infer_node",
+          [](shape_inference::IncrementalShapeInference& self, const nb::bytes& bytes) {
+            NodeProto proto{};
+            ParseProtoFromPyBytes(&proto, bytes);
+            std::vector<nb::object> result;
+            for (const auto* type_proto : self.InferNode(proto)) {
+              result.push_back(type_proto == nullptr ? nb::none() : nb::object(ProtoToBytes(*type_proto)));
+            }
+            return result;
+          })
+      .def("get_type", [](shape_inference::IncrementalShapeInference& self, const std::string& name) {
+        const auto* type_proto = self.GetType(name);
+        return type_proto == nullptr ? nb::none() : nb::object(ProtoToBytes(*type_proto));
+      });
+
+  // Submodule `model_session`
+  auto model_session = onnx_cpp2py_export.def_submodule("model_session");
+  model_session.doc() = "Model session submodule";
+
+  nb::class_<ModelSession>(model_session, "ModelSession", "Model kept in C++ between several steps.")
+      .def_static(
+          "from_bytes",
+          [](const nb::bytes& bytes) {
+            ModelSession session;
+            ParseProtoFromPyBytes(&session.model, bytes);
+            return session;
+          },
+          nb::arg("bytes"))
+      .def_static(
+          "from_path",
+          [](const std::string& path) {
+            ModelSession session;
+            LoadProtoFromPath(path, session.model);
+            size_t pos = path.find_last_of("\\/");
+            if (pos != std::string::npos) {
+              session.model_dir = path.substr(0, pos + 1);
+            }
+            return session;
+          },
+          nb::arg("path"))
+      .def(
+          "check_model",
+          [](const ModelSession& self, bool full_check, bool skip_opset_compatibility_check, bool check_custom_domain) {
+            checker::check_model_with_dir(
+                self.model, self.model_dir, full_check, skip_opset_compatibility_check, check_custom_domain);
+          },
+          nb::arg("full_check") = false,
+          nb::arg("skip_opset_compatibility_check") = false,
+          nb::arg("check_custom_domain") = false)
+      .def(
+          "infer_shapes",
+          [](ModelSession& self, bool check_type, bool strict_mode, bool data_prop) {
+            ShapeInferenceOptions options{check_type, strict_mode ? 1 : 0, data_prop};
+            shape_inference::InferShapes(self.model, OpSchemaRegistry::Instance(), options);
+          },
+          nb::arg("check_type") = false,
+          nb::arg("strict_mode") = false,
+          nb::arg("data_prop") = false)
+      .def(
+          "convert_version",
+          [](ModelSession& self, int target) {
+            shape_inference::InferShapes(self.model);
+            self.model = version_conversion::ConvertVersion(self.model, target);
+          },
+          nb::arg("target"))
+      .def(
+          "inline_local_functions",
+          [](ModelSession& self, bool convert_version) { inliner::InlineLocalFunctions(self.model, convert_version); },
+          nb::arg("convert_version") = false)
+      .def("to_bytes", [](const ModelSession& self) { return ProtoToBytes(self.model); })
+      .def(
+          "save",
+          [](const ModelSession& self, const std::string& path) {
+            // Use SerializeToString instead of SerializeToOstream due to LITE_PROTO
+            std::string model_string;
+            if (!self.model.SerializeToString(&model_string)) {
+              fail_check("Unable to serialize the model to save it to: ", path);
+            }
+            std::fstream output(utf8_to_path(path), std::ios::out | std::ios::trunc | std::ios::binary);
+            output << model_string;
+            if (!output.good()) {
+              fail_check("Unable to save the model to: ", path);
+            }
+          },
+          nb::arg("path"));
+
   // Submodule `parser`
   auto parser = onnx_cpp2py_export.def_submodule("parser");
   parser.doc() = "Parser submodule";
@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: Apache-2.0
 from __future__ import annotations
 
+import mmap
 import os
 import re
 import sys
@@ -52,6 +53,14 @@ _ALLOWED_EXTERNAL_DATA_KEYS = frozenset(
 _SORTED_ALLOWED_KEYS = sorted(_ALLOWED_EXTERNAL_DATA_KEYS)
 _MAX_UNKNOWN_KEYS_IN_WARNING = 10
 _MAX_KEY_DISPLAY_LENGTH = 100
+# Number of elements stored in one byte by the packed tensor types.
+_PACKED_ELEMENTS_PER_BYTE: dict[int, int] = {
+    TensorProto.UINT4: 2,
+    TensorProto.INT4: 2,
+    TensorProto.FLOAT4E2M1: 2,
+    TensorProto.UINT2: 4,
+    TensorProto.INT2: 4,
+}
 
 
 class ExternalDataInfo:
@@ -106,19 +115,20 @@ class ExternalDataInfo:
                 )
 
 
-def _validate_external_data_file_bounds(
+def _get_external_data_range(
     data_file: IO[bytes],
     info: ExternalDataInfo,
     tensor_name: str,
-) -> bytes:
-    """Validate offset/length against actual file size and read data.
+) -> tuple[int, int]:
+    """Validate offset/length against actual file size.
 
     Layer 3 defense-in-depth (CWE-400): prevents memory exhaustion even if the
     model was crafted via direct protobuf APIs that bypass Python parsing.
 
-    Returns the raw bytes read from the file.
+    Returns the offset and the length of the data in the file.
     """
     file_size = os.fstat(data_file.fileno()).st_size
+    read_start = 0
 
     if info.offset is not None:
         if info.offset > file_size:
@@ -126,19 +136,55 @@ def _validate_external_data_file_bounds(
                 f"External data offset ({info.offset}) exceeds file size "
                 f"({file_size}) for tensor {tensor_name!r}"
             )
-        data_file.seek(info.offset)
+        read_start = info.offset
 
+    available = file_size - read_start
     if info.length is not None:
-        read_start = info.offset if info.offset is not None else 0
-        available = file_size - read_start
         if info.length > available:
             raise ValueError(
                 f"External data length ({info.length}) exceeds available data "
                 f"({available} bytes from offset {read_start}) "
                 f"for tensor {tensor_name!r}"
             )
-        return data_file.read(info.length)
-    return data_file.read()
+        return read_start, info.length
+    return read_start, available
+
+
+def _validate_external_data_file_bounds(
+    data_file: IO[bytes],
+    info: ExternalDataInfo,
+    tensor_name: str,
+) -> bytes:
+    """Validate offset/length against actual file size and read data.
+
+    Returns the raw bytes read from the file.
+    """
+    offset, length = _get_external_data_range(data_file, info, tensor_name)
+    data_file.seek(offset)
+    return data_file.read(length)
+
+
+def _map_external_data_file(
+    data_file: IO[bytes],
+    info: ExternalDataInfo,
+    tensor_name: str,
+) -> memoryview:
+    """Validate offset/length against actual file size and map the data in memory.
+
+    Returns a read-only view on the mapped data.
+    """
+    offset, length = _get_external_data_range(data_file, info, tensor_name)
+    if length == 0:
+        return memoryview(b"")
+    # The mapping must start at a multiple of the allocation granularity.
+    start = offset - offset % mmap.ALLOCATIONGRANULARITY
+    mapped = mmap.mmap(
+        data_file.fileno(),
+        length + offset - start,
+        access=mmap.ACCESS_READ,
+        offset=start,
+    )
+    return memoryview(mapped)[offset - start :]
 
 
 def load_external_data_for_tensor(tensor: TensorProto, base_dir: str) -> None:
@@ -157,6 +203,25 @@ def load_external_data_for_tensor(tensor: TensorProto, base_dir: str) -> None:
         )
 
 
+def map_external_data_for_tensor(tensor: TensorProto, base_dir: str) -> memoryview:
+    """Maps the external data of a tensor in memory instead of reading it.
+    Nothing is read until the data is accessed and the tensor is not modified.
+
+    Arguments:
+        tensor: a TensorProto object.
+        base_dir: directory that contains the external data.
+
+    Returns:
+        a read-only memoryview on the data stored in the external file,
+        the file remains mapped as long as the view (or any array built
+        on it) exists
+    """
+    info = ExternalDataInfo(tensor)
+    fd = _open_external_data_fd(base_dir, info.location, tensor.name, True)
+    with os.fdopen(fd, "rb") as data_file:
+        return _map_external_data_file(data_file, info, tensor.name)
+
+
 def load_external_data_for_model(model: ModelProto, base_dir: str) -> None:
     """Loads external tensors into model
 
@@ -412,3 +477,97 @@ def write_external_data_tensors(model: ModelProto, filepath: str) -> ModelProto:
             tensor.ClearField("raw_data")
 
     return model
+
+
+def _copy_fields_but(source, destination, field_name: str) -> None:
+    """Copies every field of a message into another one except *field_name*."""
+    for field, value in source.ListFields():
+        if field.name == field_name:
+            continue
+        if field.label == field.LABEL_REPEATED:
+            getattr(destination, field.name).extend(value)
+        elif field.type == field.TYPE_MESSAGE:
+            getattr(destination, field.name).CopyFrom(value)
+        else:
+            setattr(destination, field.name, value)
+
+
+def _raw_data_length(tensor: TensorProto, stub: TensorProto) -> int:
+    """Returns the number of bytes of the raw data of *tensor*,
+    *stub* is the same tensor without raw data. The difference of
+    their serialized sizes is the tag, the varint length and the data,
+    the data itself is not read.
+    """
+    encoded = tensor.ByteSize() - stub.ByteSize() - 1
+    for varint_size in range(1, 11):
+        length = encoded - varint_size
+        if length < 1 << (7 * varint_size):
+            return length
+    raise RuntimeError(f"Unexpected size for tensor {tensor.name!r}.")
+
+
+def _can_check_without_data(tensor: TensorProto, length: int) -> bool:
+    """Tells if the checker accepts the tensor based on its metadata only,
+    the checker looks into the raw data of packed types and strings.
+    """
+    if tensor.data_type == TensorProto.STRING:
+        return False
+    nelem = 1
+    for d in tensor.dims:
+        nelem *= d
+    if nelem <= 0:
+        return False
+    per_byte = _PACKED_ELEMENTS_PER_BYTE.get(tensor.data_type, 1)
+    return bool(per_byte == 1 or length >= (nelem + per_byte - 1) // per_byte)
+
+
+def _strip_initializer_data(
+    model: ModelProto, size_threshold: int
+) -> tuple[ModelProto, list[int]]:
+    """Returns a copy of the model where the initializers of the main graph
+    holding at least *size_threshold* bytes of raw data only keep their
+    metadata, and the positions of these initializers.
+
+    Their name, dims and data type are unchanged, their data is replaced
+    by an in-memory external location (starting with '#', the checker
+    does not look for a file) and the length of the data. The input model
+    is not modified and the stripped data is never copied.
+    """
+    stripped_model = ModelProto()
+    _copy_fields_but(model, stripped_model, "graph")
+    _copy_fields_but(model.graph, stripped_model.graph, "initializer")
+    stripped = []
+    for i, tensor in enumerate(model.graph.initializer):
+        new_tensor = stripped_model.graph.initializer.add()
+        if tensor.HasField("raw_data") and tensor.ByteSize() >= size_threshold:
+            _copy_fields_but(tensor, new_tensor, "raw_data")
+            length = _raw_data_length(tensor, new_tensor)
+            if length >= size_threshold and _can_check_without_data(tensor, length):
+                new_tensor.data_location = TensorProto.EXTERNAL
+                for key, value in [
+                    ("location", f"#initializer{i}"),
+                    ("length", length),
+                ]:
+                    entry = new_tensor.external_data.add()
+                    entry.key = key
+                    entry.value = str(value)
+                stripped.append(i)
+                continue
+        new_tensor.CopyFrom(tensor)
+    return stripped_model, stripped
+
+
+def _restore_initializer_data(
+    model: ModelProto, original: ModelProto, stripped: list[int]
+) -> None:
+    """Replaces the initializers stripped by :func:`_strip_initializer_data`
+    by the original ones.
+    """
+    for i in stripped:
+        tensor = original.graph.initializer[i]
+        if model.graph.initializer[i].name != tensor.name:
+            raise RuntimeError(
+                f"Initializer {i} is {model.graph.initializer[i].name!r}, "
+                f"{tensor.name!r} was expected."
+            )
+        model.graph.initializer[i].CopyFrom(tensor)
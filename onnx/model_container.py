@@ -7,6 +7,7 @@ bigger than 2 Gb.
 
 from __future__ import annotations
 
+import contextlib
 import os
 import sys
 from typing import TYPE_CHECKING, Any
@@ -152,7 +153,7 @@ class ModelContainer:
                 )
 
     def _save_external(
-        self, file_path: str, all_tensors_to_one_file: bool
+        self, file_path: str, all_tensors_to_one_file: bool, alignment: int = 1
     ) -> onnx.ModelProto:
         """Save the large model into a main onnx file and one file
         per tensor. Follows the same format as :func:`write_external_data_tensors
@@ -163,10 +164,14 @@ class ModelContainer:
         Arguments:
             file_path: model file
             all_tensors_to_one_file: all tensors in one file
+            alignment: if all tensors are saved in one file, every tensor
+                starts at an offset multiple of this value
 
         Returns:
             modified main model proto
         """
+        if alignment < 1:
+            raise ValueError(f"alignment must be positive not {alignment}.")
 
         def _clean_name(prefix: str, name: str, unique_names: dict[str, int]) -> str:
             if prefix:
@@ -190,51 +195,62 @@ class ModelContainer:
         copy.ParseFromString(proto)
         prefix = os.path.splitext(os.path.split(file_path)[-1])[0]
 
-        if all_tensors_to_one_file:
-            file_weight = f"{os.path.split(file_path)[1]}.weight"
-            full_file_weight = f"{file_path}.weight"
-            offset = 0
-            with open(full_file_weight, "wb") as f:
-                pass
-
-        for tensor in ext_data._get_all_tensors(copy):
-            if not ext_data.uses_external_data(tensor):
-                continue
-            prop: onnx.StringStringEntryProto | None = None
-            for ext in tensor.external_data:
-                if ext.key == "location":
-                    prop = ext
-            if prop is None:
-                raise RuntimeError(
-                    f"No location found for tensor name {tensor.name!r}."
-                )
-            if prop.value not in self.large_initializers:
-                raise RuntimeError(
-                    f"Unable to find large tensor named {tensor.name!r} "
-                    f"with location {prop.value!r} in "
-                    f"{sorted(self.large_initializers)}."
-                )
-            np_tensor = self.large_initializers[prop.value]
-
-            tensor_bytes = onnx.numpy_helper.tobytes_little_endian(np_tensor)
-
+        with contextlib.ExitStack() as stack:
             if all_tensors_to_one_file:
-                _set_external_data(
-                    tensor,
-                    location=file_weight,
-                    offset=offset,
-                    length=len(tensor_bytes),
+                file_weight = f"{os.path.split(file_path)[1]}.weight"
+                # Only one file handle for all tensors.
+                weight_file = stack.enter_context(open(f"{file_path}.weight", "wb"))
+                offset = 0
+
+            for tensor in ext_data._get_all_tensors(copy):
+                if not ext_data.uses_external_data(tensor):
+                    continue
+                prop: onnx.StringStringEntryProto | None = None
+                for ext in tensor.external_data:
+                    if ext.key == "location":
+                        prop = ext
+                if prop is None:
+                    raise RuntimeError(
+                        f"No location found for tensor name {tensor.name!r}."
+                    )
+                if prop.value not in self.large_initializers:
+                    raise RuntimeError(
+                        f"Unable to find large tensor named {tensor.name!r} "
+                        f"with location {prop.value!r} in "
+                        f"{sorted(self.large_initializers)}."
+                    )
+                np_tensor = self.large_initializers[prop.value]
+
+                if np_tensor.dtype.byteorder == ">" or (
+                    sys.byteorder == "big" and np_tensor.dtype.byteorder == "="
+                ):
+                    np_tensor = np_tensor.astype(np_tensor.dtype.newbyteorder("<"))
+                # The array buffer is written as it is, no bytes object is
+                # created unless the array is not contiguous.
+                tensor_buffer = (
+                    np.ascontiguousarray(np_tensor).reshape(-1).view(np.uint8).data
                 )
-                offset += len(tensor_bytes)
-                with open(full_file_weight, "ab") as f:
-                    f.write(tensor_bytes)
-            else:
-                name = f"{_clean_name(prefix, prop.value, unique_names)}.weight"
-                _set_external_data(tensor, location=name)
-                full_name = os.path.join(folder, name)
-                prop.value = name
-                with open(full_name, "wb") as f:
-                    f.write(tensor_bytes)
+
+                if all_tensors_to_one_file:
+                    padding = -offset % alignment
+                    if padding:
+                        weight_file.write(b"\0" * padding)
+                        offset += padding
+                    _set_external_data(
+                        tensor,
+                        location=file_weight,
+                        offset=offset,
+                        length=tensor_buffer.nbytes,
+                    )
+                    offset += tensor_buffer.nbytes
+                    weight_file.write(tensor_buffer)
+                else:
+                    name = f"{_clean_name(prefix, prop.value, unique_names)}.weight"
+                    _set_external_data(tensor, location=name)
+                    full_name = os.path.join(folder, name)
+                    prop.value = name
+                    with open(full_name, "wb") as f:
+                        f.write(tensor_buffer)
 
         with open(file_path, "wb") as f:
             f.write(copy.SerializeToString())
@@ -244,6 +260,7 @@ class ModelContainer:
         self,
         file_path: str,
         all_tensors_to_one_file: bool = False,
+        alignment: int = 1,
     ) -> onnx.ModelProto:
         """Save the large model.
         The function returns a ModelProto,
@@ -255,15 +272,25 @@ class ModelContainer:
             file_path: model file
             all_tensors_to_one_file: saves all large tensors in one file or
                 one file per lerge tensor
+            alignment: if all large tensors are saved in one file, every
+                tensor starts at an offset multiple of this value,
+                4096 (the page size) lets the file be mapped efficiently
 
         Returns:
             the saved ModelProto
         """
         return self._save_external(
-            file_path, all_tensors_to_one_file=all_tensors_to_one_file
+            file_path,
+            all_tensors_to_one_file=all_tensors_to_one_file,
+            alignment=alignment,
         )
 
-    def load(self, file_path: str, load_large_initializers: bool = True):
+    def load(
+        self,
+        file_path: str,
+        load_large_initializers: bool = True,
+        mmap: bool = False,
+    ):
         """Load the large model.
 
         Arguments:
@@ -272,16 +299,20 @@ class ModelContainer:
                 if not done, the model is incomplete but it can be used to
                 look into the model without executing it and method
                 :meth:`_load_large_initializers` can be used to load them later
+            mmap: maps the weight files in memory instead of reading them,
+                the large initializers are then read-only arrays and
+                the data is only read from disk when it is accessed
         """
         self.model_proto_ = onnx.load_model(file_path, load_external_data=False)
         if load_large_initializers:
-            self._load_large_initializers(file_path)
+            self._load_large_initializers(file_path, mmap=mmap)
 
-    def _load_large_initializers(self, file_path):
+    def _load_large_initializers(self, file_path, mmap: bool = False):
         """Loads large initializers.
 
         Arguments:
             file_path: model file, the weight are expected to be in the same folder as this file
+            mmap: maps the weight files in memory instead of reading them
         """
         if self.model_proto_ is None:
             raise RuntimeError("A model must be loaded before loading the weights.")
@@ -293,27 +324,33 @@ class ModelContainer:
 
             info = ext_data.ExternalDataInfo(tensor)
             key = f"#t{i}"
-            _set_external_data(tensor, location=key)
 
             fd = ext_data._open_external_data_fd(
                 base_dir, info.location, tensor.name, True
             )
+            raw_data: bytes | memoryview
             with os.fdopen(fd, "rb") as data_file:
-                raw_data = ext_data._validate_external_data_file_bounds(
-                    data_file, info, tensor.name
-                )
-
-                dtype = onnx.helper.tensor_dtype_to_np_dtype(tensor.data_type)
-                shape = tuple(tensor.dims)
-
-                if sys.byteorder == "big":
-                    np_tensor = (
-                        np.frombuffer(raw_data, dtype=dtype).byteswap().reshape(shape)
+                if mmap:
+                    raw_data = ext_data._map_external_data_file(
+                        data_file, info, tensor.name
                     )
                 else:
-                    np_tensor = np.frombuffer(raw_data, dtype=dtype).reshape(shape)
+                    raw_data = ext_data._validate_external_data_file_bounds(
+                        data_file, info, tensor.name
+                    )
+            _set_external_data(tensor, location=key)
+
+            dtype = onnx.helper.tensor_dtype_to_np_dtype(tensor.data_type)
+            shape = tuple(tensor.dims)
+
+            if sys.byteorder == "big":
+                np_tensor = (
+                    np.frombuffer(raw_data, dtype=dtype).byteswap().reshape(shape)
+                )
+            else:
+                np_tensor = np.frombuffer(raw_data, dtype=dtype).reshape(shape)
 
-                self.large_initializers[key] = np_tensor
+            self.large_initializers[key] = np_tensor
 
 
 def make_large_model(
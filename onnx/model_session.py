@@ -0,0 +1,107 @@
+# Copyright (c) ONNX Project Contributors
+#
+# SPDX-License-Identifier: Apache-2.0
+"""Runs several steps on a model parsed only once.
+
+:func:`onnx.checker.check_model`, :func:`onnx.shape_inference.infer_shapes`,
+:func:`onnx.version_converter.convert_version` and
+:func:`onnx.inliner.inline_local_functions` serialize the whole model,
+parse it again in C++ and most of them parse the result back in python.
+A :class:`ModelSession` keeps the parsed model in C++, every step modifies
+it in place and the model is serialized only when the result is requested.
+
+::
+
+    session = ModelSession("model.onnx")
+    session.check_model().inline_local_functions().infer_shapes()
+    model = session.convert_version(21).to_proto()
+"""
+
+from __future__ import annotations
+
+import os
+
+import onnx
+import onnx.onnx_cpp2py_export.model_session as C  # noqa: N812
+from onnx import ModelProto
+
+
+class ModelSession:
+    """Model kept in C++ between several steps.
+
+    Every step returns the session so that they can be chained.
+
+    Arguments:
+        model: ModelProto, serialized model or path to a model, a model
+            loaded from a path is never parsed in python and its external
+            data are checked relative to its directory
+    """
+
+    def __init__(self, model: ModelProto | bytes | str | os.PathLike):
+        if isinstance(model, ModelProto):
+            self._session = C.ModelSession.from_bytes(model.SerializeToString())
+        elif isinstance(model, bytes):
+            self._session = C.ModelSession.from_bytes(model)
+        elif isinstance(model, (str, os.PathLike)):
+            self._session = C.ModelSession.from_path(os.fspath(model))
+        else:
+            raise TypeError(
+                f"ModelSession only accepts ModelProto, bytes or a path, "
+                f"incorrect type: {type(model)}"
+            )
+
+    def check_model(
+        self,
+        full_check: bool = False,
+        skip_opset_compatibility_check: bool = False,
+        check_custom_domain: bool = False,
+    ) -> ModelSession:
+        """Checks the model, see :func:`onnx.checker.check_model`.
+        The model is not modified.
+        """
+        self._session.check_model(
+            full_check, skip_opset_compatibility_check, check_custom_domain
+        )
+        return self
+
+    def infer_shapes(
+        self,
+        check_type: bool = False,
+        strict_mode: bool = False,
+        data_prop: bool = False,
+    ) -> ModelSession:
+        """Adds the inferred shapes to the model,
+        see :func:`onnx.shape_inference.infer_shapes`.
+        """
+        self._session.infer_shapes(check_type, strict_mode, data_prop)
+        return self
+
+    def convert_version(self, target_version: int) -> ModelSession:
+        """Converts the model to another opset,
+        see :func:`onnx.version_converter.convert_version`.
+        """
+        if not isinstance(target_version, int):
+            raise TypeError(
+                f"VersionConverter only accepts int as target_version, incorrect type: {type(target_version)}"
+            )
+        self._session.convert_version(target_version)
+        return self
+
+    def inline_local_functions(self, convert_version: bool = False) -> ModelSession:
+        """Inlines the model-local functions,
+        see :func:`onnx.inliner.inline_local_functions`.
+        """
+        self._session.inline_local_functions(convert_version)
+        return self
+
+    def to_bytes(self) -> bytes:
+        """Returns the serialized model."""
+        return self._session.to_bytes()
+
+    def to_proto(self) -> ModelProto:
+        """Returns the model as a ModelProto."""
+        return onnx.load_from_string(self._session.to_bytes())
+
+    def save(self, path: str | os.PathLike) -> None:
+        """Saves the model without going through python."""
+        self._session.save(os.fspath(path))
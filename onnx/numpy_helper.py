@@ -184,7 +184,9 @@ def _pack_2bitx4(array: np.ndarray) -> npt.NDArray[np.uint8]:
     return array_flat[0::4] | array_flat[1::4] | array_flat[2::4] | array_flat[3::4]
 
 
-def to_array(tensor: onnx.TensorProto, base_dir: str = "") -> np.ndarray:  # noqa: PLR0911
+def to_array(  # noqa: PLR0911
+    tensor: onnx.TensorProto, base_dir: str = "", mmap: bool = False
+) -> np.ndarray:
     """Converts a tensor def object to a numpy array.
 
     This function uses ml_dtypes if the dtype is not a native numpy dtype.
@@ -192,6 +194,9 @@ def to_array(tensor: onnx.TensorProto, base_dir: str = "") -> np.ndarray:  # noq
     Args:
         tensor: a TensorProto object.
         base_dir: if external tensor exists, base_dir can help to find the path to it
+        mmap: if the tensor is external, the file is mapped in memory
+            instead of being loaded into the tensor, the returned array
+            is then a read-only view on the file if no conversion is needed
 
     Returns:
         arr: the converted array.
@@ -214,13 +219,21 @@ def to_array(tensor: onnx.TensorProto, base_dir: str = "") -> np.ndarray:  # noq
         ss = [s.decode("utf-8") for s in utf8_strings]
         return np.asarray(ss).astype(np_dtype).reshape(dims)
 
+    raw_data: bytes | memoryview | None = None
     # Load raw data from external tensor if it exists
     if onnx.external_data_helper.uses_external_data(tensor):
-        onnx.external_data_helper.load_external_data_for_tensor(tensor, base_dir)
+        if mmap:
+            raw_data = onnx.external_data_helper.map_external_data_for_tensor(
+                tensor, base_dir
+            )
+        else:
+            onnx.external_data_helper.load_external_data_for_tensor(tensor, base_dir)
 
-    if tensor.HasField("raw_data"):
-        # Raw_bytes support: using frombuffer.
+    if raw_data is None and tensor.HasField("raw_data"):
         raw_data = tensor.raw_data
+
+    if raw_data is not None:
+        # Raw_bytes support: using frombuffer.
         if sys.byteorder == "big":
             # Convert endian from little to big
             raw_data = np.frombuffer(raw_data, dtype=np_dtype).byteswap().tobytes()
@@ -0,0 +1,28 @@
+# Copyright (c) ONNX Project Contributors
+#
+# SPDX-License-Identifier: Apache-2.0
+
+class ModelSession:
+    """Model kept in C++ between several steps."""
+
+    @staticmethod
+    def from_bytes(bytes: bytes) -> ModelSession: ...  # noqa: A002
+    @staticmethod
+    def from_path(path: str) -> ModelSession: ...
+    def check_model(
+        self,
+        full_check: bool = False,
+        skip_opset_compatibility_check: bool = False,
+        check_custom_domain: bool = False,
+    ) -> None: ...
+    def infer_shapes(
+        self,
+        check_type: bool = False,
+        strict_mode: bool = False,
+        data_prop: bool = False,
+    ) -> None: ...
+    def convert_version(self, target: int) -> None:
+        """Runs shape inference then converts the model to the target opset."""
+    def inline_local_functions(self, convert_version: bool = False) -> None: ...
+    def to_bytes(self) -> bytes: ...
+    def save(self, path: str) -> None: ...
@@ -43,3 +43,18 @@ def infer_function_output_types(
     input_types: list[bytes],
     attributes: list[bytes],
 ) -> list[bytes]: ...
+
+class IncrementalShapeInference:
+    def __init__(
+        self,
+        opset_imports: dict[str, int],
+        functions: list[bytes],
+        ir_version: int,
+        check_type: bool = False,
+        strict_mode: bool = False,
+        data_prop: bool = False,
+    ) -> None: ...
+    def add_value_info(self, b: bytes) -> None: ...
+    def add_initializer(self, b: bytes) -> None: ...
+    def infer_node(self, b: bytes) -> list[bytes | None]: ...
+    def get_type(self, name: str) -> bytes | None: ...
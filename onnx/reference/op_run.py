@@ -206,6 +206,8 @@ class OpRun(abc.ABC):
                 verbose=max(0, self.run_params.get("verbose", 0) - 2),
                 new_ops=None if new_ops is None else list(new_ops.values()),
                 functions=functions,
+                compiled=self.run_params.get("compiled", False),
+                lazy_initializers=self.run_params.get("lazy_initializers", False),
             )
 
         conversion_function = _attribute_conversion_function(att.type)  # type: ignore[arg-type]
@@ -226,12 +228,16 @@ class OpRun(abc.ABC):
         )
 
     @staticmethod
-    def _evaluate_subgraph(context, value, attributes):
+    def _evaluate_subgraph(context, value, attributes, bound=None):
+        if context and bound is not None:
+            # only the inputs and the captured names reach the subgraph
+            context = {name: context[name] for name in bound if name in context}
         return value.run(None, context or {}, attributes=attributes)
 
     def _load_attributes(self) -> None:
         """Checks and loads attributes."""
         self.has_linked_attribute = False
+        self.subgraph_captures_: dict[str, list[str]] = {}
         added_attributes = []
         for att in self.onnx_node.attribute:
             name = att.name
@@ -245,11 +251,18 @@ class OpRun(abc.ABC):
             if att.type == onnx.AttributeProto.GRAPH:
                 self.has_subgraph = True
                 self.has_linked_attribute |= value.has_linked_attribute  # type: ignore[attr-defined]
+                captured = OpRun.implicit_inputs(att.g)
+                self.subgraph_captures_[name] = captured
+                bound = (
+                    None
+                    if isinstance(value, RefAttrName)
+                    else (*value.input_names, *captured)
+                )
                 setattr(
                     self,
                     f"_run_{att.name}",
-                    lambda context, value=value, attributes=None: (
-                        OpRun._evaluate_subgraph(context, value, attributes)
+                    lambda context, value=value, attributes=None, bound=bound: (
+                        OpRun._evaluate_subgraph(context, value, attributes, bound)
                     ),
                 )
 
@@ -278,24 +291,32 @@ class OpRun(abc.ABC):
     def implicit_inputs(graph: onnx.GraphProto) -> list[str]:
         """Returns all variables not registered as inputs and not produced by
         an node inside the graph. This inputs are part of the context
-        existing in the graph calling this one.
+        existing in the graph calling this one. They include the names
+        captured by nested subgraphs and the outputs the graph returns
+        without computing them, in order of first use.
         """
         if not isinstance(graph, onnx.GraphProto):
             raise TypeError(f"Unexpected type {type(graph)!r}.")
-        local = set()
-        known = set()
-        for init in graph.initializer:
-            known.add(init.name)
-        for sparse_init in graph.sparse_initializer:
-            known.add(sparse_init.name)  # type: ignore[attr-defined]
-        for inp in graph.input:
-            known.add(inp.name)
+        known = {i.name for i in graph.input}
+        known.update(i.name for i in graph.initializer)
+        known.update(i.name for i in graph.sparse_initializer)  # type: ignore[attr-defined]
+        local: dict[str, None] = {}
         for node in graph.node:
-            for o in node.output:
-                known.add(o)
-            for i in node.input:
-                if i not in known:
-                    local.add(i)
+            names = list(node.input)
+            for att in node.attribute:
+                # A nested subgraph may capture a name from any enclosing scope.
+                if att.type == onnx.AttributeProto.GRAPH:
+                    names.extend(OpRun.implicit_inputs(att.g))
+                elif att.type == onnx.AttributeProto.GRAPHS:
+                    for g in att.graphs:
+                        names.extend(OpRun.implicit_inputs(g))
+            for name in names:
+                if name and name not in known:
+                    local[name] = None
+            known.update(node.output)
+        for o in graph.output:
+            if o.name not in known:
+                local[o.name] = None
         return list(local)
 
     @property
@@ -469,6 +490,25 @@ class OpRun(abc.ABC):
         )
         return self._check_and_fix_outputs(res)
 
+    def bound_kwargs(self) -> dict[str, Any] | None:
+        """Returns the keyword arguments method :meth:`run` gives to
+        method ``_run`` if they never change from one call to another.
+        The result can then be computed once and method ``_run`` called
+        directly. It returns None when the node needs the context,
+        has a linked attribute or when its class overwrites method
+        :meth:`run` to add its own checks.
+        """
+        if (
+            self.need_context()
+            or self.has_linked_attribute
+            or type(self).run is not OpRun.run
+        ):
+            return None
+        kwargs = {att: getattr(self, att) for att in self.attributes_names_}
+        if self.has_subgraph:
+            kwargs["attributes"] = None
+        return kwargs
+
     @classmethod
     def infer_name(cls):
         name = cls.__name__
@@ -3,8 +3,11 @@
 # SPDX-License-Identifier: Apache-2.0
 from __future__ import annotations
 
+from collections import OrderedDict
 from typing import Any
 
+import numpy as np
+
 from onnx.reference.op_run import OpRun
 
 
@@ -65,3 +68,43 @@ def build_registered_operators_any_domain(
         max_version = max(impl)  # type: ignore[type-var]
         impl[None] = impl[max_version]
     return reg_ops
+
+
+class _PlanCache(OrderedDict):
+    """Keeps the plans an operator computed for the last input shapes.
+
+    Only the `maxsize` most recently used plans are kept,
+    a model with dynamic shapes would otherwise grow the cache
+    for every new shape it meets.
+    """
+
+    def __init__(self, maxsize: int = 16):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        self.move_to_end(key)
+        return self[key]
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+def _unique_inverse(values: list) -> tuple[list, np.ndarray]:
+    """Returns the distinct values in order of first appearance and
+    the position of every value in that list. Python objects are hashed
+    as they are, unlike :func:`numpy.unique` which needs a fixed-width
+    copy of a string tensor to sort it.
+    """
+    positions: dict[Any, int] = {}
+    inverse = np.fromiter(
+        (positions.setdefault(v, len(positions)) for v in values),
+        dtype=np.intp,
+        count=len(values),
+    )
+    return list(positions), inverse
@@ -0,0 +1,143 @@
+# Copyright (c) ONNX Project Contributors
+
+# SPDX-License-Identifier: Apache-2.0
+"""Helpers shared by the recurrent operators RNN, GRU and LSTM.
+
+The input projection ``X W^T`` does not depend on the hidden state,
+it is computed for every timestep and every direction with one
+matrix multiplication. Only the recurrent part is left in the loop
+over timesteps, every direction is processed at the same time.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def _rnn_reversed_directions(direction: str, num_directions: int) -> list[bool]:
+    if num_directions == 2:
+        return [False, True]
+    return [direction == "reverse"]
+
+
+def _rnn_prepare(
+    X: np.ndarray,
+    initial_states: list[np.ndarray | None],
+    num_directions: int,
+    hidden_size: int,
+    layout: int,
+    dtype,
+) -> tuple[np.ndarray, list[np.ndarray]]:
+    """Returns X as (seq_length, batch_size, input_size) and the initial states
+    as (num_directions, batch_size, hidden_size), missing ones are zeros.
+    """
+    if layout:
+        X = np.swapaxes(X, 0, 1)
+    batch_size = X.shape[1]
+    states = []
+    for initial in initial_states:
+        if initial is None:
+            state = np.zeros((num_directions, batch_size, hidden_size), dtype=dtype)
+        else:
+            state = np.swapaxes(initial, 0, 1) if layout else initial
+        states.append(state.astype(dtype, copy=False))
+    return X.astype(dtype, copy=False), states
+
+
+def _rnn_sequence_indices(
+    sequence_lens: np.ndarray | None, seq_length: int, batch_size: int
+) -> tuple[np.ndarray | None, np.ndarray]:
+    """Returns the mask of the valid timesteps, None if every timestep is valid,
+    and for every timestep and batch, the timestep a reverse direction reads.
+    """
+    steps = np.arange(seq_length)[:, np.newaxis]
+    if sequence_lens is None:
+        lengths = np.full((batch_size,), seq_length, dtype=np.int64)
+    else:
+        lengths = np.minimum(
+            np.asarray(sequence_lens, dtype=np.int64).reshape((batch_size,)),
+            seq_length,
+        )
+    mask = steps < lengths
+    reverse = np.where(mask, lengths - 1 - steps, steps)
+    return (None if mask.all() else mask), reverse
+
+
+def _rnn_project_inputs(
+    X: np.ndarray,
+    W: np.ndarray,
+    bias: np.ndarray | None,
+    reversed_directions: list[bool],
+    reverse: np.ndarray,
+) -> np.ndarray:
+    """Computes ``X W^T + bias`` for all timesteps and directions at once.
+
+    Returns an array of shape (num_directions, seq_length, batch_size, gates),
+    the timesteps of every reverse direction are stored in processing order.
+    """
+    seq_length, batch_size, input_size = X.shape
+    projected = np.matmul(X.reshape((-1, input_size)), np.transpose(W, (0, 2, 1)))
+    projected = projected.reshape((W.shape[0], seq_length, batch_size, -1))
+    if bias is not None:
+        projected += bias[:, np.newaxis, np.newaxis, :]
+    batch = np.arange(batch_size)
+    for d, reversed_direction in enumerate(reversed_directions):
+        if reversed_direction:
+            projected[d] = projected[d][reverse, batch]
+    return projected
+
+
+def _rnn_run(
+    cell: Callable[[np.ndarray, tuple[np.ndarray, ...]], tuple[np.ndarray, ...]],
+    projected: np.ndarray,
+    states: list[np.ndarray],
+    mask: np.ndarray | None,
+    reverse: np.ndarray,
+    reversed_directions: list[bool],
+) -> tuple[np.ndarray, list[np.ndarray]]:
+    """Runs the recurrence over the projected inputs.
+
+    *cell* receives the projected inputs of one timestep and the current
+    states, all of shape (num_directions, batch_size, ...), and returns
+    the new states, the hidden state first. A batch whose sequence is
+    over keeps its states and outputs zeros.
+    Returns Y as (seq_length, num_directions, batch_size, hidden_size)
+    and the final states.
+    """
+    num_directions, seq_length, batch_size = projected.shape[:3]
+    hidden_size = states[0].shape[-1]
+    Y = np.zeros(
+        (seq_length, num_directions, batch_size, hidden_size), dtype=projected.dtype
+    )
+    states = tuple(states)
+    for t in range(seq_length):
+        new_states = cell(projected[:, t], states)
+        if mask is None:
+            Y[t] = new_states[0]
+        else:
+            valid = mask[t][:, np.newaxis]
+            new_states = tuple(
+                np.where(valid, new, old)
+                for new, old in zip(new_states, states, strict=True)
+            )
+            np.copyto(Y[t], new_states[0], where=valid)
+        states = new_states
+    batch = np.arange(batch_size)
+    for d, reversed_direction in enumerate(reversed_directions):
+        if reversed_direction:
+            Y[:, d] = Y[reverse, d, batch]
+    return Y, list(states)
+
+
+def _rnn_outputs(
+    Y: np.ndarray, states: list[np.ndarray], layout: int, dtype
+) -> tuple[np.ndarray, ...]:
+    if layout:
+        Y = np.transpose(Y, (2, 0, 1, 3))
+        states = [np.swapaxes(s, 0, 1) for s in states]
+    return tuple(r.astype(dtype, copy=False) for r in (Y, *states))
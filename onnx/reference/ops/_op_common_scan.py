@@ -0,0 +1,49 @@
+# Copyright (c) ONNX Project Contributors
+
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import numpy as np
+
+
+class _ScanOutputBuffer:
+    """Concatenates arrays along the first axis.
+
+    The rows are copied into a preallocated buffer whose capacity doubles
+    every time it is full, appending the outputs of *n* iterations costs
+    O(n) copies instead of keeping *n* arrays alive and concatenating
+    them at the end.
+    """
+
+    def __init__(self, capacity: int = 0):
+        self.capacity = capacity
+        self.size = 0
+        self.buffer: np.ndarray | None = None
+
+    def append(self, rows: np.ndarray) -> None:
+        buffer = self.buffer
+        size = self.size + rows.shape[0]
+        if buffer is None:
+            dtype = rows.dtype
+        else:
+            if buffer.shape[1:] != rows.shape[1:]:
+                raise ValueError(
+                    f"Unable to concatenate an array of shape {rows.shape} "
+                    f"to arrays of shape {buffer.shape[1:]}."
+                )
+            dtype = np.result_type(buffer, rows)
+        if buffer is None or buffer.shape[0] < size or buffer.dtype != dtype:
+            capacity = max(
+                size, self.capacity, 2 * (0 if buffer is None else buffer.shape[0])
+            )
+            new_buffer = np.empty((capacity, *rows.shape[1:]), dtype=dtype)
+            if buffer is not None:
+                new_buffer[: self.size] = buffer[: self.size]
+            self.buffer = buffer = new_buffer
+        buffer[self.size : size] = rows
+        self.size = size
+
+    def value(self) -> np.ndarray:
+        if self.buffer is None:
+            raise RuntimeError("No array was appended.")
+        return self.buffer[: self.size]
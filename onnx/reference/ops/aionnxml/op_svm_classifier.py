@@ -121,51 +121,45 @@ def set_score_svm(
 
 
 class SVMClassifier(OpRunAiOnnxMl):
-    def _run_linear(self, X, coefs, class_count_, kernel_type_):
-        scores = []
-        for j in range(class_count_):
-            d = self._svm.kernel_dot(X, coefs[j], kernel_type_)
-            score = self._svm.atts.rho[0] + d
-            scores.append(score)
-        return np.array(scores, dtype=X.dtype)
-
-    def _run_svm(
-        self, X, sv, vector_count_, kernel_type_, class_count_, starting_vector_, coefs
-    ):
-        evals = 0
-
-        kernels_list = [
-            self._svm.kernel_dot(X, sv[j], kernel_type_) for j in range(vector_count_)
-        ]
-        kernels = np.array(kernels_list)
-
-        votes = np.zeros((class_count_,), dtype=X.dtype)
-        scores = []
-        for i in range(class_count_):
-            si_i = starting_vector_[i]
-            class_i_sc = self._svm.atts.vectors_per_class[i]
-
-            for j in range(i + 1, class_count_):
-                si_j = starting_vector_[j]
-                class_j_sc = self._svm.atts.vectors_per_class[j]
-
-                s1 = np.dot(
-                    coefs[j - 1, si_i : si_i + class_i_sc],
-                    kernels[si_i : si_i + class_i_sc],
-                )
-                s2 = np.dot(
-                    coefs[i, si_j : si_j + class_j_sc],
-                    kernels[si_j : si_j + class_j_sc],
-                )
-
-                s = self._svm.atts.rho[evals] + s1 + s2
-                scores.append(s)
-                if s > 0:
-                    votes[i] += 1
-                else:
-                    votes[j] += 1
-                evals += 1
-        return votes, np.array(scores, dtype=X.dtype)
+    def _run_linear(self, X, coefs, kernel_type_):
+        """Computes the scores of every row of *X*."""
+        kernels = self._svm.kernel_matrix(X, coefs, kernel_type_)
+        return (self._svm.atts.rho[0] + kernels).astype(X.dtype)
+
+    def _run_svm(self, X, sv, kernel_type_, class_count_, starting_vector_, coefs):
+        """Computes the votes and the scores of every row of *X*,
+        the kernels are computed for a chunk of rows at once.
+        """
+        scores = np.empty(
+            (X.shape[0], class_count_ * (class_count_ - 1) // 2), dtype=X.dtype
+        )
+        votes = np.zeros((X.shape[0], class_count_), dtype=X.dtype)
+        for begin, end, kernels in self._svm.kernel_matrices(X, sv, kernel_type_):
+            evals = 0
+            for i in range(class_count_):
+                si_i = starting_vector_[i]
+                class_i_sc = self._svm.atts.vectors_per_class[i]
+
+                for j in range(i + 1, class_count_):
+                    si_j = starting_vector_[j]
+                    class_j_sc = self._svm.atts.vectors_per_class[j]
+
+                    s1 = (
+                        kernels[:, si_i : si_i + class_i_sc]
+                        @ coefs[j - 1, si_i : si_i + class_i_sc]
+                    )
+                    s2 = (
+                        kernels[:, si_j : si_j + class_j_sc]
+                        @ coefs[i, si_j : si_j + class_j_sc]
+                    )
+
+                    s = self._svm.atts.rho[evals] + s1 + s2
+                    scores[begin:end, evals] = s
+                    positive = s > 0
+                    votes[begin:end, i] += positive
+                    votes[begin:end, j] += ~positive
+                    evals += 1
+        return votes, scores
 
     def _probabilities(self, scores, class_count_):
         probsp2 = np.zeros((class_count_, class_count_), dtype=scores.dtype)
@@ -273,28 +267,17 @@ class SVMClassifier(OpRunAiOnnxMl):
 
         # SVM part
         if vector_count_ == 0 and mode == "SVM_LINEAR":
-            res = np.empty((X.shape[0], class_count_), dtype=X.dtype)
-            for n in range(X.shape[0]):
-                scores = self._run_linear(X[n], coefs, class_count_, kernel_type_)
-                res[n, :] = scores
+            res = self._run_linear(X, coefs, kernel_type_)
             votes = None
         else:
-            res = np.empty(
-                (X.shape[0], class_count_ * (class_count_ - 1) // 2), dtype=X.dtype
+            votes, res = self._run_svm(
+                X,
+                sv,
+                kernel_type_,
+                class_count_,
+                starting_vector_,
+                coefs,
             )
-            votes = np.empty((X.shape[0], class_count_), dtype=X.dtype)
-            for n in range(X.shape[0]):
-                vote, scores = self._run_svm(
-                    X[n],
-                    sv,
-                    vector_count_,
-                    kernel_type_,
-                    class_count_,
-                    starting_vector_,
-                    coefs,
-                )
-                res[n, :] = scores
-                votes[n, :] = vote
 
         # proba
         if (
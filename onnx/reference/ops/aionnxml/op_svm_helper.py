@@ -7,6 +7,9 @@ from typing import Any
 
 import numpy as np
 
+# Maximum number of kernel values computed at once.
+_CHUNK_SIZE = 2**20
+
 
 class SVMAttributes:
     def __init__(self):
@@ -67,31 +70,58 @@ class SVMCommon:
             return np.dot(pA, pB)
         raise ValueError(f"Unexpected kernel={kernel!r}.")
 
+    def kernel_matrix(self, X: np.ndarray, sv: np.ndarray, kernel: str) -> np.ndarray:
+        """Computes the kernel between every row of *X* and every
+        support vector in *sv*, the result has shape
+        `(X.shape[0], sv.shape[0])`, it is the batched version of
+        :meth:`kernel_dot`.
+        """
+        k = kernel.lower()
+        if k not in ("poly", "sigmoid", "rbf", "linear"):
+            raise ValueError(f"Unexpected kernel={kernel!r}.")
+        if k == "rbf":
+            # the differences are computed first, expanding |x - y|^2
+            # into |x|^2 + |y|^2 - 2 x.y loses the precision when the
+            # features are far from zero
+            diff = X[:, None, :] - sv[None, :, :]
+            s = (diff * diff).sum(axis=2)
+            return np.exp(-self.gamma_ * s)
+        s = X @ sv.T
+        if k == "poly":
+            s = s * self.gamma_ + self.coef0_
+            return s**self.degree_
+        if k == "sigmoid":
+            s = s * self.gamma_ + self.coef0_
+            return np.tanh(s)
+        return s
+
+    def kernel_matrices(self, X: np.ndarray, sv: np.ndarray, kernel: str):
+        """Yields `(begin, end, kernel_matrix(X[begin:end], sv, kernel))`,
+        rows are split into chunks to bound the memory.
+        """
+        size = max(sv.shape[0], 1)
+        if kernel.lower() == "rbf":
+            # every difference between a row and a support vector is stored
+            size *= max(sv.shape[1], 1)
+        chunk = max(_CHUNK_SIZE // size, 1)
+        for begin in range(0, X.shape[0], chunk):
+            end = min(begin + chunk, X.shape[0])
+            yield begin, end, self.kernel_matrix(X[begin:end], sv, kernel)
+
     def run_reg(self, X: np.ndarray) -> np.ndarray:
+        z = np.empty((X.shape[0], 1), dtype=X.dtype)
         if self.atts.n_supports > 0:
             # length of each support vector
-            mode_ = "SVM_SVC"
-            kernel_type_ = self.atts.kernel_type
             sv = self.atts.support_vectors.reshape((self.atts.n_supports, -1))
+            coefs = self.atts.coefficients[: self.atts.n_supports]
+            for begin, end, kernels in self.kernel_matrices(
+                X, sv, self.atts.kernel_type
+            ):
+                z[begin:end, 0] = kernels @ coefs + self.atts.rho[0]
         else:
-            mode_ = "SVM_LINEAR"
-            kernel_type_ = "LINEAR"
+            # SVM_LINEAR
+            z[:, 0] = X @ self.atts.coefficients + self.atts.rho[0]
 
-        z = np.empty((X.shape[0], 1), dtype=X.dtype)
-        for n in range(X.shape[0]):
-            s = 0.0
-
-            if mode_ == "SVM_SVC":
-                for j in range(self.atts.n_supports):
-                    d = self.kernel_dot(X[n], sv[j], kernel_type_)
-                    s += self.atts.coefficients[j] * d
-                s += self.atts.rho[0]
-            elif mode_ == "SVM_LINEAR":
-                s = self.kernel_dot(X[n], self.atts.coefficients, kernel_type_)
-                s += self.atts.rho[0]
-
-            if self.atts.one_class:
-                z[n, 0] = 1 if s > 0 else -1
-            else:
-                z[n, 0] = s
+        if self.atts.one_class:
+            z[:, 0] = np.where(z[:, 0] > 0, 1, -1)
         return z
@@ -1,15 +1,11 @@
 from __future__ import annotations
 
 from enum import IntEnum
-from typing import TYPE_CHECKING
 
 import numpy as np
 
 from onnx.reference.ops.aionnxml._op_run_aionnxml import OpRunAiOnnxMl
 
-if TYPE_CHECKING:
-    from collections.abc import Callable
-
 
 class AggregationFunction(IntEnum):
     AVERAGE = 0
@@ -36,98 +32,26 @@ class Mode(IntEnum):
     MEMBER = 6
 
 
-class Leaf:
-    def __init__(self, weight: float, target_id: int) -> None:
-        self.weight = weight
-        self.target_id = target_id
-
-    # Produce the weight and target index
-    def predict(self, x: np.ndarray) -> np.ndarray:  # noqa: ARG002
-        return np.array([self.weight, self.target_id])
-
-    def _print(self, prefix: list, indent: int = 0) -> None:
-        prefix.append(
-            " " * indent + f"Leaf WEIGHT: {self.weight}, TARGET: {self.target_id}\n"
-        )
-
-    def __repr__(self) -> str:
-        prefix = []
-        self._print(prefix)
-        return "".join(prefix)
-
-
-class Node:
-    compare: Callable[[float, float | set[float]], bool]
-    true_branch: Node | Leaf
-    false_branch: Node | Leaf
-    feature: int
-
-    def __init__(
-        self,
-        mode: Mode,
-        value: float | set[float],
-        feature: int,
-        missing_tracks_true: bool,
-    ) -> None:
-        if mode == Mode.LEQ:
-            self.compare = lambda x: (
-                x[feature].item() <= value
-                or (missing_tracks_true and np.isnan(x[feature].item()))
-            )
-        elif mode == Mode.LT:
-            self.compare = lambda x: (
-                x[feature].item() < value
-                or (missing_tracks_true and np.isnan(x[feature].item()))
-            )
-        elif mode == Mode.GTE:
-            self.compare = lambda x: (
-                x[feature].item() >= value
-                or (missing_tracks_true and np.isnan(x[feature].item()))
-            )
-        elif mode == Mode.GT:
-            self.compare = lambda x: (
-                x[feature].item() > value
-                or (missing_tracks_true and np.isnan(x[feature].item()))
-            )
-        elif mode == Mode.EQ:
-            self.compare = lambda x: (
-                x[feature].item() == value
-                or (missing_tracks_true and np.isnan(x[feature].item()))
-            )
-        elif mode == Mode.NEQ:
-            self.compare = lambda x: (
-                x[feature].item() != value
-                or (missing_tracks_true and np.isnan(x[feature].item()))
-            )
-        elif mode == Mode.MEMBER:
-            self.compare = lambda x: (
-                x[feature].item() in value
-                or (missing_tracks_true and np.isnan(x[feature].item()))
-            )
-        self.mode = mode
-        self.value = value
-        self.feature = feature
-
-    def predict(self, x: np.ndarray) -> float:
-        if self.compare(x):
-            return self.true_branch.predict(x)
-        return self.false_branch.predict(x)
-
-    def _print(self, prefix: list, indent: int = 0) -> None:
-        prefix.append(
-            " " * indent
-            + f"Node CMP: {self.mode}, SPLIT: {self.value}, FEATURE: {self.feature}\n"
-        )
-        self.true_branch._print(prefix, indent + 1)
-        self.false_branch._print(prefix, indent + 1)
+# A comparison between a feature x and a split is summarized by
+# (x < split) + 2 * (x == split) + 4 * (x > split), every mode but
+# MEMBER is a lookup into its row of the following table.
+_OUTCOMES = np.zeros((len(Mode), 5), dtype=np.bool_)
+_OUTCOMES[Mode.LEQ, [1, 2]] = True
+_OUTCOMES[Mode.LT, 1] = True
+_OUTCOMES[Mode.GTE, [2, 4]] = True
+_OUTCOMES[Mode.GT, 4] = True
+_OUTCOMES[Mode.EQ, 2] = True
+_OUTCOMES[Mode.NEQ, [0, 1, 4]] = True
 
-    def __repr__(self) -> str:
-        prefix = []
-        self._print(prefix)
-        return "".join(prefix)
+# Maximum number of (row, tree) pairs processed at once.
+_CHUNK_SIZE = 2**20
 
 
 class TreeEnsemble(OpRunAiOnnxMl):
+    """The trees are evaluated as a structure of arrays,
+    all rows and all trees go down one level at each iteration.
+    """
+
     def _run(
         self,
         X,
@@ -161,108 +85,131 @@ class TreeEnsemble(OpRunAiOnnxMl):
                 "Must specify membership values for all set membership nodes"
             )
 
-        # Build each tree in the ensemble. Note that the tree structure is implicitly defined by following the true and false indices in
-        # `nodes_truenodeids` and `nodes_falsenodeids` to the leaves of each tree.
-        set_membership_iter = (
-            iter(membership_values) if membership_values is not None else None
+        nodes_modes = np.asarray(nodes_modes)
+        nodes_splits = np.asarray(nodes_splits)
+        nodes_featureids = np.asarray(nodes_featureids, dtype=np.int64)
+        nodes_truenodeids = np.asarray(nodes_truenodeids, dtype=np.int64)
+        nodes_falsenodeids = np.asarray(nodes_falsenodeids, dtype=np.int64)
+        nodes_trueleafs = np.asarray(nodes_trueleafs).astype(np.bool_)
+        nodes_falseleafs = np.asarray(nodes_falseleafs).astype(np.bool_)
+        missing_tracks_true = (
+            np.zeros(len(nodes_modes), dtype=np.bool_)
+            if nodes_missing_value_tracks_true is None
+            else np.asarray(nodes_missing_value_tracks_true).astype(np.bool_)
         )
-
-        def build_node(current_node_index, is_leaf) -> Node | Leaf:
-            if is_leaf:
-                return Leaf(
-                    leaf_weights[current_node_index], leaf_targetids[current_node_index]
-                )
-
-            if nodes_modes[current_node_index] == Mode.MEMBER:
-                # parse next sequence of set members
-                set_members = set()
-                while (set_member := next(set_membership_iter)) and not np.isnan(
-                    set_member
-                ):
-                    set_members.add(set_member)
-                node = Node(
-                    nodes_modes[current_node_index],
-                    set_members,
-                    nodes_featureids[current_node_index],
-                    (
-                        nodes_missing_value_tracks_true[current_node_index]
-                        if nodes_missing_value_tracks_true is not None
-                        else False
-                    ),
-                )
-            else:
-                node = Node(
-                    nodes_modes[current_node_index],
-                    nodes_splits[current_node_index],
-                    nodes_featureids[current_node_index],
-                    (
-                        nodes_missing_value_tracks_true[current_node_index]
-                        if nodes_missing_value_tracks_true is not None
-                        else False
-                    ),
-                )
-
-            # recurse true and false branches
-            node.true_branch = build_node(
-                nodes_truenodeids[current_node_index],
-                nodes_trueleafs[current_node_index],
-            )
-            node.false_branch = build_node(
-                nodes_falsenodeids[current_node_index],
-                nodes_falseleafs[current_node_index],
-            )
-            return node
-
-        trees = []
-        for root_index in tree_roots:
-            # degenerate case (tree == leaf)
-            is_leaf = (
-                nodes_trueleafs[root_index]
-                and nodes_falseleafs[root_index]
-                and nodes_truenodeids[root_index] == nodes_falsenodeids[root_index]
+        roots = np.asarray(tree_roots, dtype=np.int64)
+        # degenerate case (tree == leaf)
+        roots_leaf = (
+            nodes_trueleafs[roots]
+            & nodes_falseleafs[roots]
+            & (nodes_truenodeids[roots] == nodes_falsenodeids[roots])
+        )
+        members = (
+            None
+            if membership_values is None
+            else self._members(
+                membership_values,
+                roots[~roots_leaf],
+                nodes_modes,
+                nodes_truenodeids,
+                nodes_falsenodeids,
+                nodes_trueleafs,
+                nodes_falseleafs,
             )
-            trees.append(build_node(root_index, is_leaf))
-
-        # predict each sample through tree
-        raw_values = [
-            np.apply_along_axis(tree.predict, axis=1, arr=X) for tree in trees
-        ]
-        weights, target_ids = zip(
-            *[np.split(x, 2, axis=1) for x in raw_values], strict=False
         )
-        weights = np.concatenate(weights, axis=1)
-        target_ids = np.concatenate(target_ids, axis=1).astype(np.int64)
+
+        n_trees = len(roots)
         if aggregate_function in (
             AggregationFunction.SUM,
             AggregationFunction.AVERAGE,
         ):
             result = np.zeros((len(X), n_targets), dtype=X.dtype)
+            ufunc = np.add
         elif aggregate_function == AggregationFunction.MIN:
             result = np.full((len(X), n_targets), np.finfo(X.dtype).max)
+            ufunc = np.fmin
         elif aggregate_function == AggregationFunction.MAX:
             result = np.full((len(X), n_targets), np.finfo(X.dtype).min)
+            ufunc = np.fmax
         else:
             raise NotImplementedError(
                 f"aggregate_transform={aggregate_function!r} not supported yet."
             )
-        for batch_num, (w, t) in enumerate(zip(weights, target_ids, strict=False)):
-            weight = w.reshape(-1)
-            target_id = t.reshape(-1)
-            if aggregate_function == AggregationFunction.SUM:
-                for value, tid in zip(weight, target_id, strict=False):
-                    result[batch_num, tid] += value
-            elif aggregate_function == AggregationFunction.AVERAGE:
-                for value, tid in zip(weight, target_id, strict=False):
-                    result[batch_num, tid] += value / len(trees)
-            elif aggregate_function == AggregationFunction.MIN:
-                for value, tid in zip(weight, target_id, strict=False):
-                    result[batch_num, tid] = min(result[batch_num, tid], value)
-            elif aggregate_function == AggregationFunction.MAX:
-                for value, tid in zip(weight, target_id, strict=False):
-                    result[batch_num, tid] = max(result[batch_num, tid], value)
-            else:
-                raise NotImplementedError(
-                    f"aggregate_transform={aggregate_function!r} not supported yet."
+        # leaves produce double values, every addition is done in double
+        weights = np.asarray(leaf_weights).astype(np.float64)
+        if aggregate_function == AggregationFunction.AVERAGE:
+            weights /= n_trees
+        target_ids = np.asarray(leaf_targetids, dtype=np.int64)
+
+        chunk = max(_CHUNK_SIZE // max(n_trees, 1), 1)
+        for begin in range(0, len(X), chunk):
+            x_chunk = X[begin : begin + chunk]
+            n_rows = len(x_chunk)
+            index = np.tile(roots, n_rows)
+            is_leaf = np.tile(roots_leaf, n_rows)
+            rows = np.repeat(np.arange(n_rows), n_trees)
+            active = np.flatnonzero(~is_leaf)
+            while active.size:
+                nodes = index[active]
+                x = x_chunk[rows[active], nodes_featureids[nodes]]
+                modes = nodes_modes[nodes]
+                th = nodes_splits[nodes]
+                outcome = (x < th).view(np.int8) + (x > th).view(np.int8) * 4
+                outcome += (x == th).view(np.int8) * 2
+                r = _OUTCOMES[modes, outcome]
+                sel = modes == Mode.MEMBER
+                if sel.any():
+                    r[sel] = (members[nodes[sel]] == x[sel, np.newaxis]).any(axis=1)
+                r |= missing_tracks_true[nodes] & np.isnan(x)
+                index[active] = np.where(
+                    r, nodes_truenodeids[nodes], nodes_falsenodeids[nodes]
+                )
+                is_leaf[active] = np.where(
+                    r, nodes_trueleafs[nodes], nodes_falseleafs[nodes]
                 )
+                active = active[~is_leaf[active]]
+            ufunc.at(result, (begin + rows, target_ids[index]), weights[index])
 
         return (result,)
+
+    @staticmethod
+    def _members(
+        membership_values,
+        roots,
+        nodes_modes,
+        nodes_truenodeids,
+        nodes_falsenodeids,
+        nodes_trueleafs,
+        nodes_falseleafs,
+    ) -> np.ndarray:
+        """Returns a matrix, row *i* holds the members of node *i* padded
+        with nan. Sets are assigned to the set membership nodes in the order
+        a depth-first traversal of the trees, true branch first, meets them.
+        """
+        set_membership_iter = iter(membership_values)
+        sets = {}
+        for root in roots:
+            stack = [int(root)]
+            while stack:
+                index = stack.pop()
+                if nodes_modes[index] == Mode.MEMBER:
+                    # parse next sequence of set members
+                    set_members = []
+                    while (set_member := next(set_membership_iter)) and not np.isnan(
+                        set_member
+                    ):
+                        set_members.append(set_member)
+                    sets[index] = set_members
+                if not nodes_falseleafs[index]:
+                    stack.append(int(nodes_falsenodeids[index]))
+                if not nodes_trueleafs[index]:
+                    stack.append(int(nodes_truenodeids[index]))
+        width = max((len(v) for v in sets.values()), default=0)
+        members = np.full(
+            (len(nodes_modes), max(width, 1)),
+            np.nan,
+            dtype=np.asarray(membership_values).dtype,
+        )
+        for index, values in sets.items():
+            members[index, : len(values)] = values
+        return members
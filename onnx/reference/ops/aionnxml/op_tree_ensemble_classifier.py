@@ -63,25 +63,21 @@ class TreeEnsembleClassifier(OpRunAiOnnxMl):
         self._tree = tr
         if X.dtype not in (np.float32, np.float64):
             X = X.astype(np.float32)
-        leaves_index = tr.leave_index_tree(X)
+        if len(X.shape) == 1:
+            X = X.reshape((1, -1))
         n_classes = max(len(classlabels_int64s or []), len(classlabels_strings or []))
-        res = np.empty((leaves_index.shape[0], n_classes), dtype=np.float32)
+        res = np.empty((X.shape[0], n_classes), dtype=np.float32)
         if tr.atts.base_values is None:
             res[:, :] = 0
         else:
             res[:, :] = np.array(tr.atts.base_values).reshape((1, -1))
 
-        class_index = {}
-        for i, (tid, nid) in enumerate(zip(class_treeids, class_nodeids, strict=False)):
-            if (tid, nid) not in class_index:
-                class_index[tid, nid] = []
-            class_index[tid, nid].append(i)
-        for i in range(res.shape[0]):
-            indices = leaves_index[i]
-            t_index = [class_index[nodes_treeids[i], nodes_nodeids[i]] for i in indices]
-            for its in t_index:
-                for it in its:
-                    res[i, class_ids[it]] += tr.atts.class_weights[it]
+        weights = tr.atts.class_weights
+        if weights is None:
+            weights = tr.atts.class_weights_as_tensor
+        tr.aggregate(
+            X, res, tr.leaf_targets(class_treeids, class_nodeids), class_ids, weights
+        )
 
         # post_transform
         binary = len(set(class_ids)) == 1
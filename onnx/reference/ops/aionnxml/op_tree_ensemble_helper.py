@@ -34,7 +34,29 @@ class TreeEnsembleAttributes:
         return "\n".join(rows)
 
 
+# A comparison between a feature x and a threshold is summarized by
+# (x < th) + 2 * (x == th) + 4 * (x > th), every rule is a lookup
+# into its row of the following table.
+_RULES = {
+    "BRANCH_LEQ": [False, True, True, False, False],
+    "BRANCH_LT": [False, True, False, False, False],
+    "BRANCH_GTE": [False, False, True, False, True],
+    "BRANCH_GT": [False, False, False, False, True],
+    "BRANCH_EQ": [False, False, True, False, False],
+    "BRANCH_NEQ": [True, True, False, False, True],
+}
+_OUTCOMES = np.array(list(_RULES.values()), dtype=np.bool_)
+
+# Maximum number of (row, tree) pairs processed at once.
+_CHUNK_SIZE = 2**20
+
+
 class TreeEnsemble:
+    """Stores the trees as a structure of arrays, every node is
+    identified by its position in the attributes `nodes_*`.
+    All rows and all trees go down one level at each iteration.
+    """
+
     def __init__(self, **kwargs):
         self.atts = TreeEnsembleAttributes()
 
@@ -52,52 +74,152 @@ class TreeEnsemble:
             )
         }
 
+        modes = self.atts.nodes_modes
+        n_nodes = len(modes)
+        self.roots = np.array(
+            [self.root_index[tid] for tid in self.tree_ids], dtype=np.int64
+        )
+        self.is_leaf = np.array([m == "LEAF" for m in modes], dtype=np.bool_)
+        # index in _RULES, -1 for a leaf, len(_RULES) for an unknown rule
+        rules = list(_RULES)
+        self.rules = np.array(
+            [
+                -1 if m == "LEAF" else (rules.index(m) if m in _RULES else len(rules))
+                for m in modes
+            ],
+            dtype=np.int64,
+        )
+        self.feature_ids = np.array(self.atts.nodes_featureids, dtype=np.int64)
+        values = self.atts.nodes_values
+        if values is None:
+            values = getattr(self.atts, "nodes_values_as_tensor", None)
+        self.thresholds = np.asarray(values)
+        mvt = self.atts.nodes_missing_value_tracks_true
+        self.missing_tracks_true = (
+            np.zeros(n_nodes, dtype=np.bool_)
+            if mvt is None
+            else np.array(mvt, dtype=np.int64) >= 1
+        )
+        # position of the next node, -1 if it does not exist
+        self.true_index = np.array(
+            [
+                self.node_index.get((tid, nid), -1)
+                for tid, nid in zip(
+                    self.atts.nodes_treeids, self.atts.nodes_truenodeids, strict=False
+                )
+            ],
+            dtype=np.int64,
+        )
+        self.false_index = np.array(
+            [
+                self.node_index.get((tid, nid), -1)
+                for tid, nid in zip(
+                    self.atts.nodes_treeids, self.atts.nodes_falsenodeids, strict=False
+                )
+            ],
+            dtype=np.int64,
+        )
+
     def __str__(self) -> str:
         rows = ["TreeEnsemble", f"root_index={self.root_index}", str(self.atts)]
         return "\n".join(rows)
 
     def leaf_index_tree(self, X: np.ndarray, tree_id: int) -> int:
         """Computes the leaf index for one tree."""
-        index = self.root_index[tree_id]
-        while self.atts.nodes_modes[index] != "LEAF":
-            x = X[self.atts.nodes_featureids[index]]
-            if np.isnan(x):
-                r = self.atts.nodes_missing_value_tracks_true[index] >= 1
-            else:
-                rule = self.atts.nodes_modes[index]
-                th = self.atts.nodes_values[index]
-                if rule == "BRANCH_LEQ":
-                    r = x <= th
-                elif rule == "BRANCH_LT":
-                    r = x < th
-                elif rule == "BRANCH_GTE":
-                    r = x >= th
-                elif rule == "BRANCH_GT":
-                    r = x > th
-                elif rule == "BRANCH_EQ":
-                    r = x == th
-                elif rule == "BRANCH_NEQ":
-                    r = x != th
-                else:
-                    raise ValueError(
-                        f"Unexpected rule {rule!r} for node index {index}."
-                    )
-            nid = (
-                self.atts.nodes_truenodeids[index]
-                if r
-                else self.atts.nodes_falsenodeids[index]
-            )
-            index = self.node_index[tree_id, nid]
-        return index
+        roots = [self.root_index[tree_id]]
+        return int(self._leaf_index(X.reshape((1, -1)), roots)[0, 0])
+
+    def _leaf_index(self, X: np.ndarray, roots: np.ndarray) -> np.ndarray:
+        """Computes the leaf index of every row for every root,
+        the result has shape `(X.shape[0], len(roots))`.
+        """
+        n_trees = len(roots)
+        index = np.tile(np.asarray(roots, dtype=np.int64), X.shape[0])
+        rows = np.repeat(np.arange(X.shape[0]), n_trees)
+        active = np.flatnonzero(~self.is_leaf[index])
+        while active.size:
+            nodes = index[active]
+            x = X[rows[active], self.feature_ids[nodes]]
+            th = self.thresholds[nodes]
+            rules = self.rules[nodes]
+            missing = np.isnan(x)
+            unknown = (rules == len(_RULES)) & ~missing
+            if unknown.any():
+                node = nodes[np.flatnonzero(unknown)[0]]
+                raise ValueError(
+                    f"Unexpected rule {self.atts.nodes_modes[node]!r} "
+                    f"for node index {node}."
+                )
+            outcome = (x < th).view(np.int8) + (x > th).view(np.int8) * 4
+            outcome += (x == th).view(np.int8) * 2
+            r = _OUTCOMES[rules.clip(max=len(_RULES) - 1), outcome]
+            r[missing] = self.missing_tracks_true[nodes[missing]]
+            nxt = np.where(r, self.true_index[nodes], self.false_index[nodes])
+            if (nxt < 0).any():
+                node = nodes[np.flatnonzero(nxt < 0)[0]]
+                raise KeyError(
+                    f"Unable to find the next node of node index {node} "
+                    f"in tree {self.atts.nodes_treeids[node]}."
+                )
+            index[active] = nxt
+            active = active[~self.is_leaf[nxt]]
+        return index.reshape((X.shape[0], n_trees))
 
     def leave_index_tree(self, X: np.ndarray) -> np.ndarray:
         """Computes the leaf index for all trees."""
         if len(X.shape) == 1:
             X = X.reshape((1, -1))
-        outputs = []
-        for row in X:
-            outs = []
-            for tree_id in self.tree_ids:
-                outs.append(self.leaf_index_tree(row, tree_id))  # noqa: PERF401
-            outputs.append(outs)
-        return np.array(outputs)
+        return self._leaf_index(X, self.roots)
+
+    def leaf_targets(
+        self, treeids: list[int], nodeids: list[int]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Groups the targets (or classes) by the leaf they belong to.
+        Returns `(offsets, targets)`, the targets of the leaf at position
+        `i` are `targets[offsets[i] : offsets[i + 1]]`, they are kept in
+        the order they were defined.
+        """
+        position = np.array(
+            [
+                self.node_index.get((tid, nid), -1)
+                for tid, nid in zip(treeids, nodeids, strict=False)
+            ],
+            dtype=np.int64,
+        )
+        targets = np.flatnonzero(position >= 0)
+        targets = targets[np.argsort(position[targets], kind="stable")]
+        counts = np.bincount(position[targets], minlength=len(self.is_leaf))
+        offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return offsets, targets
+
+    def aggregate(
+        self,
+        X: np.ndarray,
+        res: np.ndarray,
+        leaf_targets: tuple[np.ndarray, np.ndarray],
+        target_ids: np.ndarray,
+        weights: np.ndarray,
+        ufunc: np.ufunc = np.add,
+    ) -> None:
+        """Applies `res[row, target_ids[t]] = ufunc(res[row, target_ids[t]],
+        weights[t])` for every row, every tree and every target `t` of the
+        leaf the row falls into. Trees and targets are processed in the same
+        order as a loop over the trees would do.
+        """
+        if len(X.shape) == 1:
+            X = X.reshape((1, -1))
+        offsets, targets = leaf_targets
+        target_ids = np.asarray(target_ids, dtype=np.int64)
+        n_trees = max(len(self.roots), 1)
+        chunk = max(_CHUNK_SIZE // n_trees, 1)
+        for begin in range(0, X.shape[0], chunk):
+            leaves = self._leaf_index(X[begin : begin + chunk], self.roots).ravel()
+            counts = offsets[leaves + 1] - offsets[leaves]
+            total = int(counts.sum())
+            if total == 0:
+                continue
+            first = np.cumsum(counts) - counts
+            t = targets[np.repeat(offsets[leaves] - first, counts) + np.arange(total)]
+            rows = begin + np.repeat(np.arange(leaves.size) // len(self.roots), counts)
+            ufunc.at(res, (rows, target_ids[t]), weights[t])
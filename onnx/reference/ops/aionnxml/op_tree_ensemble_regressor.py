@@ -57,46 +57,29 @@ class TreeEnsembleRegressor(OpRunAiOnnxMl):
         )
         # unused unless for debugging purposes
         self._tree = tr
-        leaves_index = tr.leave_index_tree(X)
-        res = np.zeros((leaves_index.shape[0], n_targets), dtype=X.dtype)
+        if len(X.shape) == 1:
+            X = X.reshape((1, -1))
+        res = np.zeros((X.shape[0], n_targets), dtype=X.dtype)
         n_trees = len(set(tr.atts.nodes_treeids))
 
-        target_index = {}
-        for i, (tid, nid) in enumerate(
-            zip(target_treeids, target_nodeids, strict=False)
-        ):
-            if (tid, nid) not in target_index:
-                target_index[tid, nid] = []
-            target_index[tid, nid].append(i)
-        for i in range(res.shape[0]):
-            indices = leaves_index[i]
-            t_index = [
-                target_index[nodes_treeids[i], nodes_nodeids[i]] for i in indices
-            ]
-            if aggregate_function in ("SUM", "AVERAGE"):
-                for its in t_index:
-                    for it in its:
-                        res[i, target_ids[it]] += tr.atts.target_weights[it]
-            elif aggregate_function == "MIN":
-                res[i, :] = np.finfo(res.dtype).max
-                for its in t_index:
-                    for it in its:
-                        res[i, target_ids[it]] = min(
-                            res[i, target_ids[it]],
-                            tr.atts.target_weights[it],
-                        )
-            elif aggregate_function == "MAX":
-                res[i, :] = np.finfo(res.dtype).min
-                for its in t_index:
-                    for it in its:
-                        res[i, target_ids[it]] = max(
-                            res[i, target_ids[it]],
-                            tr.atts.target_weights[it],
-                        )
-            else:
-                raise NotImplementedError(
-                    f"aggregate_transform={aggregate_function!r} not supported yet."
-                )
+        weights = tr.atts.target_weights
+        if weights is None:
+            weights = tr.atts.target_weights_as_tensor
+        # the weights are added in the precision of the output
+        weights = np.asarray(weights, dtype=res.dtype)
+        leaf_targets = tr.leaf_targets(target_treeids, target_nodeids)
+        if aggregate_function in ("SUM", "AVERAGE"):
+            tr.aggregate(X, res, leaf_targets, target_ids, weights, np.add)
+        elif aggregate_function == "MIN":
+            res[:, :] = np.finfo(res.dtype).max
+            tr.aggregate(X, res, leaf_targets, target_ids, weights, np.fmin)
+        elif aggregate_function == "MAX":
+            res[:, :] = np.finfo(res.dtype).min
+            tr.aggregate(X, res, leaf_targets, target_ids, weights, np.fmax)
+        else:
+            raise NotImplementedError(
+                f"aggregate_transform={aggregate_function!r} not supported yet."
+            )
         if aggregate_function == "AVERAGE":
             res /= n_trees
 
@@ -6,6 +6,7 @@ from __future__ import annotations
 import numpy as np
 
 from onnx.reference.op_run import OpRun
+from onnx.reference.ops._helpers import _PlanCache
 from onnx.reference.ops._op_common_indices import _get_indices, _is_out
 
 
@@ -184,7 +185,64 @@ def col2im_naive_implementation(
     return data_im
 
 
+def _col2im_plan(image_shape, block_counts, kernel_shape, dilations, pads, strides):
+    """Precomputes how blocks are added into an image.
+
+    The image is padded so that every block fits into it. The plan holds
+    the shape of the padded image, for every element of the kernel
+    in C order the strided slices of the padded image receiving it,
+    and the slices removing the padding.
+    """
+    n_dims = len(image_shape)
+    padded_shape = []
+    starts = []
+    crop = []
+    for i in range(n_dims):
+        extent = (
+            max(block_counts[i] - 1, 0) * strides[i]
+            + (kernel_shape[i] - 1) * dilations[i]
+            + 1
+        )
+        # a negative pad leaves room before the first block
+        start = max(-int(pads[i]), 0)
+        begin = start + int(pads[i])
+        padded_shape.append(max(begin + int(image_shape[i]), start + extent))
+        starts.append(start)
+        crop.append(slice(begin, begin + int(image_shape[i])))
+    slices = [
+        tuple(
+            slice(a + o * d, a + o * d + (b - 1) * s + 1, s)
+            for a, o, d, b, s in zip(
+                starts, offset, dilations, block_counts, strides, strict=True
+            )
+        )
+        for offset in np.ndindex(*kernel_shape)
+    ]
+    if min(block_counts, default=1) <= 0:
+        # no block, the image is filled with zeros
+        slices = []
+    return tuple(padded_shape), slices, tuple(crop)
+
+
+def _col2im_add(cols, plan):
+    """Adds blocks into images following a plan built by :func:`_col2im_plan`.
+
+    `cols` has shape `(..., prod(kernel_shape), *block_counts)`,
+    the result has shape `(..., *image_shape)`.
+    """
+    padded_shape, slices, crop = plan
+    blocks = (slice(None),) * len(padded_shape)
+    image = np.zeros((*cols.shape[: -len(padded_shape) - 1], *padded_shape), cols.dtype)
+    for k, index in enumerate(slices):
+        image[(Ellipsis, *index)] += cols[(Ellipsis, k, *blocks)]
+    return np.ascontiguousarray(image[(Ellipsis, *crop)])
+
+
 class Col2Im(OpRun):
+    def __init__(self, onnx_node, run_params):
+        OpRun.__init__(self, onnx_node, run_params)
+        self._plans = _PlanCache()
+
     def _run(
         self, data, image_shape, block_shape, dilations=None, pads=None, strides=None
     ):
@@ -195,19 +253,55 @@ class Col2Im(OpRun):
         if strides is None:
             strides = [1 for s in image_shape]
 
-        bl = np.prod(block_shape, dtype=np.int64)
-        C = data.shape[1] // bl
-        data = data.reshape((*data.shape[:1], C, bl, *data.shape[2:]))
-
-        ks = tuple(block_shape)
-        res = None
-        for n in range(data.shape[0]):
-            for c in range(data.shape[1]):
-                out = col2im_naive_implementation(
-                    data[n, c, ...], image_shape, ks, dilations, pads, strides
+        key = (
+            data.shape,
+            tuple(image_shape),
+            tuple(block_shape),
+            tuple(dilations),
+            tuple(pads),
+            tuple(strides),
+        )
+        plan = self._plans.get(key)
+        if plan is None:
+            n_dims = len(image_shape)
+            kernel_size = int(np.prod(block_shape))
+            if data.shape[1] % kernel_size != 0:
+                raise ValueError(
+                    f"Expected size of input's dimension 1 to be divisible by the "
+                    f"product of block_shape={block_shape}, but got "
+                    f"data.shape={data.shape}."
                 )
-                if res is None:
-                    new_shape = data.shape[:2] + out.shape
-                    res = np.empty(new_shape, dtype=data.dtype)
-                res[n, c, ...] = out
-        return (res,)
+            block_counts = [
+                int(
+                    (
+                        image_shape[i]
+                        + pads[i]
+                        + pads[i + n_dims]
+                        - (dilations[i] * (block_shape[i] - 1) + 1)
+                    )
+                    // strides[i]
+                    + 1
+                )
+                for i in range(n_dims)
+            ]
+            if data.shape[2] != np.prod(block_counts):
+                raise ValueError(
+                    f"Given data.shape={data.shape}, image_shape={image_shape}, "
+                    f"block_shape={block_shape}, dilations={dilations}, pads={pads}, "
+                    f"strides={strides}, expected size of input's dimension 2 to "
+                    f"match the calculated number of sliding blocks {block_counts}."
+                )
+            plan = (
+                data.shape[1] // kernel_size,
+                block_counts,
+                _col2im_plan(
+                    image_shape, block_counts, block_shape, dilations, pads, strides
+                ),
+            )
+            self._plans[key] = plan
+        channels, block_counts, plan = plan
+
+        cols = data.reshape(
+            (data.shape[0], channels, data.shape[1] // channels, *block_counts)
+        )
+        return (_col2im_add(cols, plan),)
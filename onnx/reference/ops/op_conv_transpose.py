@@ -6,10 +6,15 @@ from __future__ import annotations
 import numpy as np
 
 from onnx.reference.op_run import OpRun
-from onnx.reference.ops.op_col2im import col2im_naive_implementation
+from onnx.reference.ops._helpers import _PlanCache
+from onnx.reference.ops.op_col2im import _col2im_add, _col2im_plan
 
 
 class ConvTranspose(OpRun):
+    def __init__(self, onnx_node, run_params):
+        OpRun.__init__(self, onnx_node, run_params)
+        self._plans = _PlanCache()
+
     def _run(
         self,
         X,
@@ -23,6 +28,68 @@ class ConvTranspose(OpRun):
         output_shape=None,
         pads=None,
         strides=None,
+    ):
+        key = (
+            X.shape,
+            W.shape,
+            auto_pad,
+            *(
+                None if v is None else tuple(v)
+                for v in (
+                    dilations,
+                    kernel_shape,
+                    output_padding,
+                    output_shape,
+                    pads,
+                    strides,
+                )
+            ),
+        )
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = self._make_plan(
+                X,
+                W,
+                auto_pad,
+                dilations,
+                kernel_shape,
+                output_padding,
+                output_shape,
+                pads,
+                strides,
+            )
+            self._plans[key] = plan
+
+        # every input pixel multiplied by the kernel gives a block,
+        # blocks are then added into the output image
+        n, c = X.shape[:2]
+        c_group, m_group = c // group, W.shape[1]
+        num_output_channels = m_group * group
+        kernel_size = int(np.prod(W.shape[2:]))
+        # (C, M/group, *k) -> (group, M/group * prod(k), C/group)
+        weights = W.reshape((group, c_group, m_group * kernel_size)).transpose(
+            (0, 2, 1)
+        )
+        cols = np.matmul(weights, X.reshape((n, group, c_group, -1)))
+        cols = cols.reshape((n, num_output_channels, kernel_size, *X.shape[2:]))
+        final = _col2im_add(cols, plan)
+        if B is not None:
+            final += B[:num_output_channels].reshape(
+                (1, -1) + (1,) * (len(X.shape) - 2)
+            )
+        return (final.astype(X.dtype),)
+
+    @staticmethod
+    def _make_plan(
+        X,
+        W,
+        auto_pad,
+        dilations,
+        kernel_shape,
+        output_padding,
+        output_shape,
+        pads,
+        strides,
     ):
         if dilations is None:
             dilations = [1 for s in X.shape[2:]]
@@ -56,7 +123,6 @@ class ConvTranspose(OpRun):
                     pads_1.append(total_padding[i] - (total_padding[i] // 2))
                     pads_2.append(total_padding[i] // 2)
             pads = pads_1 + pads_2
-            n_dims = len(pads) // 2
         else:
             n_dims = len(X.shape) - 2
             new_pads = np.array([(pads[i], pads[i + n_dims]) for i in range(n_dims)])
@@ -69,71 +135,6 @@ class ConvTranspose(OpRun):
                     for i in range(n_dims)
                 ]
 
-        kernel_shape = W.shape[2:]
-        kernel_size = np.prod(kernel_shape)
-        num_output_channels = W.shape[1] * group
-        kernel_dim = num_output_channels // group * kernel_size
-
-        C = X.shape[1]  # num_inputs_channels
-        m = kernel_dim  # kernel_dim
-        n = np.prod(X.shape[2:])  # input_image_size
-        k = C // group
-        w_reshaped = W.reshape((group, k, m))
-        final = None
-
-        # N x C x H x W = X.shape
-        # C x M/group x k1 x k2 = W.shape
-        if group == 1:
-            for image_id in range(X.shape[0]):
-                w_t = w_reshaped[0].T
-                gemm = np.matmul(w_t, X[image_id].reshape((k, n)))
-                gemmc = gemm.reshape((num_output_channels, -1, gemm.shape[-1]))
-                for c in range(num_output_channels):
-                    res = col2im_naive_implementation(
-                        gemmc[c], output_shape, kernel_shape, dilations, pads, strides
-                    )
-                    if final is None:
-                        final = np.empty(
-                            (*X.shape[:1], num_output_channels, *res.shape),
-                            dtype=X.dtype,
-                        )
-                    if B is not None:
-                        res += B[c]
-                    final[image_id, c, ...] = res[...]
-        else:
-            final = np.zeros((X.shape[0], num_output_channels, *output_shape))
-            output_array = []
-
-            for group_id in range(group):
-                group_X = X[:, group_id * C // group : (group_id + 1) * C // group, ...]
-                group_W = W[
-                    group_id * num_output_channels // group : (group_id + 1)
-                    * num_output_channels
-                    // group,
-                    ...,
-                ]
-
-                group_output = self._run(
-                    group_X,
-                    group_W,
-                    B=B,
-                    auto_pad=auto_pad,
-                    dilations=dilations,
-                    group=1,
-                    kernel_shape=kernel_shape,
-                    output_padding=output_padding,
-                    output_shape=output_shape,
-                    pads=pads,
-                    strides=strides,
-                )
-                group_output = np.array(group_output[0])
-                output_array.append(group_output)
-
-            for image_id in range(X.shape[0]):
-                for group_id in range(group):
-                    group_output = output_array[group_id]
-                    final[image_id, group_id : (group_id + 1), ...] = group_output[
-                        image_id, ...
-                    ]
-
-        return (final.astype(X.dtype),)  # type: ignore[union-attr]
+        return _col2im_plan(
+            output_shape, X.shape[2:], W.shape[2:], dilations, pads, strides
+        )
@@ -3,19 +3,17 @@
 # SPDX-License-Identifier: Apache-2.0
 from __future__ import annotations
 
-import numbers
-
 import numpy as np
 
 from onnx.reference.op_run import OpRun
-from onnx.reference.ops.op_resize import _get_all_coords
 
 
 class GridSample(OpRun):
     # https://github.com/pytorch/pytorch/blob/v2.0.0/aten/src/ATen/native/GridSampler.h#L26
-    def _gs_denormalize(self, n, length: int, align_corners: bool):
-        # n is the normalized coordinate (float)
-        # x is the unormalized coordinate (float)
+    @staticmethod
+    def _gs_denormalize(n, length: int, align_corners: bool):
+        # n is the normalized coordinates (float array)
+        # x is the unormalized coordinates (float array)
         if align_corners:
             # Align to corners
             # x_min = 0
@@ -43,213 +41,67 @@ class GridSample(OpRun):
             x = ((n + 1) * length - 1) / 2.0
         return x
 
-    def _gs_denormalize_coordinates(self, n, dims, align_corners: bool):
-        x = np.zeros(len(n), dtype=np.float32)
-        for i, (v, dim) in enumerate(zip(n, dims, strict=False)):
-            x[i] = self._gs_denormalize(n=v, length=dim, align_corners=align_corners)
-        return x
-
-    def _gs_reflect(self, x, x_min, x_max):
+    @staticmethod
+    def _gs_reflect(x, x_min, x_max):
         """Reflect by the near border till within the borders
         Use float for borders to avoid potential issues with integer T
         """
-        fx = x
+        fx = x.astype(np.float64)
         rng = x_max - x_min
-        if fx < x_min:
-            dx = x_min - fx
-            n = int(dx / rng)
-            r = dx - n * rng
-            if n % 2 == 0:
-                fx = x_min + r
-            else:
-                fx = x_max - r
-        elif fx > x_max:
-            dx = fx - x_max
-            n = int(dx / rng)
-            r = dx - n * rng
-            if n % 2 == 0:
-                fx = x_max - r
-            else:
-                fx = x_min + r
-        return fx
-
-    def _gs_get_cubic_coeffs(self, x, coeffs):
+        below = fx < x_min
+        above = fx > x_max
+        if not (below.any() or above.any()):
+            return fx
+        if rng == 0:
+            return np.full_like(fx, x_min)
+        dx = np.where(below, x_min - fx, fx - x_max)
+        n = np.trunc(dx / rng)
+        r = dx - n * rng
+        even = n % 2 == 0
+        low = x_min + r
+        high = x_max - r
+        fx = np.where(below, np.where(even, low, high), fx)
+        return np.where(above, np.where(even, high, low), fx)
+
+    @staticmethod
+    def _gs_get_cubic_coeffs(x):
         """Calculate cubic convolution interpolation coefficients
         ROBERT G. KEYS https://ieeexplore.ieee.org/document/1163711
         Use float to avoid potential issues with integer.
         """
         cubic_alpha = -0.75
         x = abs(x)
-        coeffs[0] = (
-            (cubic_alpha * (x + 1) - 5 * cubic_alpha) * (x + 1) + 8 * cubic_alpha
-        ) * (x + 1) - 4 * cubic_alpha
-        coeffs[1] = ((cubic_alpha + 2) * x - (cubic_alpha + 3)) * x * x + 1
-        coeffs[2] = ((cubic_alpha + 2) * (1 - x) - (cubic_alpha + 3)) * (1 - x) * (
-            1 - x
-        ) + 1
-        coeffs[3] = (
-            (cubic_alpha * (2 - x) - 5 * cubic_alpha) * (2 - x) + 8 * cubic_alpha
-        ) * (2 - x) - 4 * cubic_alpha
-
-    def _gs_get_linear_coeffs(self, x, coeffs):
+        return [
+            ((cubic_alpha * (x + 1) - 5 * cubic_alpha) * (x + 1) + 8 * cubic_alpha)
+            * (x + 1)
+            - 4 * cubic_alpha,
+            ((cubic_alpha + 2) * x - (cubic_alpha + 3)) * x * x + 1,
+            ((cubic_alpha + 2) * (1 - x) - (cubic_alpha + 3)) * (1 - x) * (1 - x) + 1,
+            ((cubic_alpha * (2 - x) - 5 * cubic_alpha) * (2 - x) + 8 * cubic_alpha)
+            * (2 - x)
+            - 4 * cubic_alpha,
+        ]
+
+    @staticmethod
+    def _gs_get_linear_coeffs(x):
         x = abs(x)
-        coeffs[0] = 1 - x
-        coeffs[1] = x
-
-    def _gs_bicubic_interpolate(self, p, x, y):
-        v = np.empty((4,), dtype=p.dtype)
-        coeffs = np.empty((4,), dtype=p.dtype)
-        self._gs_get_cubic_coeffs(x, coeffs)
-        for i in range(4):
-            v[i] = coeffs @ p[i, :]
-        self._gs_get_cubic_coeffs(y, coeffs)
-        return coeffs @ v
-
-    def _gs_cubic_interpolation_1d_with_x(self, data, x, border, padding_mode):
-        v = np.empty((4,), dtype=data.dtype)
-        coeffs = np.empty((4,), dtype=data.dtype)
-        x_0 = int(np.floor(x))
-        x_1 = x_0 + 1
-        x_2 = x_0 + 2
-        x_minus_1 = x_0 - 1
-        self._gs_get_cubic_coeffs(x - x_0, coeffs)
-        v[0] = self._pixel_at_array(
-            array=data, i=x_minus_1, border=border, padding_mode=padding_mode
-        )
-        v[1] = self._pixel_at_array(
-            array=data, i=x_0, border=border, padding_mode=padding_mode
-        )
-        v[2] = self._pixel_at_array(
-            array=data, i=x_1, border=border, padding_mode=padding_mode
-        )
-        v[3] = self._pixel_at_array(
-            array=data, i=x_2, border=border, padding_mode=padding_mode
-        )
-
-        return coeffs @ v
-
-    def _gs_linear_interpolation_1d_with_x(self, data, x, border, padding_mode):
-        v = np.empty((2,), dtype=data.dtype)
-        coeffs = np.empty((2,), dtype=data.dtype)
-        x_0 = int(np.floor(x))
-        x_1 = x_0 + 1
-        self._gs_get_linear_coeffs(x - x_0, coeffs)
-        v[0] = self._pixel_at_array(
-            array=data, i=x_0, border=border, padding_mode=padding_mode
-        )
-        v[1] = self._pixel_at_array(
-            array=data, i=x_1, border=border, padding_mode=padding_mode
-        )
-
-        return coeffs @ v
-
-    def _gs_linear_interpolation_nd_with_x(self, data, x, border, padding_mode):
-        num_dims = data.ndim
-        assert num_dims == len(x) == int(len(border) / 2)
-        if num_dims == 1:
-            return self._gs_linear_interpolation_1d_with_x(
-                data=data, x=x[0], border=border, padding_mode=padding_mode
-            )
-
-        res1d = []
-        for i in range(data.shape[0]):
-            r = self._gs_linear_interpolation_nd_with_x(
-                data=data[i],
-                x=x[1:],
-                border=list(border[1:num_dims])
-                + list(border[1 + num_dims : 2 * num_dims]),
-                padding_mode=padding_mode,
-            )
-            res1d.append(r)
-        res1d = np.array(res1d)
-
-        return self._gs_linear_interpolation_1d_with_x(
-            data=res1d,
-            x=x[0],
-            border=[border[0], border[num_dims]],
-            padding_mode=padding_mode,
-        )
-
-    def _gs_cubic_interpolation_nd_with_x(self, data, x, border, padding_mode):
-        num_dims = data.ndim
-        assert num_dims == len(x) == int(len(border) / 2)
-        if num_dims == 1:
-            return self._gs_cubic_interpolation_1d_with_x(
-                data=data, x=x[0], border=border, padding_mode=padding_mode
-            )
-
-        res1d = []
-        for i in range(data.shape[0]):
-            r = self._gs_cubic_interpolation_nd_with_x(
-                data=data[i],
-                x=x[1:],
-                border=list(border[1:num_dims])
-                + list(border[1 + num_dims : 2 * num_dims]),
-                padding_mode=padding_mode,
-            )
-            res1d.append(r)
-        res1d = np.array(res1d)
-
-        return self._gs_cubic_interpolation_1d_with_x(
-            data=res1d,
-            x=x[0],
-            border=[border[0], border[num_dims]],
-            padding_mode=padding_mode,
-        )
-
-    def _clamp(self, val, lo, hi):
-        if val < lo:
-            return lo
-        if val > hi:
-            return hi
-        return val
+        return [1 - x, x]
 
-    def _pixel_at_ndarray(self, ndarray, x: list, border, padding_mode):
-        # boarder: [x_1_min, x_2_min, ..., x_1_max, x_2_max, ...]
-        num_dims = ndarray.ndim
-        assert num_dims == len(x) == int(len(border) / 2)
-        if num_dims == 1:
-            return self._pixel_at_array(
-                array=ndarray, i=x[0], border=border, padding_mode=padding_mode
-            )
-        i = x[0]
-        d = ndarray.shape[0]
-        if padding_mode == "zeros":
-            if i >= 0 and i < d:
-                ndarray = ndarray[i]
-            else:
-                # Trick
-                i = 0
-                ndarray = np.zeros_like(ndarray[i])
-        elif padding_mode == "border":
-            i = self._clamp(i, 0, d - 1)
-            ndarray = ndarray[i]
-        else:  # padding_mode == "reflection"
-            i = int(self._gs_reflect(i, border[0], border[num_dims]))
-            ndarray = ndarray[i]
-
-        return self._pixel_at_ndarray(
-            ndarray=ndarray,
-            x=x[1:],
-            border=list(border[1:num_dims]) + list(border[1 + num_dims : 2 * num_dims]),
-            padding_mode=padding_mode,
-        )
+    def _pixel_indices(self, i, dim: int, x_min, x_max, padding_mode):
+        """Maps integer coordinates along one axis to valid indices.
 
-    def _pixel_at_array(self, array, i: int, border, padding_mode):
-        assert array.ndim == 1
-        d = array.shape[0]
+        Returns the indices and a boolean mask telling which coordinates
+        fall into the input, the mask is None when every coordinate does.
+        """
         if padding_mode == "zeros":
-            if i >= 0 and i < d:
-                pixel = array[i]
-            else:
-                pixel = 0
-        elif padding_mode == "border":
-            i = self._clamp(i, 0, d - 1)
-            pixel = array[i]
-        else:  # padding_mode == "reflection"
-            i = int(self._gs_reflect(i, border[0], border[1]))
-            pixel = array[i]
-        return pixel
+            inside = (i >= 0) & (i < dim)
+            if inside.all():
+                return i, None
+            return np.where(inside, i, 0), inside
+        if padding_mode == "border":
+            return np.clip(i, 0, dim - 1), None
+        # padding_mode == "reflection"
+        return self._gs_reflect(i, x_min, x_max).astype(np.int64), None
 
     def _prepare_border(self, dims, align_corners: bool):
         # boarder: [x_1_min, x_2_min, ..., x_1_max, x_2_max, ...]
@@ -268,28 +120,20 @@ class GridSample(OpRun):
 
         return borders
 
-    def _cpp_std_round(self, x):
-        # https://en.cppreference.com/w/cpp/numeric/math/round
-        def round_single_value(v):
-            if v >= 0.0:
-                return np.floor(v + 0.5)
-            return np.ceil(v - 0.5)
-
-        if isinstance(x, numbers.Number):
-            return round_single_value(x)
-        assert x.ndim == 1
-        x_rounded = np.zeros_like(x)
-        for i in range(x.shape[0]):
-            x_rounded[i] = round_single_value(x[i])
-        return x_rounded.astype(np.int32)
-
     def _run(self, X, grid, mode=None, padding_mode=None, align_corners=None):
         # This implementation supports GridSample arbitrary dimensions.
+        # Every output location of every image is computed at once,
+        # the channels share the same coordinates.
 
         mode = mode or self.mode
         padding_mode = padding_mode or self.padding_mode
         align_corners = align_corners or self.align_corners
 
+        if mode not in ("nearest", "linear", "cubic"):
+            raise RuntimeError(
+                "GridSample interpolation only supports nearest, linear, and cubic modes."
+            )
+
         x_dims = X.shape
         grid_dims = grid.shape
         N = x_dims[0]
@@ -297,69 +141,101 @@ class GridSample(OpRun):
         y_dims = (N, C, *grid_dims[1:-1])
 
         if np.prod(y_dims) == 0:
-            return np.array([], dtype=X.dtype)
-
-        Y = np.empty(y_dims, dtype=X.dtype)
+            return (np.empty(y_dims, dtype=X.dtype),)
 
-        for n in range(N):
-            grid_data = grid[n]
-
-            for c in range(C):
-                # Because the indices in the grid_data are always in the "reverse" dimensional order.
-                # To interpolate for certain positions, we either have to transpose the X_data or
-                # reverse the indices.
-                # In this implementation, we took the latter approach.
-                X_data = X[n, c]
-
-                num_dims = len(x_dims[2:])
-                dims = x_dims[2:]
-
-                # Prepare borders.
-                border = self._prepare_border(dims, align_corners=align_corners)
-
-                for ox in _get_all_coords(Y[n, c]):
-                    # normalized coordinates.
-                    nx = grid_data[tuple(ox)]
-                    nx = nx[::-1]
-                    # denormalized coordinates.
-                    x = self._gs_denormalize_coordinates(
-                        n=nx, dims=dims, align_corners=align_corners
+        dims = x_dims[2:]
+        num_dims = len(dims)
+        border = self._prepare_border(dims, align_corners=align_corners)
+        dtype = X.dtype if X.dtype.kind == "f" else np.dtype(np.float64)
+
+        # The indices in the grid are always in the "reverse" dimensional order,
+        # x[i] is the denormalized coordinate along dims[i], shape (N, points).
+        points = grid.reshape((N, -1, grid_dims[-1]))
+        x = [
+            self._gs_denormalize(
+                points[..., num_dims - 1 - i],
+                length=dims[i],
+                align_corners=align_corners,
+            ).astype(np.float32)
+            for i in range(num_dims)
+        ]
+        if mode == "nearest":
+            # PyTorch round the index to nearest even.
+            # https://github.com/pytorch/pytorch/pull/97000
+            x = [np.rint(v) for v in x]
+        # https://github.com/pytorch/pytorch/blob/v2.0.0/aten/src/ATen/native/GridSampler.h#L142
+        if padding_mode == "border":
+            x = [
+                np.where(
+                    (v < border[i]) | (v > border[i + num_dims]),
+                    np.clip(v, 0, dims[i] - 1),
+                    v,
+                )
+                for i, v in enumerate(x)
+            ]
+        elif padding_mode == "reflection":
+            x = [
+                self._gs_reflect(v, border[i], border[i + num_dims]).astype(np.float32)
+                for i, v in enumerate(x)
+            ]
+
+        # For every axis, the neighbours of every coordinate (indices, mask)
+        # and their weights.
+        neighbours = []
+        weights = []
+        for i, v in enumerate(x):
+            if mode == "nearest":
+                origin = v.astype(np.int32)
+                offsets = [0]
+                coeffs = None
+            else:
+                origin = np.floor(v)
+                if mode == "linear":
+                    offsets = [0, 1]
+                    coeffs = self._gs_get_linear_coeffs(v - origin)
+                else:
+                    offsets = [-1, 0, 1, 2]
+                    coeffs = self._gs_get_cubic_coeffs(v - origin)
+                origin = origin.astype(np.int64)
+                coeffs = [c.astype(dtype) for c in coeffs]
+            neighbours.append(
+                [
+                    self._pixel_indices(
+                        origin + offset,
+                        dims[i],
+                        border[i],
+                        border[i + num_dims],
+                        padding_mode,
                     )
-                    if mode == "nearest":
-                        # PyTorch round the index to nearest even.
-                        # https://github.com/pytorch/pytorch/pull/97000
-                        x = np.rint(x)
-                    # https://github.com/pytorch/pytorch/blob/v2.0.0/aten/src/ATen/native/GridSampler.h#L142
-                    for i, v in enumerate(x):
-                        x_min = border[i]
-                        x_max = border[i + num_dims]
-                        if v < x_min or v > x_max:
-                            if padding_mode == "border":
-                                x[i] = self._clamp(v, 0, dims[i] - 1)
-                            elif padding_mode == "reflection":
-                                x[i] = self._gs_reflect(v, x_min, x_max)
-
-                    if mode == "nearest":
-                        x = x.astype(np.int32)
-                        Y[n][c][tuple(ox)] = self._pixel_at_ndarray(
-                            ndarray=X_data,
-                            x=x,
-                            border=border,
-                            padding_mode=padding_mode,
-                        )
-
-                    elif mode == "linear":
-                        Y[n][c][tuple(ox)] = self._gs_linear_interpolation_nd_with_x(
-                            data=X_data, x=x, border=border, padding_mode=padding_mode
-                        )
-
-                    elif mode == "cubic":
-                        Y[n][c][tuple(ox)] = self._gs_cubic_interpolation_nd_with_x(
-                            data=X_data, x=x, border=border, padding_mode=padding_mode
-                        )
-                    else:
-                        raise RuntimeError(
-                            "GridSample interpolation only supports nearest, linear, and cubic modes."
-                        )
-
-        return (Y.astype(X.dtype),)
+                    for offset in offsets
+                ]
+            )
+            weights.append(coeffs)
+
+        flat_x = X.reshape((N, C, -1))
+        steps = [int(np.prod(dims[i + 1 :])) for i in range(num_dims)]
+        zero = np.zeros((), dtype=X.dtype)
+
+        def interpolate(axis, flat, inside):
+            # The innermost axis is interpolated first, then the result is
+            # interpolated along the previous axis and so on.
+            if axis == num_dims:
+                values = np.take_along_axis(flat_x, flat[:, np.newaxis, :], axis=2)
+                if inside is not None:
+                    values = np.where(inside[:, np.newaxis, :], values, zero)
+                return values
+            res = None
+            for j, (index, valid) in enumerate(neighbours[axis]):
+                if valid is None or inside is None:
+                    mask = inside if valid is None else valid
+                else:
+                    mask = inside & valid
+                values = interpolate(axis + 1, flat + index * steps[axis], mask)
+                if weights[axis] is None:
+                    return values
+                term = weights[axis][j][:, np.newaxis, :] * values.astype(dtype)
+                res = term if res is None else res + term
+            return res
+
+        Y = interpolate(0, np.zeros(x[0].shape, dtype=np.int64), None)
+        return (Y.reshape(y_dims).astype(X.dtype),)
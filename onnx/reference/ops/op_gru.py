@@ -6,6 +6,14 @@ from __future__ import annotations
 import numpy as np
 
 from onnx.reference.op_run import OpRun
+from onnx.reference.ops._op_common_rnn import (
+    _rnn_outputs,
+    _rnn_prepare,
+    _rnn_project_inputs,
+    _rnn_reversed_directions,
+    _rnn_run,
+    _rnn_sequence_indices,
+)
 
 
 class CommonGRU(OpRun):
@@ -20,55 +28,6 @@ class CommonGRU(OpRun):
     def g(self, x):
         return np.tanh(x)
 
-    def _step(self, X, R, B, W, H_0, num_directions):
-        seq_length = X.shape[0]
-        hidden_size = H_0.shape[-1]
-        batch_size = X.shape[1]
-
-        Y = np.empty([seq_length, num_directions, batch_size, hidden_size])
-        h_list = []
-
-        [w_z, w_r, w_h] = np.split(W, 3)
-        [r_z, r_r, r_h] = np.split(R, 3)
-        [w_bz, w_br, w_bh, r_bz, r_br, r_bh] = np.split(B, 6)
-        gates_w = np.transpose(np.concatenate((w_z, w_r)))
-        gates_r = np.transpose(np.concatenate((r_z, r_r)))
-        gates_b = np.add(np.concatenate((w_bz, w_br)), np.concatenate((r_bz, r_br)))
-
-        H_t = H_0
-        for x in np.split(X, X.shape[0], axis=0):
-            gates = np.dot(x, gates_w) + np.dot(H_t, gates_r) + gates_b
-            z, r = np.split(gates, 2, -1)
-            z = self.f(z)
-            r = self.f(r)
-            h_default = self.g(
-                np.dot(x, np.transpose(w_h))
-                + np.dot(r * H_t, np.transpose(r_h))
-                + w_bh
-                + r_bh
-            )
-            h_linear = self.g(
-                np.dot(x, np.transpose(w_h))
-                + r * (np.dot(H_t, np.transpose(r_h)) + r_bh)
-                + w_bh
-            )
-            h = h_linear if self.linear_before_reset else h_default
-            H = (1 - z) * h + z * H_t
-            h_list.append(H)
-            H_t = H
-
-        concatenated = np.concatenate(h_list)
-        if num_directions == 1:
-            Y[:, 0, :, :] = concatenated
-
-        if self.layout == 0:
-            Y_h = Y[-1]
-        else:
-            Y = np.transpose(Y, [2, 0, 1, 3])
-            Y_h = Y[:, :, -1, :]
-
-        return Y, Y_h
-
     def _run(
         self,
         X,
@@ -88,43 +47,59 @@ class CommonGRU(OpRun):
     ):
         # TODO: support overridden attributes.
         num_directions = W.shape[0]
-
-        if num_directions == 1:
-            R = np.squeeze(R, axis=0)
-            W = np.squeeze(W, axis=0)
-            if B is not None:
-                B = np.squeeze(B, axis=0)
-            if sequence_lens is not None:
-                sequence_lens = np.squeeze(sequence_lens, axis=0)
-            if initial_h is not None:
-                initial_h = np.squeeze(initial_h, axis=0)
-
-            hidden_size = R.shape[-1]
-            batch_size = X.shape[1]
-
-            X = X if layout == 0 else np.swapaxes(X, 0, 1)
-            b = (
-                B
-                if B is not None
-                else np.zeros(2 * self.number_of_gates * hidden_size, dtype=X.dtype)
-            )
-            h_0 = (
-                initial_h
-                if initial_h is not None
-                else np.zeros((batch_size, hidden_size), dtype=X.dtype)
-            )
-
-            B = b
-            H_0 = h_0
+        hidden_size = R.shape[-1]
+        dtype = np.result_type(X, W, R)
+        reversed_directions = _rnn_reversed_directions(self.direction, num_directions)
+
+        X, (H_0,) = _rnn_prepare(
+            X, [initial_h], num_directions, hidden_size, layout, dtype
+        )
+        mask, reverse = _rnn_sequence_indices(sequence_lens, X.shape[0], X.shape[1])
+
+        # gates are ordered z, r, h
+        if B is None:
+            bias, r_bh = None, None
         else:
-            raise NotImplementedError(
-                f"Unsupported value {num_directions} for num_directions and operator "
-                f"{self.__class__.__name__!r}."
+            w_b, r_b = np.split(B.astype(dtype), 2, axis=-1)
+            bias = w_b + r_b
+            r_bh = r_b[:, np.newaxis, 2 * hidden_size :]
+            if self.linear_before_reset:
+                # r_bh is multiplied by r, it is added in the loop
+                bias[:, 2 * hidden_size :] = w_b[:, 2 * hidden_size :]
+        projected = _rnn_project_inputs(X, W, bias, reversed_directions, reverse)
+
+        R_t = np.transpose(R, (0, 2, 1)).astype(dtype)
+        if self.linear_before_reset:
+            buffer = np.empty((*H_0.shape[:-1], 3 * hidden_size), dtype=dtype)
+        else:
+            r_zr = R_t[..., : 2 * hidden_size]
+            r_h = R_t[..., 2 * hidden_size :]
+            buffer = np.empty((*H_0.shape[:-1], 2 * hidden_size), dtype=dtype)
+
+        def cell(xw, states):
+            (H_t,) = states
+            if self.linear_before_reset:
+                gates = np.matmul(H_t, R_t, out=buffer)
+                if r_bh is not None:
+                    gates[..., 2 * hidden_size :] += r_bh
+            else:
+                gates = np.matmul(H_t, r_zr, out=buffer)
+            z = self.f(xw[..., :hidden_size] + gates[..., :hidden_size])
+            r = self.f(
+                xw[..., hidden_size : 2 * hidden_size]
+                + gates[..., hidden_size : 2 * hidden_size]
             )
-
-        Y, Y_h = self._step(X, R, B, W, H_0, num_directions=num_directions)
-        Y = Y.astype(X.dtype)
-        return (Y,) if self.n_outputs == 1 else (Y, Y_h.astype(X.dtype))
+            if self.linear_before_reset:
+                h = self.g(
+                    xw[..., 2 * hidden_size :] + r * gates[..., 2 * hidden_size :]
+                )
+            else:
+                h = self.g(xw[..., 2 * hidden_size :] + np.matmul(r * H_t, r_h))
+            return ((1 - z) * h + z * H_t,)
+
+        Y, states = _rnn_run(cell, projected, [H_0], mask, reverse, reversed_directions)
+        outputs = _rnn_outputs(Y, states, layout, X.dtype)
+        return outputs[: max(self.n_outputs, 1)]
 
 
 class GRU(CommonGRU):
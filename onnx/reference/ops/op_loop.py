@@ -6,6 +6,7 @@ from __future__ import annotations
 import numpy as np
 
 from onnx.reference.op_run import OpRun
+from onnx.reference.ops._op_common_scan import _ScanOutputBuffer
 
 
 class Loop(OpRun):
@@ -47,10 +48,11 @@ class Loop(OpRun):
             for name, val in zip(all_inputs, args, strict=False):
                 inputs[name] = val
         if context is not None:
-            for a in context:
-                inputs[a] = context[a]
+            for a in self.subgraph_captures_["body"]:
+                if a in context:
+                    inputs[a] = context[a]
 
-        k_carried_away = [[] for i in range(self.K)]
+        k_carried_away = [_ScanOutputBuffer() for i in range(self.K)]
         it = 0
         while cond and (M is None or it < M):
             self._log("  -- loop> {%r}", context)
@@ -62,8 +64,9 @@ class Loop(OpRun):
                 inputs[body.input_names[1]] = cond
             outputs = self._run_body(inputs, attributes=attributes)
             if self.K > 0:
+                # values are concatenated as np.vstack does
                 for k in range(self.K):
-                    k_carried_away[k].append(outputs[-self.K + k])
+                    k_carried_away[k].append(np.atleast_2d(outputs[-self.K + k]))
             index_cond = self.output_index[cond_name]
             cond = outputs[index_cond]
             if cond is None:
@@ -79,7 +82,11 @@ class Loop(OpRun):
             outputs = [inputs[i] for i in body.input_names[2:]]
         else:
             outputs = outputs[1 : 1 + self.N]
-        outputs.extend([np.vstack(x) for x in k_carried_away])
+        if it == 0 and self.K > 0:
+            raise RuntimeError(
+                "Loop with zero iterations and scan outputs is not supported."
+            )
+        outputs.extend([x.value() for x in k_carried_away])
         while len(outputs) < len(self.onnx_node.output):
             outputs.append(np.empty(shape=()))
         res = tuple(outputs)
@@ -6,6 +6,14 @@ from __future__ import annotations
 import numpy as np
 
 from onnx.reference.op_run import OpRun
+from onnx.reference.ops._op_common_rnn import (
+    _rnn_outputs,
+    _rnn_prepare,
+    _rnn_project_inputs,
+    _rnn_reversed_directions,
+    _rnn_run,
+    _rnn_sequence_indices,
+)
 
 
 class CommonLSTM(OpRun):
@@ -23,56 +31,6 @@ class CommonLSTM(OpRun):
     def h(self, x: np.ndarray) -> np.ndarray:
         return np.tanh(x)
 
-    def _step(
-        self,
-        X: np.ndarray,
-        R: np.ndarray,
-        B: np.ndarray,
-        W: np.ndarray,
-        H_0: np.ndarray,
-        C_0: np.ndarray,
-        P: np.ndarray,
-        num_directions: int,
-    ) -> tuple[np.ndarray, np.ndarray]:
-        seq_length = X.shape[0]
-        hidden_size = H_0.shape[-1]
-        batch_size = X.shape[1]
-
-        Y = np.empty([seq_length, num_directions, batch_size, hidden_size])
-        h_list = []
-
-        [p_i, p_o, p_f] = np.split(P, 3)
-        H_t = H_0
-        C_t = C_0
-        for x in np.split(X, X.shape[0], axis=0):
-            gates = (
-                np.dot(x, np.transpose(W))
-                + np.dot(H_t, np.transpose(R))
-                + np.add(*np.split(B, 2))
-            )
-            i, o, f, c = np.split(gates, 4, -1)
-            i = self.f(i + p_i * C_t)
-            f = self.f(f + p_f * C_t)
-            c = self.g(c)
-            C = f * C_t + i * c
-            o = self.f(o + p_o * C)
-            H = o * self.h(C)
-            h_list.append(H)
-            H_t = H
-            C_t = C
-
-        concatenated = np.concatenate(h_list)
-        if num_directions == 1:
-            Y[:, 0, :, :] = concatenated
-
-        if self.layout == 0:
-            Y_h = Y[-1]
-        else:
-            Y = np.transpose(Y, [2, 0, 1, 3])
-            Y_h = Y[:, :, -1, :]
-
-        return Y, Y_h
-
     def _run(
         self,
         X,
@@ -93,61 +51,57 @@ class CommonLSTM(OpRun):
         layout=None,  # noqa: ARG002
     ):
         # TODO: support overridden attributes.
-        n_gates = 4
-        number_of_peepholes = 3
-
         num_directions = W.shape[0]
+        hidden_size = R.shape[-1]
+        dtype = np.result_type(X, W, R)
+        reversed_directions = _rnn_reversed_directions(self.direction, num_directions)
+
+        X, (H_0, C_0) = _rnn_prepare(
+            X,
+            [initial_h, initial_c],
+            num_directions,
+            hidden_size,
+            self.layout,
+            dtype,
+        )
+        mask, reverse = _rnn_sequence_indices(sequence_lens, X.shape[0], X.shape[1])
+        projected = _rnn_project_inputs(
+            X,
+            W,
+            None if B is None else np.add(*np.split(B, 2, axis=-1)),
+            reversed_directions,
+            reverse,
+        )
 
-        if num_directions == 1:
-            R = np.squeeze(R, axis=0)
-            W = np.squeeze(W, axis=0)
-            if B is not None and len(B.shape) > 0 and B.shape[0] == 1:
-                B = np.squeeze(B, axis=0)
-            if (
-                sequence_lens is not None
-                and len(sequence_lens.shape) > 0
-                and sequence_lens.shape[0] == 1
-            ):
-                sequence_lens = np.squeeze(sequence_lens, axis=0)
-            if (
-                initial_h is not None
-                and len(initial_h.shape) > 0
-                and initial_h.shape[0] == 1
-            ):
-                initial_h = np.squeeze(initial_h, axis=0)
-            if (
-                initial_c is not None
-                and len(initial_c.shape) > 0
-                and initial_c.shape[0] == 1
-            ):
-                initial_c = np.squeeze(initial_c, axis=0)
-            if P is not None and len(P.shape) > 0 and P.shape[0] == 1:
-                P = np.squeeze(P, axis=0)
-
-            hidden_size = R.shape[-1]
-            batch_size = X.shape[1]
+        R_t = np.transpose(R, (0, 2, 1)).astype(dtype)
+        if P is not None:
+            # peepholes, shape (num_directions, 1, hidden_size)
+            p_i, p_o, p_f = np.split(P.astype(dtype)[:, np.newaxis, :], 3, axis=-1)
+        buffer = np.empty((*H_0.shape[:-1], R_t.shape[-1]), dtype=dtype)
 
-            if self.layout != 0:
-                X = np.swapaxes(X, 0, 1)
-            if B is None:
-                B = np.zeros(2 * n_gates * hidden_size, dtype=np.float32)
-            if P is None:
-                P = np.zeros(number_of_peepholes * hidden_size, dtype=np.float32)
-            if initial_h is None:
-                initial_h = np.zeros((batch_size, hidden_size), dtype=np.float32)
-            if initial_c is None:
-                initial_c = np.zeros((batch_size, hidden_size), dtype=np.float32)
-        else:
-            raise NotImplementedError(  # pragma: no cover
-                f"Unsupported value {num_directions!r} for num_directions "
-                f"and operator {self.__class__.__name__!r}."
-            )
+        def cell(xw, states):
+            H_t, C_t = states
+            gates = np.matmul(H_t, R_t, out=buffer)
+            gates += xw
+            i, o, f, c = np.split(gates, 4, -1)
+            if P is not None:
+                i = i + p_i * C_t
+                f = f + p_f * C_t
+            i = self.f(i)
+            f = self.f(f)
+            c = self.g(c)
+            C = f * C_t + i * c
+            if P is not None:
+                o = o + p_o * C
+            o = self.f(o)
+            H = o * self.h(C)
+            return H, C
 
-        Y, Y_h = self._step(
-            X, R, B, W, initial_h, initial_c, P, num_directions=num_directions
+        Y, states = _rnn_run(
+            cell, projected, [H_0, C_0], mask, reverse, reversed_directions
         )
-        Y = Y.astype(X.dtype)
-        return (Y,) if self.n_outputs == 1 else (Y, Y_h.astype(X.dtype))
+        outputs = _rnn_outputs(Y, states, self.layout, X.dtype)
+        return outputs[: max(self.n_outputs, 1)]
 
 
 class LSTM(CommonLSTM):
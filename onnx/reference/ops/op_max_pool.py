@@ -138,185 +138,24 @@ class MaxPool(CommonPool):
                         )
                     )
 
-        if len(input_spatial_shape) == 1:
-            return self._max_pool_1d(
-                x,
-                auto_pad,
-                ceil_mode,
-                dilations,
-                kernel_shape,
-                new_pads,
-                storage_order,
-                strides,
-                output_spatial_shape,
-            )
-
-        if len(input_spatial_shape) == 2:
-            return self._max_pool_2d(
-                x,
-                auto_pad,
-                ceil_mode,
-                dilations,
-                kernel_shape,
-                new_pads,
-                storage_order,
-                strides,
-                output_spatial_shape,
-            )
-
-        if len(input_spatial_shape) == 3:
-            return self._max_pool_3d(
-                x,
-                auto_pad,
-                ceil_mode,
-                dilations,
-                kernel_shape,
-                new_pads,
-                storage_order,
-                strides,
-                output_spatial_shape,
-            )
-
-        raise RuntimeError(f"Not implemented yet for shape {x.shape}.")
-
-    def _max_pool_1d(
-        self,
-        x,
-        auto_pad,  # noqa: ARG002
-        ceil_mode,  # noqa: ARG002
-        dilations,
-        kernel_shape,
-        new_pads,
-        storage_order,  # noqa: ARG002
-        strides,
-        output_spatial_shape,
-    ):
-        global_pooling = False
-        y_dims = x.shape[:2] + tuple(output_spatial_shape)
-        y = np.zeros(y_dims, dtype=x.dtype)
-        indices = np.full(y_dims, dtype=np.int64, fill_value=-1)
-        x_dims = x.shape
-        channels = x_dims[1]
-        height = x_dims[2]
-        pooled_height = y_dims[2]
-        total_channels = x_dims[0] * channels
-        stride_h = 1 if global_pooling else strides[0]
-
-        x_step = height
-        y_step = pooled_height
-        dilation_h = dilations[0]
-
-        X_data = x.ravel()
-        Y_data = y.ravel()
-        I_data = indices.ravel()
-
-        def iteration(c):
-            x_d = c * x_step
-            y_d = c * y_step
-            i_d = c * y_step
-            for ph in range(pooled_height):
-                hstart = ph * stride_h - new_pads[0, 0]
-                hend = hstart + kernel_shape[0] * dilation_h
-                Yh = None
-                h_index = -1
-                for h in range(hstart, hend, dilation_h):
-                    if h < 0 or h >= height:
-                        continue
-                    if Yh is None or X_data[x_d + h] > Yh:
-                        Yh = X_data[x_d + h]
-                        h_index = h
-                Y_data[y_d + ph] = Yh
-                I_data[i_d + ph] = c * x_step + h_index
-
-        for c in range(total_channels):
-            iteration(c)
-
-        if len(self.output) == 1:
-            return (Y_data.reshape(y_dims),)
-        return (Y_data.reshape(y_dims), I_data.reshape(y_dims))
-
-    def _max_pool_2d(
-        self,
-        x,
-        auto_pad,  # noqa: ARG002
-        ceil_mode,  # noqa: ARG002
-        dilations,
-        kernel_shape,
-        new_pads,
-        storage_order,
-        strides,
-        output_spatial_shape,
-    ):
-        global_pooling = False
-        y_dims = x.shape[:2] + tuple(output_spatial_shape)
-        y = np.zeros(y_dims, dtype=x.dtype)
-        indices = np.full(y_dims, dtype=np.int64, fill_value=-1)
-        x_dims = x.shape
-        channels = x_dims[1]
-        height = x_dims[2]
-        width = x_dims[3] if len(kernel_shape) > 1 else 1
-        pooled_height = y_dims[2]
-        pooled_width = y_dims[3] if len(kernel_shape) > 1 else 1
-        total_channels = x_dims[0] * channels
-        stride_h = 1 if global_pooling else strides[0]
-        stride_w = 1 if global_pooling else strides[1]
-
-        x_step = height * width
-        y_step = pooled_height * pooled_width
-        dilation_h = dilations[0]
-        dilation_w = dilations[1]
-
-        X_data = x.ravel()
-        Y_data = y.ravel()
-        I_data = indices.ravel()
-
-        def iteration(c):
-            x_d = c * x_step  # X_data
-            y_d = c * y_step  # Y_data
-            for ph in range(pooled_height):
-                hstart = ph * stride_h - new_pads[0, 0]
-                hend = hstart + kernel_shape[0] * dilation_h
-                for pw in range(pooled_width):
-                    wstart = pw * stride_w - new_pads[1, 0]
-                    wend = wstart + kernel_shape[1] * dilation_w
-                    pool_index = ph * pooled_width + pw
-                    Yh = None
-                    h_index = -1
-                    w_index = -1
-                    for h in range(hstart, hend, dilation_h):
-                        if h < 0 or h >= height:
-                            continue
-                        for w in range(wstart, wend, dilation_w):
-                            if w < 0 or w >= width:
-                                continue
-                            input_index = h * width + w
-                            if input_index < 0 or input_index > X_data.shape[0]:
-                                continue
-                            if Yh is None or X_data[x_d + input_index] > Yh:
-                                Yh = X_data[x_d + input_index]
-                                h_index = h
-                                w_index = w
-                    if Yh is None:
-                        continue
-                    Y_data[y_d + pool_index] = Yh
-                    I_data[y_d + pool_index] = (
-                        c * x_step + h_index * width + w_index
-                        if storage_order == 0
-                        else c * x_step + h_index + w_index * height
-                    )
-
-        for c in range(total_channels):
-            iteration(c)
-
+        if len(input_spatial_shape) not in (1, 2, 3):
+            raise RuntimeError(f"Not implemented yet for shape {x.shape}.")
+        y, indices = self._max_pool_windows(
+            x,
+            dilations,
+            kernel_shape,
+            new_pads,
+            storage_order,
+            strides,
+            output_spatial_shape,
+        )
         if len(self.output) == 1:
-            return (Y_data.reshape(y_dims),)
-        return (Y_data.reshape(y_dims), I_data.reshape(y_dims))
+            return (y,)
+        return (y, indices)
 
-    def _max_pool_3d(
-        self,
+    @staticmethod
+    def _max_pool_windows(
         x,
-        auto_pad,  # noqa: ARG002
-        ceil_mode,  # noqa: ARG002
         dilations,
         kernel_shape,
         new_pads,
@@ -324,90 +163,102 @@ class MaxPool(CommonPool):
         strides,
         output_spatial_shape,
     ):
-        global_pooling = False
-        y_dims = x.shape[:2] + tuple(output_spatial_shape)
-        y = np.zeros(y_dims, dtype=x.dtype)
-        indices = np.full(y_dims, dtype=np.int64, fill_value=-1)
-        x_dims = x.shape
-        channels = x_dims[1]
-        height = x_dims[2]
-        width = x_dims[3] if len(kernel_shape) > 1 else 1
-        depth = x_dims[4] if len(kernel_shape) > 2 else 1
-        pooled_height = y_dims[2]
-        pooled_width = y_dims[3] if len(kernel_shape) > 1 else 1
-        pooled_depth = y_dims[4] if len(kernel_shape) > 2 else 1
-        total_channels = x_dims[0] * channels
-        stride_h = 1 if global_pooling else strides[0]
-        stride_w = 1 if global_pooling else strides[1]
-        stride_d = 1 if global_pooling else strides[2]
-
-        x_step = height * width * depth
-        y_step = pooled_height * pooled_width * pooled_depth
-        dilation_h = dilations[0]
-        dilation_w = dilations[1]
-        dilation_d = dilations[2]
-
-        X_data = x.ravel()
-        Y_data = y.ravel()
-        I_data = indices.ravel()
-
-        def iteration(c):
-            x_d = c * x_step
-            y_d = c * y_step
-            i_d = c * y_step
-
-            for ph in range(pooled_height):
-                hstart = ph * stride_h - new_pads[0, 0]
-                hend = hstart + kernel_shape[0] * dilation_h
-                for pw in range(pooled_width):
-                    wstart = pw * stride_w - new_pads[1, 0]
-                    wend = wstart + kernel_shape[1] * dilation_w
-                    for pd in range(pooled_depth):
-                        dstart = pd * stride_d - new_pads[2, 0]
-                        dend = dstart + kernel_shape[2] * dilation_d
-                        pool_index = (
-                            ph * pooled_width * pooled_depth + pw * pooled_depth + pd
-                        )
-                        Yh = None
-                        h_index = -1
-                        w_index = -1
-                        d_index = -1
-                        for h in range(hstart, hend, dilation_h):
-                            if h < 0 or h >= height:
-                                continue
-                            for w in range(wstart, wend, dilation_w):
-                                if w < 0 or w >= width:
-                                    continue
-                                for d in range(dstart, dend, dilation_d):
-                                    if d < 0 or d >= depth:
-                                        continue
-                                    input_index = h * width * depth + w * depth + d
-                                    if Yh is None or X_data[x_d + input_index] > Yh:
-                                        Yh = X_data[x_d + input_index]
-                                        h_index = h
-                                        w_index = w
-                                        d_index = d
-
-                        Y_data[y_d + pool_index] = Yh
-                        I_data[i_d + pool_index] = (
-                            (
-                                c * x_step
-                                + h_index * width * depth
-                                + w_index * depth
-                                + d_index
-                            )
-                            if storage_order == 0
-                            else (
-                                c * x_step
-                                + h_index
-                                + w_index * height
-                                + d_index * height * width
-                            )
-                        )
+        """Computes the maximum of every window and its flattened index.
+
+        The padded input is viewed as an array of shape
+        `(N, C, *output_spatial_shape, prod(kernel_shape))` with
+        :func:`numpy.lib.stride_tricks.sliding_window_view`, no window
+        is copied. Within a window, elements are visited in C order,
+        the first element falling into the input is kept unless another
+        one is strictly greater, a nan is only kept if it comes first.
+        """
+        n_dims = len(kernel_shape)
+        spatial = x.shape[2:]
+        output_spatial_shape = tuple(max(int(o), 0) for o in output_spatial_shape)
+        if 0 in output_spatial_shape:
+            shape = (x.shape[0], x.shape[1], *output_spatial_shape)
+            return np.empty(shape, dtype=x.dtype), np.empty(shape, dtype=np.int64)
+        extents = [
+            (k - 1) * d + 1 for k, d in zip(kernel_shape, dilations, strict=True)
+        ]
+        # the padded input must contain every window,
+        # a negative pad removes the beginning of the input
+        crop = [slice(None), slice(None)]
+        pad_width = [(0, 0), (0, 0)]
+        for i in range(n_dims):
+            begin = int(new_pads[i, 0])
+            needed = (output_spatial_shape[i] - 1) * strides[i] + extents[i]
+            available = spatial[i] - max(-begin, 0)
+            crop.append(slice(max(-begin, 0), None))
+            pad_width.append(
+                (max(begin, 0), max(needed - available - max(begin, 0), 0))
+            )
+        padded = np.pad(x[tuple(crop)], pad_width)
+        inside = np.pad(
+            np.ones(spatial, dtype=np.bool_)[tuple(crop[2:])], pad_width[2:]
+        )
 
-        for c in range(total_channels):
-            iteration(c)
+        def windows(a):
+            axes = tuple(range(a.ndim - n_dims, a.ndim))
+            view = np.lib.stride_tricks.sliding_window_view(a, extents, axis=axes)
+            index = (
+                Ellipsis,
+                *(
+                    slice(0, o * s, s)
+                    for o, s in zip(output_spatial_shape, strides, strict=True)
+                ),
+                *(slice(None, None, d) for d in dilations),
+            )
+            view = view[index]
+            return view.reshape((*view.shape[: -2 * n_dims], *output_spatial_shape, -1))
+
+        values = windows(padded)
+        valid = windows(inside)
+        empty = ~valid.any(axis=-1)
+        if np.issubdtype(x.dtype, np.floating):
+            keep = valid & ~np.isnan(values)
+            lowest = -np.inf
+        else:
+            keep = np.broadcast_to(valid, values.shape)
+            lowest = np.iinfo(x.dtype).min
+        highest = np.max(values, axis=-1, where=keep, initial=lowest)
+        position = np.argmax(keep & (values == highest[..., np.newaxis]), axis=-1)
+        if np.issubdtype(x.dtype, np.floating):
+            # a nan is kept if it is the first element inside the input
+            first = np.broadcast_to(np.argmax(valid, axis=-1), position.shape)
+            first_value = np.take_along_axis(values, first[..., np.newaxis], axis=-1)
+            position = np.where(np.isnan(first_value[..., 0]), first, position)
+        y = np.take_along_axis(values, position[..., np.newaxis], axis=-1)[..., 0]
+
+        # coordinates of the maximum in the input, -1 for an empty window
+        offsets = np.unravel_index(position, kernel_shape)
+        coordinates = []
+        for i in range(n_dims):
+            shape = [1] * n_dims
+            shape[i] = output_spatial_shape[i]
+            start = np.arange(output_spatial_shape[i]) * strides[i] - int(
+                new_pads[i, 0]
+            )
+            coordinates.append(
+                np.where(empty, -1, start.reshape(shape) + offsets[i] * dilations[i])
+            )
+        if storage_order == 0:
+            # C order
+            steps = [int(np.prod(spatial[i + 1 :])) for i in range(n_dims)]
+        else:
+            # Fortran order
+            steps = [int(np.prod(spatial[:i])) for i in range(n_dims)]
+        flat = sum(c * step for c, step in zip(coordinates, steps, strict=True))
+        channels = np.arange(x.shape[0] * x.shape[1], dtype=np.int64).reshape(
+            (x.shape[0], x.shape[1]) + (1,) * n_dims
+        )
+        indices = channels * int(np.prod(spatial)) + flat
 
-        if len(self.output) == 1:
-            return (Y_data.reshape(y_dims),)
-        return (Y_data.reshape(y_dims), I_data.reshape(y_dims))
+        if empty.any():
+            # no element of the input falls into these windows
+            if n_dims == 2:
+                y = np.where(empty, np.zeros((), dtype=x.dtype), y)
+                indices[..., empty] = -1
+            else:
+                y = np.where(empty, np.nan, y).astype(x.dtype)
+        return y, indices
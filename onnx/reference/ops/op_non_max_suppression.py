@@ -24,105 +24,98 @@ class PrepareContext:
     num_boxes_: int = 0
 
 
-class SelectedIndex:
-    __slots__ = ("batch_index_", "box_index_", "class_index_")
+# maximum number of elements and rows of a block of the suppression matrix
+_CHUNK_SIZE = 2**22
+_BLOCK_SIZE = 64
 
-    def __init__(
-        self, batch_index: int = 0, class_index: int = 0, box_index: int = 0
-    ) -> None:
-        self.batch_index_ = batch_index
-        self.class_index_ = class_index
-        self.box_index_ = box_index
 
-
-def max_min(lhs: float, rhs: float) -> tuple[float, float]:
-    if lhs >= rhs:
-        return rhs, lhs
-    return lhs, rhs
-
-
-def suppress_by_iou(  # noqa: PLR0911
-    boxes_data: np.ndarray,
-    box_index1: int,
-    box_index2: int,
-    center_point_box: int,
-    iou_threshold: float,
-) -> bool:
-    box1 = boxes_data[box_index1]
-    box2 = boxes_data[box_index2]
+def box_corners(boxes: np.ndarray, center_point_box: int) -> np.ndarray:
+    """Returns `x_min, x_max, y_min, y_max, area` for every box,
+    an array of shape `(N, 5)`.
+    """
     # center_point_box_ only support 0 or 1
     if center_point_box == 0:
         # boxes data format [y1, x1, y2, x2]
-        x1_min, x1_max = max_min(box1[1], box1[3])
-        x2_min, x2_max = max_min(box2[1], box2[3])
-
-        intersection_x_min = max(x1_min, x2_min)
-        intersection_x_max = min(x1_max, x2_max)
-        if intersection_x_max <= intersection_x_min:
-            return False
-
-        y1_min, y1_max = max_min(box1[0], box1[2])
-        y2_min, y2_max = max_min(box2[0], box2[2])
-        intersection_y_min = max(y1_min, y2_min)
-        intersection_y_max = min(y1_max, y2_max)
-        if intersection_y_max <= intersection_y_min:
-            return False
+        x_min = np.minimum(boxes[:, 1], boxes[:, 3])
+        x_max = np.maximum(boxes[:, 1], boxes[:, 3])
+        y_min = np.minimum(boxes[:, 0], boxes[:, 2])
+        y_max = np.maximum(boxes[:, 0], boxes[:, 2])
     else:
         # 1 == center_point_box_ => boxes data format [x_center, y_center, width, height]
-        box1_width_half = box1[2] / 2
-        box1_height_half = box1[3] / 2
-        box2_width_half = box2[2] / 2
-        box2_height_half = box2[3] / 2
-
-        x1_min = box1[0] - box1_width_half
-        x1_max = box1[0] + box1_width_half
-        x2_min = box2[0] - box2_width_half
-        x2_max = box2[0] + box2_width_half
-
-        intersection_x_min = max(x1_min, x2_min)
-        intersection_x_max = min(x1_max, x2_max)
-        if intersection_x_max <= intersection_x_min:
-            return False
-
-        y1_min = box1[1] - box1_height_half
-        y1_max = box1[1] + box1_height_half
-        y2_min = box2[1] - box2_height_half
-        y2_max = box2[1] + box2_height_half
-
-        intersection_y_min = max(y1_min, y2_min)
-        intersection_y_max = min(y1_max, y2_max)
-        if intersection_y_max <= intersection_y_min:
-            return False
-
-    intersection_area = (intersection_x_max - intersection_x_min) * (
-        intersection_y_max - intersection_y_min
+        width_half = boxes[:, 2] / 2
+        height_half = boxes[:, 3] / 2
+        x_min = boxes[:, 0] - width_half
+        x_max = boxes[:, 0] + width_half
+        y_min = boxes[:, 1] - height_half
+        y_max = boxes[:, 1] + height_half
+    area = (x_max - x_min) * (y_max - y_min)
+    return np.stack([x_min, x_max, y_min, y_max, area], axis=1)
+
+
+def suppress_by_iou(
+    corners1: np.ndarray, corners2: np.ndarray, iou_threshold: float
+) -> np.ndarray:
+    """Tells for every pair of boxes of `corners1` and `corners2`
+    (see :func:`box_corners`) if the intersection over union
+    exceeds `iou_threshold`, an empty or degenerated intersection
+    never suppresses a box. Returns a boolean matrix of shape
+    `(len(corners1), len(corners2))`.
+    """
+    box1 = corners1[:, np.newaxis, :]
+    box2 = corners2[np.newaxis, :, :]
+    intersection_width = np.minimum(box1[..., 1], box2[..., 1]) - np.maximum(
+        box1[..., 0], box2[..., 0]
+    )
+    intersection_height = np.minimum(box1[..., 3], box2[..., 3]) - np.maximum(
+        box1[..., 2], box2[..., 2]
+    )
+    intersection_area = intersection_width * intersection_height
+    union_area = box1[..., 4] + box2[..., 4] - intersection_area
+    with np.errstate(divide="ignore", invalid="ignore"):
+        intersection_over_union = intersection_area / union_area
+    return (
+        (intersection_width > 0)
+        & (intersection_height > 0)
+        & (intersection_area > 0)
+        & (box1[..., 4] > 0)
+        & (box2[..., 4] > 0)
+        & (union_area > 0)
+        & (intersection_over_union > iou_threshold)
     )
-    if intersection_area <= 0:
-        return False
-
-    area1 = (x1_max - x1_min) * (y1_max - y1_min)
-    area2 = (x2_max - x2_min) * (y2_max - y2_min)
-    union_area = area1 + area2 - intersection_area
-
-    if area1 <= 0 or area2 <= 0 or union_area <= 0:
-        return False
-
-    intersection_over_union = intersection_area / union_area
-    return intersection_over_union > iou_threshold
-
 
-class BoxInfo:
-    def __init__(self, score: float = 0, idx: int = -1):
-        self.score_ = score
-        self.idx_ = idx
 
-    def __lt__(self, rhs) -> bool:
-        return self.score_ < rhs.score_ or (
-            self.score_ == rhs.score_ and self.idx_ > rhs.idx_
-        )
-
-    def __repr__(self) -> str:
-        return f"BoxInfo({self.score_}, {self.idx_})"
+def select_boxes(
+    corners: np.ndarray, order: np.ndarray, max_output: int, iou_threshold: float
+) -> list[int]:
+    """Greedy suppression of boxes sorted by decreasing scores.
+
+    Sorted boxes are processed by tiles. A tile is first compared with
+    every box already selected, the greedy selection then runs inside
+    the tile over its own suppression matrix. A tile holds at most
+    `_BLOCK_SIZE` boxes and a matrix at most `_CHUNK_SIZE` elements.
+    """
+    n = order.shape[0]
+    sorted_corners = corners[order]
+    selected: list[int] = []
+    tile = min(max(_CHUNK_SIZE // max(n, 1), 1), _BLOCK_SIZE)
+    for begin in range(0, n, tile):
+        if len(selected) >= max_output:
+            break
+        block = sorted_corners[begin : begin + tile]
+        alive = np.ones(block.shape[0], dtype=np.bool_)
+        if selected:
+            alive &= ~suppress_by_iou(
+                sorted_corners[selected], block, iou_threshold
+            ).any(axis=0)
+        matrix = suppress_by_iou(block, block, iou_threshold)
+        for i in np.flatnonzero(alive):
+            if not alive[i]:
+                continue
+            selected.append(begin + int(i))
+            if len(selected) >= max_output:
+                break
+            alive &= ~matrix[i]
+    return [int(order[i]) for i in selected]
 
 
 class NonMaxSuppression(OpRun):
@@ -205,67 +198,22 @@ class NonMaxSuppression(OpRun):
         scores_data = pc.scores_data_
 
         selected_indices = []
-        # std::vector<BoxInfo> selected_boxes_inside_class;
-        # selected_boxes_inside_class.reserve(
-        #    std::min<size_t>(static_cast<size_t>(max_output_boxes_per_class), pc.num_boxes_));
-
         for batch_index in range(pc.num_batches_):
+            corners = box_corners(boxes_data[batch_index], center_point_box)
             for class_index in range(pc.num_classes_):
-                box_score_offset = (batch_index, class_index)
-                batch_boxes = boxes_data[batch_index]
-                # std::vector<BoxInfo> candidate_boxes;
-                # candidate_boxes.reserve(pc.num_boxes_);
-
+                class_scores = scores_data[batch_index, class_index]
                 # Filter by score_threshold_
-                candidate_boxes = []
-                class_scores = scores_data[box_score_offset]
                 if pc.score_threshold_ is not None:
-                    for box_index in range(pc.num_boxes_):
-                        if class_scores[box_index] > score_threshold:
-                            candidate_boxes.append(  # noqa: PERF401
-                                BoxInfo(class_scores[box_index], box_index)
-                            )
+                    candidates = np.flatnonzero(class_scores > score_threshold)
                 else:
-                    for box_index in range(pc.num_boxes_):
-                        candidate_boxes.append(  # noqa: PERF401
-                            BoxInfo(class_scores[box_index], box_index)
-                        )
-
-                sorted_boxes = sorted(candidate_boxes)
-
-                selected_boxes_inside_class = []
-                # Get the next box with top score, filter by iou_threshold.
-                while (
-                    len(sorted_boxes) > 0
-                    and len(selected_boxes_inside_class) < max_output_boxes_per_class
-                ):
-                    next_top_score = sorted_boxes[-1]
-
-                    selected = True
-                    # Check with existing selected boxes for this class,
-                    # suppress if exceed the IOU (Intersection Over Union) threshold.
-                    for selected_index in selected_boxes_inside_class:
-                        if suppress_by_iou(
-                            batch_boxes,
-                            next_top_score.idx_,
-                            selected_index.idx_,
-                            center_point_box,
-                            iou_threshold,
-                        ):
-                            selected = False
-                            break
-
-                    if selected:
-                        selected_boxes_inside_class.append(next_top_score)
-                        selected_indices.append(
-                            SelectedIndex(batch_index, class_index, next_top_score.idx_)
-                        )
-
-                    sorted_boxes.pop()
-
-        result = np.empty((len(selected_indices), 3), dtype=np.int64)
-        for i in range(result.shape[0]):
-            result[i, 0] = selected_indices[i].batch_index_
-            result[i, 1] = selected_indices[i].class_index_
-            result[i, 2] = selected_indices[i].box_index_
-        return (result,)
+                    candidates = np.arange(pc.num_boxes_)
+                # decreasing scores, the lowest index first for equal scores
+                order = candidates[np.argsort(-class_scores[candidates], kind="stable")]
+                selected = select_boxes(
+                    corners, order, max_output_boxes_per_class, iou_threshold
+                )
+                selected_indices.extend(
+                    (batch_index, class_index, box_index) for box_index in selected
+                )
+
+        return (np.array(selected_indices, dtype=np.int64).reshape((-1, 3)),)
@@ -8,11 +8,26 @@ import re
 import numpy as np
 
 from onnx.reference.op_run import OpRun
+from onnx.reference.ops._helpers import _unique_inverse
 
 _acceptable_str_dtypes = ("U", "O")
 
 
 class RegexFullMatch(OpRun):
+    def __init__(self, onnx_node, run_params):
+        OpRun.__init__(self, onnx_node, run_params)
+        self._patterns = {}
+
+    def _compile(self, pattern):
+        regex = self._patterns.get(pattern, None)
+        if regex is None:
+            try:
+                regex = re.compile(pattern)
+            except re.error as e:
+                raise ValueError(f"Invalid regex pattern {pattern!r}") from e
+            self._patterns[pattern] = regex
+        return regex
+
     def _run(self, x, pattern=None):
         # Note: The ONNX specification states that the pattern MUST
         # follow the re2 syntax. Python's own re package appears to
@@ -25,12 +40,11 @@ class RegexFullMatch(OpRun):
         # As per onnx/mapping.py, object numpy dtype corresponds to TensorProto.STRING
         if x.dtype.kind not in _acceptable_str_dtypes:
             raise TypeError(f"Input must be string tensor, received dtype {x.dtype}")
-        try:
-            regex = re.compile(pattern)
-        except re.error as e:
-            raise ValueError(f"Invalid regex pattern {pattern!r}") from e
+        regex = self._compile(pattern)
 
-        fullmatch_func = np.vectorize(
-            lambda x: regex.fullmatch(x) is not None, otypes=[np.bool_]
+        # every distinct string is matched once
+        uniques, inverse = _unique_inverse(x.ravel().tolist())
+        matches = np.array(
+            [regex.fullmatch(u) is not None for u in uniques], dtype=np.bool_
         )
-        return (fullmatch_func(x),)
+        return (matches[inverse].reshape(x.shape),)
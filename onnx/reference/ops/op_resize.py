@@ -10,6 +10,7 @@ import numpy as np
 
 import onnx
 from onnx.reference.op_run import OpRun
+from onnx.reference.ops._helpers import _PlanCache
 
 if TYPE_CHECKING:
     from collections.abc import Callable
@@ -367,32 +368,31 @@ def _compute_x_ori(
     return x_ori, is_extrapolated
 
 
-def _interpolate_1d_along_axis(
-    data: np.ndarray,
-    axis: int,
+def _axis_plan(
+    input_width: int,
     scale_factor: float,
     output_width_int: int,
     get_coeffs: Callable[[float, float], np.ndarray],
     roi: np.ndarray | list[float] | None = None,
-    extrapolation_value: float = 0.0,
     coordinate_transformation_mode: str = "half_pixel",
     exclude_outside: bool = False,
-) -> np.ndarray:
-    """Vectorized 1-D resize along a single axis.
-
-    Computes the same result as calling :func:`_interpolate_1d_with_x` for
-    every output coordinate along ``axis``, but in a single batched numpy
-    operation. Resize interpolation is separable along axes, so resizing an
-    N-D tensor reduces to applying this routine once per axis.
+) -> tuple[np.ndarray, np.ndarray | None, np.ndarray | None]:
+    """Computes how a 1-D resize gathers and weights the input.
+
+    Applying the plan (see :func:`_interpolate_with_plan`) computes the same
+    result as calling :func:`_interpolate_1d_with_x` for every output
+    coordinate. Returns the indices of the neighbours of every output
+    coordinate `(output_width_int, n)`, their coefficients and the mask
+    of the extrapolated coordinates (only for ``tf_crop_and_resize``).
+    When every output is a copy of one input element (nearest mode,
+    integer scales), the coefficients are None and the indices have
+    shape `(output_width_int,)`.
     """
     if output_width_int == 0:
         # Zero-sized output along this axis — nothing to interpolate, but
         # downstream code indexes ratios[0] / coeffs[0], so bail out early.
-        empty_shape = list(data.shape)
-        empty_shape[axis] = 0
-        return np.empty(empty_shape, dtype=data.dtype)
+        return np.empty((0,), dtype=np.intp), None, None
 
-    input_width = data.shape[axis]
     output_width = scale_factor * input_width
     y = np.arange(output_width_int, dtype=np.float64)
 
@@ -454,18 +454,41 @@ def _interpolate_1d_along_axis(
     # Edge-padding is equivalent to clamping indices into the valid range.
     # intp cast: np.take rejects int64 indices on 32-bit platforms.
     clamped = np.clip(neighbor_idxes, 0, input_width - 1).astype(np.intp)
-    gathered = np.take(data, clamped, axis=axis)
+    nonzero = coeffs != 0
+    if (nonzero.sum(axis=1) == 1).all() and (coeffs[nonzero] == 1).all():
+        return clamped[nonzero], None, is_extrapolated
+    return clamped, coeffs, is_extrapolated
 
-    coeff_shape = (1,) * axis + coeffs.shape + (1,) * (data.ndim - axis - 1)
-    weighted = gathered * coeffs.reshape(coeff_shape)
-    result = weighted.sum(axis=axis + 1)
 
-    if is_extrapolated is not None and is_extrapolated.any():
-        mask_shape = (1,) * axis + (output_width_int,) + (1,) * (data.ndim - axis - 1)
-        mask = is_extrapolated.reshape(mask_shape)
-        result = np.where(mask, extrapolation_value, result)
+def _interpolate_with_plan(
+    data: np.ndarray,
+    plan: list[tuple[int, np.ndarray, np.ndarray | None, np.ndarray | None]],
+    extrapolation_value: float = 0.0,
+) -> np.ndarray:
+    """Resizes every axis of a plan built by :func:`_interpolation_plan`.
 
-    return result  # type: ignore[no-any-return]
+    Every axis costs one gather per neighbour and a weighted sum.
+    """
+    result = data if data.dtype == np.float64 else data.astype(np.float64)
+    for axis, indices, coeffs, is_extrapolated in plan:
+        if coeffs is None:
+            result = np.take(result, indices, axis=axis)
+        else:
+            coeff_shape = (1,) * axis + (-1,) + (1,) * (result.ndim - axis - 1)
+            weighted = np.take(result, indices[:, 0], axis=axis)
+            weighted *= coeffs[:, 0].reshape(coeff_shape)
+            for k in range(1, coeffs.shape[1]):
+                weighted += np.take(result, indices[:, k], axis=axis) * coeffs[
+                    :, k
+                ].reshape(coeff_shape)
+            result = weighted
+
+        if is_extrapolated is not None and is_extrapolated.any():
+            mask_shape = (1,) * axis + (-1,) + (1,) * (result.ndim - axis - 1)
+            mask = is_extrapolated.reshape(mask_shape)
+            result = np.where(mask, extrapolation_value, result)
+
+    return result
 
 
 def _interpolate_nd(
@@ -477,18 +500,54 @@ def _interpolate_nd(
     roi: np.ndarray | None = None,
     keep_aspect_ratio_policy: str | None = "stretch",
     exclude_outside: bool = False,
+    extrapolation_value: float = 0.0,
     **kwargs: Any,
 ) -> np.ndarray:
-    if output_size is None and scale_factors is None:
-        raise ValueError("output_size is None and scale_factors is None.")
+    plan = _interpolation_plan(
+        data.shape,
+        get_coeffs,
+        output_size=output_size,
+        scale_factors=scale_factors,
+        axes=axes,
+        roi=roi,
+        keep_aspect_ratio_policy=keep_aspect_ratio_policy,
+        exclude_outside=exclude_outside,
+        **kwargs,
+    )
+    return _interpolate_with_plan(data, plan, extrapolation_value)
+
 
-    # roi is only meaningful for tf_crop_and_resize; for other modes it may
-    # arrive as an empty tensor. Normalize to None so downstream indexing
-    # (roi[axis], roi[axis + r]) doesn't fault on an empty array.
+def _interpolation_plan(
+    shape: tuple[int, ...],
+    get_coeffs: Callable[[float, float], np.ndarray],
+    output_size: list[int] | None = None,
+    scale_factors: list[float] | None = None,
+    axes: list[int] | None = None,
+    roi: np.ndarray | None = None,
+    keep_aspect_ratio_policy: str | None = "stretch",
+    exclude_outside: bool = False,
+    coordinate_transformation_mode: str = "half_pixel",
+) -> list[tuple[int, np.ndarray, np.ndarray | None, np.ndarray | None]]:
+    """Computes a separable interpolation plan for an input of shape `shape`.
+
+    The plan only depends on shapes and attributes, it holds one
+    :func:`_axis_plan` for every axis which is not left unchanged.
+    """
+    # Exported models usually give an empty tensor for the unused input
+    # among scales and sizes, and for roi when the mode is not
+    # tf_crop_and_resize. They are treated as missing before axes
+    # are used to index them.
+    if scale_factors is not None and np.asarray(scale_factors).size == 0:
+        scale_factors = None
+    if output_size is not None and np.asarray(output_size).size == 0:
+        output_size = None
     if roi is not None and np.asarray(roi).size == 0:
         roi = None
 
-    r = len(data.shape)
+    if output_size is None and scale_factors is None:
+        raise ValueError("output_size is None and scale_factors is None.")
+
+    r = len(shape)
     if axes is not None:
         if scale_factors is not None:
             new_scale_factors = [1.0] * r
@@ -497,7 +556,7 @@ def _interpolate_nd(
             scale_factors = new_scale_factors
 
         if output_size is not None:
-            new_output_size = [data.shape[i] for i in range(r)]
+            new_output_size = [shape[i] for i in range(r)]
             for i, d in enumerate(axes):
                 new_output_size[d] = output_size[i]
             output_size = new_output_size
@@ -513,7 +572,7 @@ def _interpolate_nd(
         axes = list(range(r))
 
     if output_size is not None:
-        scale_factors = [output_size[i] / data.shape[i] for i in range(r)]
+        scale_factors = [output_size[i] / shape[i] for i in range(r)]
         if keep_aspect_ratio_policy != "stretch":
             if keep_aspect_ratio_policy == "not_larger":
                 scale = np.array(scale_factors)[axes].min()
@@ -530,12 +589,12 @@ def _interpolate_nd(
                 return int(x + 0.5)
 
             output_size = [
-                round_half_up(scale * data.shape[i]) if i in axes else data.shape[i]
+                round_half_up(scale * shape[i]) if i in axes else shape[i]
                 for i in range(r)
             ]
 
     else:
-        output_size = (scale_factors * np.array(data.shape)).astype(int)  # type: ignore[union-attr]
+        output_size = (scale_factors * np.array(shape)).astype(int)  # type: ignore[union-attr]
 
     if scale_factors is None:
         raise ValueError("scale_factors is None.")
@@ -545,13 +604,14 @@ def _interpolate_nd(
     # Separable interpolation: resize one axis at a time. This avoids the
     # O(prod(output_shape)) scan of the old implementation, which called the
     # recursive _interpolate_nd_with_x once per output element.
-    result = data if data.dtype == np.float64 else data.astype(np.float64)
+    plan = []
+    current_shape = list(shape)
     for axis in axes:
         axis_scale = float(scale_factors[axis])
         axis_output = int(output_size[axis])
         if (
             math.isclose(axis_scale, 1.0)
-            and axis_output == result.shape[axis]
+            and axis_output == current_shape[axis]
             and (
                 roi is None
                 or (
@@ -563,36 +623,31 @@ def _interpolate_nd(
             # Identity along this axis — skip to avoid unnecessary work.
             continue
         axis_roi = None if roi is None else [roi[axis], roi[axis + r]]
-        result = _interpolate_1d_along_axis(
-            result,
-            axis,
-            axis_scale,
-            axis_output,
-            get_coeffs,
-            roi=axis_roi,
-            exclude_outside=exclude_outside,
-            **kwargs,
+        plan.append(
+            (
+                axis,
+                *_axis_plan(
+                    current_shape[axis],
+                    axis_scale,
+                    axis_output,
+                    get_coeffs,
+                    roi=axis_roi,
+                    coordinate_transformation_mode=coordinate_transformation_mode,
+                    exclude_outside=exclude_outside,
+                ),
+            )
         )
-    return result
+        current_shape[axis] = axis_output
+    return plan
 
 
 class Resize(OpRun):
-    def _run(
-        self,
-        X,
-        roi,
-        scales=None,
-        sizes=None,
-        antialias=None,
-        axes=None,
-        coordinate_transformation_mode=None,
-        cubic_coeff_a=None,
-        exclude_outside=None,
-        extrapolation_value=None,
-        keep_aspect_ratio_policy=None,
-        mode: str | None = None,
-        nearest_mode=None,
-    ):
+    def __init__(self, onnx_node, run_params):
+        OpRun.__init__(self, onnx_node, run_params)
+        self._plans = _PlanCache()
+
+    @staticmethod
+    def _get_coeffs_function(mode, antialias, nearest_mode, cubic_coeff_a):
         if mode == "nearest":
             if antialias:
                 raise RuntimeError(
@@ -616,50 +671,59 @@ class Resize(OpRun):
             fct = _linear_coeffs_antialias if antialias else _linear_coeffs
         else:
             raise ValueError(f"Unexpected value {mode!r} for mode.")
+        return fct
 
-        if axes is None:
-            output = onnx.numpy_helper.saturate_cast(
-                _interpolate_nd(
-                    X,
-                    fct,
-                    scale_factors=scales,
-                    output_size=sizes,
-                    roi=roi,
-                    keep_aspect_ratio_policy=keep_aspect_ratio_policy,
-                    exclude_outside=exclude_outside,
-                    coordinate_transformation_mode=coordinate_transformation_mode,
-                    extrapolation_value=extrapolation_value,
-                ),
-                X.dtype,
-            )
-            return (output,)
-
-        # axes is not None
-        not_axes = [a for a in range(len(X.shape)) if a not in axes]
-        perm = tuple(not_axes + axes)
-        permuted = np.transpose(X, perm)
-        new_shape = (-1, *tuple(X.shape[a] for a in axes))
-        reshaped = permuted.reshape(new_shape)
-        res = None
-        for i in range(reshaped.shape[0]):
-            output = _interpolate_nd(
-                reshaped[i],
-                fct,
+    def _run(
+        self,
+        X,
+        roi,
+        scales=None,
+        sizes=None,
+        antialias=None,
+        axes=None,
+        coordinate_transformation_mode=None,
+        cubic_coeff_a=None,
+        exclude_outside=None,
+        extrapolation_value=None,
+        keep_aspect_ratio_policy=None,
+        mode: str | None = None,
+        nearest_mode=None,
+    ):
+        # the plan only depends on shapes, attributes and the values of
+        # the small inputs roi, scales and sizes, it is computed once
+        # and reused by every call with the same arguments
+        key = (
+            X.shape,
+            *(
+                None if v is None else tuple(np.asarray(v).ravel().tolist())
+                for v in (roi, scales, sizes, axes)
+            ),
+            antialias,
+            coordinate_transformation_mode,
+            cubic_coeff_a,
+            exclude_outside,
+            keep_aspect_ratio_policy,
+            mode,
+            nearest_mode,
+        )
+        plan = self._plans.get(key)
+        if plan is None:
+            if axes is not None:
+                axes = [a + X.ndim if a < 0 else a for a in axes]
+            plan = _interpolation_plan(
+                X.shape,
+                self._get_coeffs_function(mode, antialias, nearest_mode, cubic_coeff_a),
                 scale_factors=scales,
                 output_size=sizes,
+                axes=axes,
                 roi=roi,
                 keep_aspect_ratio_policy=keep_aspect_ratio_policy,
                 exclude_outside=exclude_outside,
                 coordinate_transformation_mode=coordinate_transformation_mode,
-                extrapolation_value=extrapolation_value,
             )
-            if res is None:
-                res = np.empty((reshaped.shape[0], *output.shape), dtype=X.dtype)
-            res[i] = onnx.numpy_helper.saturate_cast(output, X.dtype)
-
-        res_reshaped = res.reshape(tuple(X.shape[a] for a in not_axes) + res[0].shape)
-        new_perm = list(perm)
-        for i, a in enumerate(perm):
-            new_perm[a] = i
-        final = np.transpose(res_reshaped, tuple(new_perm))
-        return (final,)
+            self._plans[key] = plan
+
+        output = onnx.numpy_helper.saturate_cast(
+            _interpolate_with_plan(X, plan, extrapolation_value), X.dtype
+        )
+        return (output,)
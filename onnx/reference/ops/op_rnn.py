@@ -6,6 +6,14 @@ from __future__ import annotations
 import numpy as np
 
 from onnx.reference.op_run import OpRun
+from onnx.reference.ops._op_common_rnn import (
+    _rnn_outputs,
+    _rnn_prepare,
+    _rnn_project_inputs,
+    _rnn_reversed_directions,
+    _rnn_run,
+    _rnn_sequence_indices,
+)
 
 
 class CommonRNN(OpRun):
@@ -75,22 +83,6 @@ class CommonRNN(OpRun):
     def _f_tanh(self, x):
         return np.tanh(x)
 
-    def _step(self, X, R, B, W, H_0):
-        h_list = []
-        H_t = H_0
-        for x in np.split(X, X.shape[0], axis=0):
-            H = self.f1(
-                np.dot(x, np.transpose(W))
-                + np.dot(H_t, np.transpose(R))
-                + np.add(*np.split(B, 2))
-            )
-            h_list.append(H)
-            H_t = H
-        concatenated = np.concatenate(h_list)
-        if self.num_directions == 1:
-            output = np.expand_dims(concatenated, 1)
-        return output, h_list[-1]
-
     def _run(
         self,
         X,
@@ -109,42 +101,38 @@ class CommonRNN(OpRun):
     ):
         # TODO: support overridden attributes.
         self.num_directions = W.shape[0]
+        hidden_size = R.shape[-1]
+        dtype = np.result_type(X, W, R)
+        reversed_directions = _rnn_reversed_directions(
+            self.direction, self.num_directions
+        )
+        acts = [self.f1] if self.num_directions == 1 else [self.f1, self.f2]
 
-        if self.num_directions == 1:
-            R = np.squeeze(R, axis=0)
-            W = np.squeeze(W, axis=0)
-            if B is not None:
-                B = np.squeeze(B, axis=0)
-            if sequence_lens is not None:
-                sequence_lens = np.squeeze(sequence_lens, axis=0)
-            if initial_h is not None:
-                initial_h = np.squeeze(initial_h, axis=0)
-
-            hidden_size = R.shape[-1]
-            batch_size = X.shape[1]
-
-            X = X if layout == 0 else np.swapaxes(X, 0, 1)
-            b = B if B is not None else np.zeros(2 * hidden_size, dtype=X.dtype)
-            h_0 = (
-                initial_h
-                if initial_h is not None
-                else np.zeros((batch_size, hidden_size), dtype=X.dtype)
-            )
+        X, (H_0,) = _rnn_prepare(
+            X, [initial_h], self.num_directions, hidden_size, layout, dtype
+        )
+        mask, reverse = _rnn_sequence_indices(sequence_lens, X.shape[0], X.shape[1])
+        projected = _rnn_project_inputs(
+            X,
+            W,
+            None if B is None else np.add(*np.split(B, 2, axis=-1)),
+            reversed_directions,
+            reverse,
+        )
 
-            B = b
-            H_0 = h_0
-        else:
-            raise NotImplementedError(
-                f"Unsupported value {self.num_directions} for num_directions and operator {self.__class__.__name__!r}."
-            )
+        R_t = np.transpose(R, (0, 2, 1)).astype(dtype)
+        buffer = np.empty(H_0.shape, dtype=dtype)
 
-        Y, Y_h = self._step(X, R, B, W, H_0)
-        if layout == 1:
-            Y = np.transpose(Y, [2, 0, 1, 3])
-            Y_h = Y[:, :, -1, :]
+        def cell(xw, states):
+            gates = np.matmul(states[0], R_t, out=buffer)
+            gates += xw
+            if len(acts) == 1:
+                return (acts[0](gates),)
+            return (np.stack([act(gates[d]) for d, act in enumerate(acts)]),)
 
-        Y = Y.astype(X.dtype)
-        return (Y,) if self.n_outputs == 1 else (Y, Y_h)
+        Y, states = _rnn_run(cell, projected, [H_0], mask, reverse, reversed_directions)
+        outputs = _rnn_outputs(Y, states, layout, X.dtype)
+        return outputs[: max(self.n_outputs, 1)]
 
 
 class RNN_7(CommonRNN):
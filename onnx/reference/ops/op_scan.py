@@ -6,6 +6,7 @@ from __future__ import annotations
 import numpy as np
 
 from onnx.reference.op_run import OpRun
+from onnx.reference.ops._op_common_scan import _ScanOutputBuffer
 
 
 class Scan(OpRun):
@@ -140,22 +141,20 @@ class Scan(OpRun):
         ) = self._common_run_shape(*args)
 
         max_iter = args[num_loop_state_vars].shape[self.input_axes_[0]]
-        results = [[] for _ in scan_names_out]
-
+        results = [_ScanOutputBuffer(max_iter) for _ in scan_names_out]
+
+        # Seed with outer-scope values first; per-iteration state and
+        # scan-slice inputs (overwritten at every iteration) shadow any
+        # same-named outer values, matching ONNX's lexical-capture semantics.
+        inputs: dict = {}
+        if context is not None:
+            for name in self.subgraph_captures_["body"]:
+                if name in context:
+                    inputs[name] = context[name]
         for it in range(max_iter):
-            # Seed with outer-scope values first; per-iteration state and
-            # scan-slice inputs (added below) shadow any same-named outer
-            # values, matching ONNX's lexical-capture semantics.
-            inputs: dict = {}
-            if context is not None:
-                inputs.update(context)
-            inputs.update(dict(zip(state_names_in, states, strict=False)))
-            inputs.update(
-                {
-                    name: value[it]
-                    for name, value in zip(scan_names_in, scan_values, strict=False)
-                }
-            )
+            inputs.update(zip(state_names_in, states, strict=False))
+            for name, value in zip(scan_names_in, scan_values, strict=False):
+                inputs[name] = value[it]
 
             try:
                 outputs_list = self._run_body(inputs)
@@ -164,10 +163,11 @@ class Scan(OpRun):
                     f"Unable to call 'run' for type '{type(self.body)}'."
                 ) from e
 
-            outputs = dict(zip(self.output_names, outputs_list, strict=False))
-            states = [outputs[name] for name in state_names_out]
-            for i, name in enumerate(scan_names_out):
-                results[i].append(np.expand_dims(outputs[name], axis=0))
+            states = outputs_list[: len(state_names_out)]
+            for res, value in zip(
+                results, outputs_list[len(state_names_out) :], strict=False
+            ):
+                res.append(np.expand_dims(value, axis=0))
 
         if max_iter == 0 and results:
             # Zero-trip Scan with scan outputs is not supported: the per-iteration
@@ -176,6 +176,4 @@ class Scan(OpRun):
             raise RuntimeError(
                 "Scan with zero scan-input length and scan outputs is not supported."
             )
-        for res in results:
-            states.append(np.concatenate(res, axis=0))
-        return self._check_and_fix_outputs(tuple(states))
+        return self._check_and_fix_outputs((*states, *(res.value() for res in results)))
@@ -7,11 +7,30 @@ from onnx.reference.op_run import OpRun
 
 
 class SequenceMap(OpRun):
-    def _run(self, input_sequence, *additional_inputs, body=None, attributes=None):
+    def need_context(self) -> bool:
+        """The body may use results of the enclosing graph."""
+        return True
+
+    def _run(
+        self,
+        input_sequence,
+        *additional_inputs,
+        context=None,
+        body=None,
+        attributes=None,
+    ):
+        # the captured values do not change from one element to the next
+        captured = {}
+        if context is not None:
+            for name in self.subgraph_captures_["body"]:
+                if name in context:
+                    captured[name] = context[name]
         if len(additional_inputs) == 1 and isinstance(additional_inputs[0], list):
             res = None
+            feeds = captured
             for obj1, obj2 in zip(input_sequence, additional_inputs[0], strict=False):
-                feeds = {body.input_names[0]: obj1, body.input_names[1]: obj2}
+                feeds[body.input_names[0]] = obj1
+                feeds[body.input_names[1]] = obj2
                 r = body.run(None, feeds)
                 if res is None:
                     res = [[i] for i in r]
@@ -20,7 +39,8 @@ class SequenceMap(OpRun):
                         s.append(i)
             return tuple(res)
 
-        feeds = dict(zip(body.input_names[1:], additional_inputs, strict=False))
+        feeds = captured
+        feeds.update(zip(body.input_names[1:], additional_inputs, strict=False))
         res = None
         for obj in input_sequence:
             feeds[body.input_names[0]] = obj
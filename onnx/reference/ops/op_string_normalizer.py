@@ -10,6 +10,7 @@ import warnings
 import numpy as np
 
 from onnx.reference.op_run import OpRun, RuntimeTypeError
+from onnx.reference.ops._helpers import _unique_inverse
 
 
 class StringNormalizer(OpRun):
@@ -19,6 +20,29 @@ class StringNormalizer(OpRun):
     usually happens after this steps.
     """
 
+    def __init__(self, onnx_node, run_params):
+        OpRun.__init__(self, onnx_node, run_params)
+        self._stops = {}
+
+    def _get_stops(self, stopwords, case_change_action):
+        key = (tuple(stopwords or ()), case_change_action)
+        stops = self._stops.get(key, None)
+        if stops is None:
+            if stopwords is None:
+                raw_stops = frozenset()
+                case_stops = frozenset()
+            else:
+                raw_stops = frozenset(stopwords)
+                if case_change_action == "LOWER":
+                    case_stops = frozenset(w.lower() for w in stopwords)
+                elif case_change_action == "UPPER":
+                    case_stops = frozenset(w.upper() for w in stopwords)
+                else:
+                    case_stops = raw_stops
+            stops = raw_stops, case_stops
+            self._stops[key] = stops
+        return stops
+
     def _run(
         self,
         x,
@@ -27,42 +51,41 @@ class StringNormalizer(OpRun):
         locale=None,
         stopwords=None,
     ):
-        slocale = locale
-        if stopwords is None:
-            raw_stops = set()
-            stops = set()
-        else:
-            raw_stops = set(stopwords)
-            if case_change_action == "LOWER":
-                stops = {w.lower() for w in stopwords}
-            elif case_change_action == "UPPER":
-                stops = {w.upper() for w in stopwords}
-            else:
-                stops = set(stopwords)
-        res = np.empty(x.shape, dtype=x.dtype)
-        if len(x.shape) == 2:
-            for i in range(x.shape[1]):
-                self._run_column(
-                    x[:, i],
-                    res[:, i],
-                    slocale=slocale,
+        if len(x.shape) not in (1, 2):
+            raise RuntimeTypeError("x must be a matrix or a vector.")
+        if case_change_action not in ("LOWER", "UPPER", "NONE"):
+            raise RuntimeError(
+                f"Unknown option for case_change_action: {case_change_action!r}."
+            )
+        raw_stops, stops = self._get_stops(stopwords, case_change_action)
+        if pylocale.getlocale() != locale:
+            try:
+                pylocale.setlocale(pylocale.LC_ALL, locale)
+            except pylocale.Error as e:
+                warnings.warn(
+                    f"Unknown local setting {locale!r} (current: {pylocale.getlocale()!r}) - {e!r}.",
+                    stacklevel=1,
+                )
+
+        # nan is replaced by an empty string,
+        # every distinct string is normalized once
+        flat = ["" if isinstance(v, float) else v for v in x.ravel().tolist()]
+        uniques, inverse = _unique_inverse(flat)
+        normalized = np.array(
+            [
+                self._normalize(
+                    u,
                     stops=stops,
                     raw_stops=raw_stops,
                     is_case_sensitive=is_case_sensitive,
                     case_change_action=case_change_action,
                 )
-        elif len(x.shape) == 1:
-            self._run_column(
-                x,
-                res,
-                slocale=slocale,
-                stops=stops,
-                raw_stops=raw_stops,
-                is_case_sensitive=is_case_sensitive,
-                case_change_action=case_change_action,
-            )
-        else:
-            raise RuntimeTypeError("x must be a matrix or a vector.")
+                for u in uniques
+            ],
+            dtype=object,
+        )
+        res = normalized[inverse].reshape(x.shape).astype(x.dtype)
+
         if len(res.shape) == 2 and res.shape[0] == 1:
             res = np.array([[w for w in res.tolist()[0] if len(w) > 0]])
             if res.shape[1] == 0:
@@ -74,52 +97,23 @@ class StringNormalizer(OpRun):
         return (res,)
 
     @staticmethod
-    def _run_column(
-        cin,
-        cout,
-        slocale=None,
+    def _normalize(
+        text,
         stops=None,
         raw_stops=None,
         is_case_sensitive=None,
         case_change_action=None,
     ):
-        if pylocale.getlocale() != slocale:
-            try:
-                pylocale.setlocale(pylocale.LC_ALL, slocale)
-            except pylocale.Error as e:
-                warnings.warn(
-                    f"Unknown local setting {slocale!r} (current: {pylocale.getlocale()!r}) - {e!r}.",
-                    stacklevel=1,
-                )
-        cout[:] = cin[:]
-
-        for i in range(cin.shape[0]):
-            if isinstance(cout[i], float):
-                # nan
-                cout[i] = ""
-            else:
-                cout[i] = StringNormalizer.strip_accents_unicode(cout[i])
-
+        text = StringNormalizer.strip_accents_unicode(text)
         if is_case_sensitive and len(stops) > 0:
-            for i in range(cin.shape[0]):
-                cout[i] = StringNormalizer._remove_stopwords(cout[i], raw_stops)
-
+            text = StringNormalizer._remove_stopwords(text, raw_stops)
         if case_change_action == "LOWER":
-            for i in range(cin.shape[0]):
-                cout[i] = cout[i].lower()
+            text = text.lower()
         elif case_change_action == "UPPER":
-            for i in range(cin.shape[0]):
-                cout[i] = cout[i].upper()
-        elif case_change_action != "NONE":
-            raise RuntimeError(
-                f"Unknown option for case_change_action: {case_change_action!r}."
-            )
-
+            text = text.upper()
         if not is_case_sensitive and len(stops) > 0:
-            for i in range(cin.shape[0]):
-                cout[i] = StringNormalizer._remove_stopwords(cout[i], stops)
-
-        return cout
+            text = StringNormalizer._remove_stopwords(text, stops)
+        return text
 
     @staticmethod
     def _remove_stopwords(text, stops):
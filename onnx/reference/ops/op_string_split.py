@@ -6,34 +6,25 @@ from __future__ import annotations
 import numpy as np
 
 from onnx.reference.op_run import OpRun
+from onnx.reference.ops._helpers import _unique_inverse
 
 _acceptable_str_dtypes = ("U", "O")
 
 
-def pad_empty_string(
-    split_lists: list | np.ndarray, padding_requirement: list | int
-) -> list:
-    if isinstance(split_lists, list):
-        assert isinstance(padding_requirement, int)
-        return split_lists + ["" for _ in range(padding_requirement)]
-    if isinstance(split_lists, np.ndarray):
-        assert isinstance(padding_requirement, list)
-        return list(map(pad_empty_string, split_lists, padding_requirement))
-    raise TypeError(f"Invalid array type '{type(split_lists)}'")
-
-
 def split_with_padding(x, separator=None, maxsplit=None):
-    split_lists = np.char.split(x.astype(np.str_), separator, maxsplit)
-    # Find the maximum length after splitting
-    num_splits = np.vectorize(len, otypes=[np.int64])(split_lists)
-    padding_requirement = (np.max(num_splits, initial=0) - num_splits).tolist()
+    # every distinct string is split once
+    uniques, inverse = _unique_inverse(x.ravel().tolist())
+    split_lists = [
+        str(u).split(separator, -1 if maxsplit is None else maxsplit) for u in uniques
+    ]
+    num_splits = np.array([len(s) for s in split_lists], dtype=np.int64)
     # Add padding to lists that are shorter than the maximum length
-    split_lists_padded = np.array(
-        pad_empty_string(split_lists, padding_requirement), dtype=object
-    )
-    if x.size == 0:
-        split_lists_padded = split_lists_padded.reshape(*x.shape, 0)
-    return split_lists_padded, num_splits
+    max_splits = int(np.max(num_splits, initial=0))
+    split_lists_padded = np.full((len(split_lists), max_splits), "", dtype=object)
+    for i, s in enumerate(split_lists):
+        split_lists_padded[i, : len(s)] = s
+    split_lists_padded = split_lists_padded[inverse].reshape((*x.shape, max_splits))
+    return split_lists_padded, num_splits[inverse].reshape(x.shape)
 
 
 class StringSplit(OpRun):
@@ -3,7 +3,6 @@
 # SPDX-License-Identifier: Apache-2.0
 from __future__ import annotations
 
-import collections
 from enum import IntEnum
 
 import numpy as np
@@ -11,88 +10,6 @@ import numpy as np
 from onnx.reference.op_run import OpRun
 
 
-class IntMap(collections.UserDict):
-    def __init__(self):
-        super().__init__()
-        self.added_keys = []
-
-    def emplace(self, key, value):
-        if not isinstance(key, (int, str)):
-            raise TypeError(f"key must be a int or str not {type(key)}.")
-        if not isinstance(value, NgramPart):
-            raise TypeError(f"value must be a NGramPart not {type(value)}.")
-        if key not in self:
-            self.added_keys.append(key)
-            self.data[key] = value
-        return self.data[key]
-
-    def __repr__(self):
-        vals = {k: repr(v) for k, v in self.items()}
-        rows = ["{"]
-        for k, v in sorted(vals.items()):
-            if "\n" in v:
-                vs = v.split("\n")
-                for i, line in enumerate(vs):
-                    if i == 0:
-                        if line == "{":
-                            rows.append(f"  {k}={line}")
-                        else:
-                            rows.append(f"  {k}={line},")
-                    elif i == len(vs) - 1:
-                        rows.append(f"  {line}")
-                    else:
-                        rows.append(f"    {line}")
-            else:
-                rows.append(f"  {k}={v},")
-        rows.append("}")
-        return "\n".join(rows)
-
-    @property
-    def first_key(self):
-        if len(self) == 0:
-            raise ValueError("IntMap is empty.")
-        return self.added_keys[0]
-
-
-class NgramPart:
-    def __init__(self, nid: int):
-        self.id_ = nid  # 0 - means no entry, search for a bigger N
-        self._leaves_ = None
-
-    def init(self):
-        self._leaves_ = IntMap()
-
-    def __repr__(self):
-        if self.empty():
-            return f"NgramPart({self.id_})"
-        return f"NgramPart({self.id_}, {self.leaves_!r})"
-
-    def empty(self):
-        return self._leaves_ is None
-
-    def has_leaves(self):
-        return self._leaves_ is not None and len(self._leaves_) > 0
-
-    @property
-    def leaves_(self):
-        if self._leaves_ is None:
-            raise RuntimeError("NgramPart was not initialized.")
-        return self._leaves_
-
-    def find(self, key):
-        if not self.has_leaves():
-            return None
-        if key in self._leaves_:
-            return key
-        return None
-
-    def emplace(self, key, value):
-        return self.leaves_.emplace(key, value)
-
-    def __getitem__(self, key):
-        return self._leaves_[key]
-
-
 class WeightingCriteria(IntEnum):
     NONE = 0
     TF = 1
@@ -100,30 +17,35 @@ class WeightingCriteria(IntEnum):
     TFIDF = 3
 
 
-def populate_grams(
-    els,
-    els_index,
-    n_ngrams: int,
-    ngram_size: int,
-    ngram_id: int,
-    c,  # : ForwardIter ,  # Map
-):
-    for _ngrams in range(n_ngrams, 0, -1):
-        n = 1
-        m = c
-        while els_index < len(els):
-            p = m.emplace(els[els_index], NgramPart(0))
-            if n == ngram_size:
-                p.id_ = ngram_id
-                ngram_id += 1
-                els_index += 1
-                break
-            if p.empty():
-                p.init()
-            m = p.leaves_
-            n += 1
-            els_index += 1
-    return ngram_id
+def _match_ngrams(
+    grams: np.ndarray, windows: np.ndarray, base: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Returns, for every window, whether it is one of the n-grams and
+    the index of the last n-gram equal to it.
+
+    *grams* has shape (n_grams, ngram_size), *windows* (..., ngram_size),
+    both contain integer codes in ``[0, base)``. Every n-gram is encoded
+    into an integer key one item at a time. Before adding a new item,
+    the prefixes are renumbered with their rank among the n-gram prefixes,
+    a window prefix which is not a n-gram prefix gets the same rank for all,
+    so that keys never grow beyond ``(n_grams + 1) * base``.
+    """
+    gram_keys = grams[:, 0]
+    window_keys = windows[..., 0]
+    for j in range(1, grams.shape[1]):
+        prefixes, gram_keys = np.unique(gram_keys, return_inverse=True)
+        rank = np.minimum(np.searchsorted(prefixes, window_keys), len(prefixes) - 1)
+        window_keys = np.where(prefixes[rank] == window_keys, rank, len(prefixes))
+        gram_keys = gram_keys.reshape(-1) * base + grams[:, j]
+        window_keys = window_keys * base + windows[..., j]
+    # the last n-gram wins if the pool contains duplicates
+    order = np.argsort(gram_keys, kind="stable")
+    sorted_keys = gram_keys[order]
+    position = np.searchsorted(sorted_keys, window_keys, side="right") - 1
+    found = position >= 0
+    position = np.maximum(position, 0)
+    found &= sorted_keys[position] == window_keys
+    return found, order[position]
 
 
 class TfIdfVectorizer(OpRun):
@@ -142,19 +64,28 @@ class TfIdfVectorizer(OpRun):
         self.max_gram_length_ = self.max_gram_length
         self.max_skip_count_ = self.max_skip_count
         self.ngram_counts_ = self.ngram_counts
-        self.max_gram_length_ = self.max_gram_length
         self.ngram_indexes_ = self.ngram_indexes
         self.output_size_ = max(self.ngram_indexes_) + 1
         self.weights_ = self.weights
         self.pool_int64s_ = self.pool_int64s
         self.pool_strings_ = self.pool_strings
 
-        self.int64_map_ = NgramPart(-10)
-        self.int64_map_.init()
-
-        total_items = len(self.pool_int64s_ or self.pool_strings_)
-        ngram_id = 1  # start with 1, 0 - means no n-gram
-        # Load into dictionary only required gram sizes
+        pool = self.pool_int64s_ or self.pool_strings_ or []
+        if self.pool_int64s_:
+            pool = np.array(pool, dtype=np.int64)
+        else:
+            pool = np.array(pool, dtype=object)
+        # Every item of the pool is replaced by its index in the sorted
+        # vocabulary, items which are not in the pool by len(vocabulary).
+        self.vocabulary_, codes = np.unique(pool, return_inverse=True)
+        codes = codes.reshape(-1)
+
+        # For every n-gram size, the n-grams as codes of shape
+        # (n_grams, ngram_size) and the output column of every n-gram.
+        self.ngrams_: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+        total_items = len(pool)
+        ngram_id = 0  # position in ngram_indexes
+        # Load only required gram sizes
         ngram_size = 1
         for i in range(len(self.ngram_counts_)):
             start_idx = self.ngram_counts_[i]
@@ -169,29 +100,21 @@ class TfIdfVectorizer(OpRun):
                 if (
                     ngram_size >= self.min_gram_length_
                     and ngram_size <= self.max_gram_length_
+                    and ngrams > 0
                 ):
-                    ngram_id = populate_grams(
-                        self.pool_int64s_ or self.pool_strings_,
-                        start_idx,
-                        ngrams,
-                        ngram_size,
-                        ngram_id,
-                        self.int64_map_,
+                    self.ngrams_[ngram_size] = (
+                        codes[start_idx : start_idx + ngrams * ngram_size].reshape(
+                            (ngrams, ngram_size)
+                        ),
+                        np.array(
+                            self.ngram_indexes_[ngram_id : ngram_id + ngrams],
+                            dtype=np.int64,
+                        ),
                     )
-                else:
-                    ngram_id += ngrams
+                ngram_id += ngrams
             ngram_size += 1
 
-    def increment_count(
-        self, ngram_id: int, row_num: int, frequencies: list[int]
-    ) -> None:
-        ngram_id -= 1
-        # assert(ngram_id < ngram_indexes_.size());
-        output_idx = row_num * self.output_size_ + self.ngram_indexes_[ngram_id]
-        # assert(static_cast<size_t>(output_idx) < frequencies.size());
-        frequencies[output_idx] += 1
-
-    def output_result(self, B: int, frequencies: list[int]) -> np.ndarray:
+    def output_result(self, B: int, frequencies: np.ndarray) -> np.ndarray:
         l_output_dims: list[int] = []
         if B == 0:
             l_output_dims.append(self.output_size_)
@@ -201,101 +124,72 @@ class TfIdfVectorizer(OpRun):
             l_output_dims.append(self.output_size_)
         output_dims = tuple(l_output_dims)
 
-        row_size = self.output_size_
-
-        total_dims = np.prod(output_dims)
-        Y = np.empty((total_dims,), dtype=np.float32)
-
+        frequencies = frequencies.reshape((B, self.output_size_))
         w = self.weights_
+        if w is not None and len(w) > 0:
+            w = np.array(w[: self.output_size_], dtype=np.float64)
+        else:
+            w = None
         if self.weighting_criteria_ == WeightingCriteria.TF:
-            for i, f in enumerate(frequencies):
-                Y[i] = f
+            Y = frequencies
         elif self.weighting_criteria_ == WeightingCriteria.IDF:
-            if len(w) > 0:
-                p = 0
-                for _batch in range(B):
-                    for i in range(row_size):
-                        Y[p] = w[i] if frequencies[p] > 0 else 0
-                        p += 1
+            if w is not None:
+                Y = np.where(frequencies > 0, w, 0)
             else:
-                for p, f in enumerate(frequencies):
-                    Y[p] = 1 if f > 0 else 0
+                Y = frequencies > 0
         elif self.weighting_criteria_ == WeightingCriteria.TFIDF:
-            if len(w) > 0:
-                p = 0
-                for _batch in range(B):
-                    for i in range(row_size):
-                        Y[p] = w[i] * frequencies[p]
-                        p += 1
+            if w is not None:
+                Y = w * frequencies
             else:
-                for p, f in enumerate(frequencies):
-                    Y[p] = f
+                Y = frequencies
         else:
             raise RuntimeError("Unexpected weighting_criteria.")
-        return Y.reshape(output_dims)
+        return Y.astype(np.float32).reshape(output_dims)
+
+    def _encode(self, X: np.ndarray) -> np.ndarray:
+        """Replaces every item by its index in the vocabulary,
+        len(vocabulary) if it is not part of it.
+        """
+        vocabulary = self.vocabulary_
+        if vocabulary.dtype == object:
+            X = X.astype(object)
+        position = np.minimum(np.searchsorted(vocabulary, X), len(vocabulary) - 1)
+        return np.where(vocabulary[position] == X, position, len(vocabulary))
 
     def compute_impl(
         self,
         X: np.ndarray,
-        row_num: int,
-        row_size: int,
-        frequencies: list[int],
+        frequencies: np.ndarray,
         max_gram_length=None,
         max_skip_count=None,
         min_gram_length=None,
-        mode=None,  # noqa: ARG002
-        ngram_counts=None,  # noqa: ARG002
-        ngram_indexes=None,  # noqa: ARG002
-        pool_int64s=None,  # noqa: ARG002
-        pool_strings=None,  # noqa: ARG002
-        weights=None,  # noqa: ARG002
     ) -> None:
-        if len(X.shape) > 1:
-            X_flat = X[row_num]
-        else:
-            X_flat = X
-        row_begin = 0
-        row_end = row_begin + row_size
-
-        max_skip_distance = max_skip_count + 1
-        start_ngram_size = min_gram_length
-
-        for skip_distance in range(1, max_skip_distance + 1):
-            ngram_start = row_begin
-            ngram_row_end = row_end
-
-            while ngram_start < ngram_row_end:
-                # We went far enough so no n-grams of any size can be gathered
-                at_least_this = ngram_start + skip_distance * (start_ngram_size - 1)
-                if at_least_this >= ngram_row_end:
-                    break
-
-                ngram_item = ngram_start
-                int_map = self.int64_map_
-                ngram_size = 1
-                while (
-                    int_map.has_leaves()
-                    and ngram_size <= max_gram_length
-                    and ngram_item < ngram_row_end
-                ):
-                    val = X_flat[ngram_item]
-                    hit = int_map.find(val)
-                    if hit is None:
-                        break
-                    hit = int_map[val].id_
-                    if ngram_size >= start_ngram_size and hit != 0:
-                        self.increment_count(hit, row_num, frequencies)
-                    int_map = int_map[val]
-                    ngram_size += 1
-                    ngram_item += skip_distance
-
-                ngram_start += 1
-
+        """Counts the n-grams of every row of *X* (shape (num_rows, C))
+        into *frequencies* (shape (num_rows * output_size,)).
+        """
+        num_rows, row_size = X.shape
+        codes = self._encode(X)
+        base = len(self.vocabulary_) + 1
+        row_offsets = np.arange(num_rows, dtype=np.int64)[:, np.newaxis]
+
+        for ngram_size, (grams, columns) in self.ngrams_.items():
+            if ngram_size < min_gram_length or ngram_size > max_gram_length:
+                continue
             # We count UniGrams only once since they are not affected by skip_distance
-            if start_ngram_size == 1:
-                start_ngram_size += 1
-                if start_ngram_size > max_gram_length:
+            max_skip_distance = 1 if ngram_size == 1 else max_skip_count + 1
+            for skip_distance in range(1, max_skip_distance + 1):
+                extent = (ngram_size - 1) * skip_distance + 1
+                if extent > row_size:
                     break
+                # all windows of a row, shape (num_rows, n_windows, ngram_size)
+                windows = np.lib.stride_tricks.sliding_window_view(
+                    codes, extent, axis=1
+                )[..., ::skip_distance]
+                found, index = _match_ngrams(grams, windows, base)
+                positions = row_offsets * self.output_size_ + columns[index]
+                frequencies += np.bincount(
+                    positions[found], minlength=frequencies.shape[0]
+                )
 
     def _run(
         self,
@@ -303,12 +197,12 @@ class TfIdfVectorizer(OpRun):
         max_gram_length=None,
         max_skip_count=None,
         min_gram_length=None,
-        mode=None,
-        ngram_counts=None,
-        ngram_indexes=None,
-        pool_int64s=None,
-        pool_strings=None,
-        weights=None,
+        mode=None,  # noqa: ARG002
+        ngram_counts=None,  # noqa: ARG002
+        ngram_indexes=None,  # noqa: ARG002
+        pool_int64s=None,  # noqa: ARG002
+        pool_strings=None,  # noqa: ARG002
+        weights=None,  # noqa: ARG002
     ):
         # weights should be identical to self.weights as well as
         # pool_strings, pool_int64s, ngram_indexes, ngram_counts, mode.
@@ -348,33 +242,19 @@ class TfIdfVectorizer(OpRun):
         # Frequency holder allocate [B..output_size_] and init all to zero
         frequencies = np.zeros((num_rows * self.output_size_,), dtype=np.int64)
 
-        if total_items == 0 or self.int64_map_.empty():
+        if total_items == 0 or not self.ngrams_:
             # TfidfVectorizer may receive an empty input when it follows a Tokenizer
             # (for example for a string containing only stopwords).
             # TfidfVectorizer returns a zero tensor of shape
             # {b_dim, output_size} when b_dim is the number of received observations
             # and output_size the is the maximum value in ngram_indexes attribute plus 1.
-            return (self.output_result(B, frequencies),)  # type: ignore[arg-type]
-
-        def fn(row_num):
-            self.compute_impl(
-                X,
-                row_num,
-                C,
-                frequencies,  # type: ignore[arg-type]
-                max_gram_length=max_gram_length,
-                max_skip_count=max_skip_count,
-                min_gram_length=min_gram_length,
-                mode=mode,
-                ngram_counts=ngram_counts,
-                ngram_indexes=ngram_indexes,
-                pool_int64s=pool_int64s,
-                pool_strings=pool_strings,
-                weights=weights,
-            )
-
-        # can be parallelized.
-        for i in range(num_rows):
-            fn(i)
-
-        return (self.output_result(B, frequencies),)  # type: ignore[arg-type]
+            return (self.output_result(B, frequencies),)
+
+        self.compute_impl(
+            X.reshape((num_rows, C)),
+            frequencies,
+            max_gram_length=max_gram_length,
+            max_skip_count=max_skip_count,
+            min_gram_length=min_gram_length,
+        )
+        return (self.output_result(B, frequencies),)
@@ -3,10 +3,16 @@
 # SPDX-License-Identifier: Apache-2.0
 from __future__ import annotations
 
+import itertools
+import os
+from collections import ChainMap
+from collections.abc import Callable, Iterator, Mapping
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from io import BytesIO
 from typing import Any
 
 import numpy as np
+import typing_extensions
 
 import onnx
 import onnx.model_container
@@ -22,6 +28,131 @@ from onnx.reference import op_run
 from onnx.reference.ops_optimized import optimized_operators
 
 
+def _nbytes(value: Any) -> int:
+    """Returns the memory held by a result, zero if it cannot be known."""
+    if isinstance(value, list):
+        return sum(_nbytes(v) for v in value)
+    return getattr(value, "nbytes", 0)
+
+
+_MISSING = object()
+
+
+class _CompiledPlan:
+    """Execution plan used when :class:`ReferenceEvaluator` runs with
+    `compiled=True`. Every result is stored at a fixed position (a slot)
+    in a list, every node reads and writes slots.
+
+    Args:
+        template: initial values of all slots, initializers are already
+            set, missing values are set to `_MISSING`
+        feeds: `(name, slot)` for every result consumed but not produced
+            by the plan
+        required: `(name, slot)` for every result a node takes as input
+            and which must come from the initializers or the inputs
+        steps: one tuple per node `(node, kwargs, input slots,
+            output slots, released slots, captured names)`, kwargs is
+            None if method `run` must be called, captured names is None
+            if the node does not need any context
+        outputs: `(name, slot)` for every requested output
+    """
+
+    __slots__ = ("feeds", "outputs", "required", "steps", "template")
+
+    def __init__(
+        self,
+        template: list[Any],
+        feeds: list[tuple[str, int]],
+        required: list[tuple[str, int]],
+        steps: list[tuple[Any, ...]],
+        outputs: list[tuple[str, int]],
+    ) -> None:
+        self.template = template
+        self.feeds = feeds
+        self.required = required
+        self.steps = steps
+        self.outputs = outputs
+
+
+class _DependencyPlan:
+    """Dependencies between the nodes of a plan used when
+    :class:`ReferenceEvaluator` runs with `parallel > 1`.
+
+    Args:
+        nodes: nodes to execute, sorted in topological order
+        uses: for every node, the results it consumes (inputs and
+            names captured by its subgraphs)
+        n_deps: for every node, the number of nodes producing one of
+            the results it consumes
+        successors: for every node, the nodes consuming one of its outputs
+        consumers: number of nodes consuming every intermediate result
+            which can be released
+    """
+
+    __slots__ = ("consumers", "n_deps", "nodes", "successors", "uses")
+
+    def __init__(
+        self,
+        nodes: list[op_run.OpRun],
+        uses: list[list[str]],
+        n_deps: list[int],
+        successors: list[list[int]],
+        consumers: dict[str, int],
+    ) -> None:
+        self.nodes = nodes
+        self.uses = uses
+        self.n_deps = n_deps
+        self.successors = successors
+        self.consumers = consumers
+
+
+def _captured_names(node: op_run.OpRun) -> list[str]:
+    """Returns the names a node implicitly uses through its subgraphs."""
+    names = []
+    for att in node.onnx_node.attribute:
+        if att.type == onnx.AttributeProto.GRAPH:
+            names.extend(op_run.OpRun.implicit_inputs(att.g))
+        elif att.type == onnx.AttributeProto.GRAPHS:
+            for g in att.graphs:
+                names.extend(op_run.OpRun.implicit_inputs(g))
+    return names
+
+
+class _LazyInitializers(Mapping):
+    """Mapping `{ name: array }` converting an initializer
+    the first time it is accessed and caching the array.
+
+    Args:
+        protos: initializers by name
+        convert: function converting a TensorProto into an array
+    """
+
+    def __init__(
+        self,
+        protos: dict[str, TensorProto],
+        convert: Callable[[TensorProto], Any],
+    ) -> None:
+        self.protos = protos
+        self.convert = convert
+        self.cache: dict[str, Any] = {}
+
+    def __getitem__(self, name: str) -> Any:
+        value = self.cache.get(name, _MISSING)
+        if value is _MISSING:
+            value = self.convert(self.protos[name])
+            self.cache[name] = value
+        return value
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.protos
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.protos)
+
+    def __len__(self) -> int:
+        return len(self.protos)
+
+
 class ReferenceEvaluator:
     r"""Computes the outputs of an ONNX proto (`ModelProto`, `FunctionProto`, `GraphProto`, `NodeProto`).
 
@@ -44,15 +175,36 @@ class ReferenceEvaluator:
             must define the static attribute `domain`, there may be
             multiple implementations for the same operator, the first
             one in the list is used.
-        optimized: some operators have two implementations, a naive one
+        free_intermediates: every intermediate result is released as soon
+            as the last node consuming it has been executed, this reduces
+            the peak memory to the results alive at the same time, it has
+            no effect if method `run` is called with `intermediate=True`
+        parallel: if greater than 1, independent nodes are executed
+            by a pool of *parallel* threads, numpy releases the GIL
+            in most of its heavy computations, a node starts as soon as
+            all the nodes it depends on are done, the results are the
+            same as a sequential execution, this mode is ignored if
+            *verbose* is not null or if method `run` is called with
+            `intermediate=True`, it is not propagated to subgraphs,
+            the pool is kept between two calls to `run` and released by
+            method `close` or when leaving a `with` statement
+        compiled: resolves every result name into a position in a list and
+            binds the attributes of every node once for all, method `run`
+            then avoids most of the per-node checks and logging, this mode
+            is ignored if *verbose* is not null, if *parallel* is greater
+            than 1 or if method `run` is called with `intermediate=True`,
+            it does not measure `peak_bytes`
+        lazy_initializers: converts an initializer into an array
+            only when a node needing it is executed for the first time,
+            the array is then cached, this reduces the loading time
+            when many weights are not used, in a branch of a test
+            rarely taken for example, it is propagated to subgraphs
+        optimized: some operators may have two implementations, a naive one
             corresponding to definition of the mathematical definition
-            of the operator, another one more efficient. This is the
-            case for operator Conv. The naive version is ten times
-            slower than the optimized one using a decomposition into
-            *Conv = im2col + Gemm*. If True, all optimized kernels are
-            added in `new_ops` and are used instead of the inner
-            implementation if list *new_ops* does not already contain
-            one.
+            of the operator, another one more efficient. If True, all
+            optimized kernels are added in `new_ops` and are used instead
+            of the inner implementation if list *new_ops* does not already
+            contain one.
 
     The class maps every node to its associated implementation.
     When a subgraph of a function is met,
@@ -200,6 +352,10 @@ class ReferenceEvaluator:
         verbose: int = 0,
         new_ops: list[type[op_run.OpRun]] | None = None,
         optimized: bool = True,
+        free_intermediates: bool = True,
+        compiled: bool = False,
+        parallel: int = 0,
+        lazy_initializers: bool = False,
     ) -> None:
         if optimized:
             if new_ops is None:
@@ -218,9 +374,13 @@ class ReferenceEvaluator:
         else:
             self.container_ = None
 
+        self.base_dir_: str | None = None
         if isinstance(proto, str):
-            with open(proto, "rb") as f:
-                proto = onnx.load(f)
+            # The initializers of the main graph stored as external data
+            # are mapped in memory by method _init instead of being read.
+            self.base_dir_ = os.path.dirname(os.path.abspath(proto))
+            proto = onnx.load(proto, load_external_data=False)
+            self._load_nested_external_data(proto)
         elif isinstance(proto, bytes):
             proto = onnx.load(BytesIO(proto))
         self.proto_ = proto
@@ -280,7 +440,11 @@ class ReferenceEvaluator:
             for f in functions:
                 if isinstance(f, FunctionProto):
                     self.functions_[f.domain, f.name] = self.__class__(
-                        f, verbose=verbose, functions=list(self.functions_.values())
+                        f,
+                        verbose=verbose,
+                        functions=list(self.functions_.values()),
+                        compiled=compiled,
+                        lazy_initializers=lazy_initializers,
                     )
                 elif isinstance(f, ReferenceEvaluator):
                     onx = f.proto_
@@ -288,6 +452,12 @@ class ReferenceEvaluator:
                 else:
                     raise TypeError(f"Unexpected type {type(f)!r} for a function.")
         self.verbose = verbose
+        self.free_intermediates = free_intermediates
+        self.compiled = compiled
+        self.parallel = parallel
+        self.lazy_initializers = lazy_initializers
+        self.executor_: ThreadPoolExecutor | None = None
+        self.peak_bytes_ = 0
         self.new_ops_: dict[tuple[str, str], type[op_run.OpRun]] = {}
         if new_ops is not None:
             for cl in new_ops:
@@ -304,8 +474,36 @@ class ReferenceEvaluator:
                 self.new_ops_[key] = cl
         self._init()
 
+    def _load_nested_external_data(self, proto: ModelProto) -> None:
+        """Loads the external data of every tensor but the initializers
+        of the main graph, subgraphs and attributes are not mapped.
+        """
+        ext_data = onnx.external_data_helper
+        subgraph_initializers = (
+            tensor
+            for node in proto.graph.node
+            for att in node.attribute
+            for tensor in ext_data._recursive_attribute_processor(
+                att, ext_data._get_initializer_tensors_from_graph
+            )
+        )
+        for tensor in itertools.chain(
+            subgraph_initializers, ext_data._get_attribute_tensors(proto)
+        ):
+            if not ext_data.uses_external_data(tensor):
+                continue
+            ext_data.load_external_data_for_tensor(tensor, self.base_dir_)
+            tensor.data_location = TensorProto.DEFAULT
+            del tensor.external_data[:]
+
     def retrieve_external_data(self, initializer: TensorProto) -> np.ndarray:
         """Returns a tensor saved as external."""
+        if self.base_dir_ is not None:
+            # The model was loaded from a file, the data is mapped
+            # in memory and the returned array is read-only.
+            return onnx.numpy_helper.to_array(
+                initializer, base_dir=self.base_dir_, mmap=True
+            )
         info = onnx.external_data_helper.ExternalDataInfo(initializer)
         location = info.location
         if self.container_ and self.container_.is_in_memory_external_initializer(
@@ -369,6 +567,13 @@ class ReferenceEvaluator:
         """Returns the opsets."""
         return self.opsets_
 
+    @property
+    def peak_bytes(self) -> int:
+        """Returns the largest number of bytes held at the same time by
+        inputs, initializers and results during the last execution.
+        """
+        return self.peak_bytes_
+
     @property
     def has_linked_attribute(self):
         """Checks if the graph has a linked attribute (= an attribute whose value is defined
@@ -379,6 +584,21 @@ class ReferenceEvaluator:
     def __str__(self) -> str:
         return f"{self.__class__.__name__}({', '.join(self.input_names)}) -> {', '.join(self.output_names)}"
 
+    def close(self) -> None:
+        """Shuts down the pool of threads created when `parallel > 1`.
+        The evaluator can still be used afterwards, a new pool is
+        created by the next call to method `run`.
+        """
+        if self.executor_ is not None:
+            self.executor_.shutdown(wait=True)
+            self.executor_ = None
+
+    def __enter__(self) -> typing_extensions.Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
     def get_result_types(self, name: str, exc: bool = True) -> Any:
         if self.all_types_ is None:
             raise RuntimeError(
@@ -392,20 +612,28 @@ class ReferenceEvaluator:
             return None
         return self.all_types_[name]
 
+    def _to_array(self, init: TensorProto) -> Any:
+        """Converts an initializer into an array."""
+        if onnx.external_data_helper.uses_external_data(init):
+            return self.retrieve_external_data(init)
+        return onnx.numpy_helper.to_array(init)
+
     def _init(self) -> None:
         """Loads the implementation for every node in the graph."""
-        self.rt_inits_ = {}
-        self.rt_nodes_ = []
-        for init in self.inits_:
-            self.rt_inits_[init.name] = (
-                self.retrieve_external_data(init)
-                if onnx.external_data_helper.uses_external_data(init)
-                else onnx.numpy_helper.to_array(init)
+        self.rt_inits_: Mapping[str, Any]
+        if self.lazy_initializers:
+            self.rt_inits_ = _LazyInitializers(
+                {init.name: init for init in self.inits_}, self._to_array
             )
+        else:
+            self.rt_inits_ = {init.name: self._to_array(init) for init in self.inits_}
+        self.rt_nodes_ = []
         run_params = {
             "log": lambda pattern, *args: self._log(10, pattern, *args),
             "opsets": self.opsets,
             "verbose": self.verbose,
+            "compiled": self.compiled,
+            "lazy_initializers": self.lazy_initializers,
             "new_ops": self.new_ops_,
             "existing_functions": self.functions_.copy(),
             "evaluator_cls": self.__class__,
@@ -449,6 +677,219 @@ class ReferenceEvaluator:
                     f"run_params={run_params} and node={node}."
                 ) from e
             self.rt_nodes_.append(inst)
+        self.rt_captures_ = [_captured_names(node) for node in self.rt_nodes_]
+        self.plans_: dict[
+            tuple[str, ...], tuple[list[op_run.OpRun], list[list[str]]]
+        ] = {}
+        self.compiled_plans_: dict[tuple[str, ...], _CompiledPlan] = {}
+        self.dependency_plans_: dict[tuple[str, ...], _DependencyPlan] = {}
+        self.plan_initializers_: dict[tuple[str, ...], list[str]] = {}
+        self.batch_dimension_ = self._find_batch_dimension()
+
+    def _get_plan(
+        self, output_names: tuple[str, ...]
+    ) -> tuple[list[op_run.OpRun], list[list[str]]]:
+        """Returns the nodes to execute to compute *output_names* and,
+        for each of them, the intermediate results to release once
+        it was executed. The plan is cached for every distinct tuple
+        of requested outputs.
+        """
+        plan = self.plans_.get(output_names)
+        if plan is None:
+            indices = self._needed_nodes(output_names)
+            plan = (
+                [self.rt_nodes_[i] for i in indices],
+                self._build_release_plan(indices, output_names),
+            )
+            self.plans_[output_names] = plan
+        return plan
+
+    def _get_initializers(self, output_names: tuple[str, ...]) -> Mapping[str, Any]:
+        """Returns the initializers, only the ones the nodes of the plan
+        returned by :meth:`_get_plan` take as inputs if they are converted
+        on demand. The ones a subgraph captures are converted when the
+        subgraph reads them, see :meth:`_context`.
+        """
+        if not self.lazy_initializers:
+            return self.rt_inits_
+        names = self.plan_initializers_.get(output_names)
+        if names is None:
+            used = set(output_names)
+            for index in self._needed_nodes(output_names):
+                used.update(self.rt_nodes_[index].input)
+            names = [name for name in self.rt_inits_ if name in used]
+            self.plan_initializers_[output_names] = names
+        return {name: self.rt_inits_[name] for name in names}
+
+    def _context(self, results: dict[str, Any]) -> Mapping[str, Any]:
+        """Returns the context given to a node holding subgraphs,
+        the initializers missing from *results* are only converted
+        if a subgraph reads them.
+        """
+        if self.lazy_initializers:
+            return ChainMap(results, self.rt_inits_)  # type: ignore[arg-type]
+        return results
+
+    def _get_compiled_plan(self, output_names: tuple[str, ...]) -> _CompiledPlan:
+        """Returns the compiled version of the plan returned by
+        :meth:`_get_plan`, it is cached as well.
+        """
+        compiled = self.compiled_plans_.get(output_names)
+        if compiled is not None:
+            return compiled
+
+        nodes, release_plan = self._get_plan(output_names)
+        captures = {
+            id(node): names
+            for node, names in zip(self.rt_nodes_, self.rt_captures_, strict=True)
+        }
+        # slot 0 is the optional input "", slot 1 receives the outputs
+        # a node produces but are not named
+        slots = {"": 0}
+        produced: set[str] = set()
+        feeds: dict[str, int] = {}
+        required: dict[str, int] = {}
+
+        def _slot(name: str) -> int:
+            if name not in slots:
+                slots[name] = len(slots) + 1
+            return slots[name]
+
+        def _consume(name: str, is_input: bool) -> None:
+            if name == "" or name in produced:
+                return
+            feeds[name] = _slot(name)
+            if is_input:
+                required[name] = feeds[name]
+
+        steps = []
+        for node, released in zip(nodes, release_plan, strict=True):
+            for name in node.input:
+                _consume(name, True)
+            node_captures = None
+            if node.need_context():
+                for name in captures[id(node)]:
+                    _consume(name, False)
+                node_captures = [(name, slots[name]) for name in captures[id(node)]]
+            steps.append(
+                (
+                    node,
+                    node.bound_kwargs(),
+                    [_slot(name) for name in node.input],
+                    [_slot(name) if name else 1 for name in node.output],
+                    [slots[name] for name in released],
+                    node_captures,
+                )
+            )
+            produced.update(node.output)
+        for name in output_names:
+            _consume(name, False)
+
+        template: list[Any] = [_MISSING] * (len(slots) + 1)
+        template[0] = None
+        for name, slot in feeds.items():
+            if name in self.rt_inits_ and (
+                not self.lazy_initializers or name in required or name in output_names
+            ):
+                template[slot] = self.rt_inits_[name]
+        compiled = _CompiledPlan(
+            template,
+            list(feeds.items()),
+            list(required.items()),
+            steps,
+            [(name, slots[name]) for name in output_names],
+        )
+        self.compiled_plans_[output_names] = compiled
+        return compiled
+
+    def _get_dependency_plan(self, output_names: tuple[str, ...]) -> _DependencyPlan:
+        """Returns the dependencies between the nodes of the plan
+        returned by :meth:`_get_plan`, it is cached as well.
+        """
+        dependencies = self.dependency_plans_.get(output_names)
+        if dependencies is not None:
+            return dependencies
+
+        nodes, _ = self._get_plan(output_names)
+        captures = {
+            id(node): names
+            for node, names in zip(self.rt_nodes_, self.rt_captures_, strict=True)
+        }
+        producer: dict[str, int] = {}
+        uses: list[list[str]] = []
+        n_deps: list[int] = []
+        successors: list[list[int]] = [[] for _ in nodes]
+        consumers: dict[str, int] = {}
+        for index, node in enumerate(nodes):
+            names = list(dict.fromkeys([*node.input, *captures[id(node)]]))
+            uses.append(names)
+            preds = {producer[name] for name in names if name in producer}
+            for pred in preds:
+                successors[pred].append(index)
+            n_deps.append(len(preds))
+            for name in names:
+                consumers[name] = consumers.get(name, 0) + 1
+            for name in node.output:
+                producer[name] = index
+                consumers.setdefault(name, 0)
+        protected = {"", *self.input_names_, *output_names, *self.rt_inits_}
+        dependencies = _DependencyPlan(
+            nodes,
+            uses,
+            n_deps,
+            successors,
+            {
+                name: count
+                for name, count in consumers.items()
+                if name in producer and name not in protected
+            },
+        )
+        self.dependency_plans_[output_names] = dependencies
+        return dependencies
+
+    def _needed_nodes(self, output_names: tuple[str, ...]) -> list[int]:
+        """Returns the indices of the nodes the requested outputs depend on.
+        Nodes are sorted in topological order, a backward pass is enough.
+        """
+        needed = set(output_names)
+        inputs = set(self.input_names_)
+        indices = []
+        for index in range(len(self.rt_nodes_) - 1, -1, -1):
+            node = self.rt_nodes_[index]
+            if any(name in needed and name not in inputs for name in node.output):
+                indices.append(index)
+                needed.update(node.input)
+                needed.update(self.rt_captures_[index])
+        indices.reverse()
+        return indices
+
+    def _build_release_plan(
+        self, indices: list[int], output_names: tuple[str, ...]
+    ) -> list[list[str]]:
+        """Returns, for every node in *indices*, the intermediate results
+        which are not needed anymore once this node was executed.
+        Inputs, initializers and requested outputs are never released.
+        A node holding a subgraph uses every name the subgraph captures
+        from the outer scope.
+        """
+        last_use: dict[str, int] = {}
+        produced: list[str] = []
+        for step, index in enumerate(indices):
+            node = self.rt_nodes_[index]
+            for name in node.input:
+                last_use[name] = step
+            for name in self.rt_captures_[index]:
+                last_use[name] = step
+            for name in node.output:
+                # An output nobody consumes is released right after it is produced.
+                last_use.setdefault(name, step)
+                produced.append(name)
+        protected = {"", *self.input_names_, *output_names, *self.rt_inits_}
+        plan: list[list[str]] = [[] for _ in indices]
+        for name in produced:
+            if name not in protected:
+                plan[last_use[name]].append(name)
+        return plan
 
     def _load_impl(  # noqa: PLR0911
         self, node: NodeProto, input_types: TypeProto | None = None
@@ -557,7 +998,8 @@ class ReferenceEvaluator:
         """Executes the onnx model.
 
         Args:
-            output_names: requested outputs by names, None for all
+            output_names: requested outputs by names, None for all,
+                only the nodes these outputs depend on are executed
             feed_inputs: dictionary `{ input name: input value }`
             attributes: attributes value if the instance runs a
                 FunctionProto
@@ -573,18 +1015,40 @@ class ReferenceEvaluator:
             output_names = self.output_names
         if isinstance(self.proto_, FunctionProto) and attributes is None:
             raise TypeError
+        if self.parallel > 1 and not intermediate and not self.verbose:
+            return self._run_parallel(
+                self._get_dependency_plan(tuple(output_names)),
+                output_names,
+                feed_inputs,
+                attributes,
+            )
+        if self.compiled and not intermediate and not self.verbose:
+            return self._run_compiled(
+                self._get_compiled_plan(tuple(output_names)), feed_inputs, attributes
+            )
+        if intermediate:
+            # Every result is returned, every node must be executed.
+            nodes, release_plan = self.rt_nodes_, None
+            inits = self.rt_inits_
+        else:
+            nodes, release_plan = self._get_plan(tuple(output_names))
+            if not self.free_intermediates:
+                release_plan = None
+            inits = self._get_initializers(tuple(output_names))
 
         # step 1: inputs and initializers
         results = {"": None}  # optional input
-        results.update(self.rt_inits_)  # type: ignore[arg-type]
+        results.update(inits)  # type: ignore[arg-type]
         results.update(feed_inputs)
-        for k, v in self.rt_inits_.items():
+        for k, v in inits.items():
             self._log(2, " +C %s: %s", k, v)  # type: ignore[arg-type]
         for k, v in feed_inputs.items():
             self._log(2, " +I %s: %s", k, v)  # type: ignore[arg-type]
+        alive_bytes = sum(_nbytes(v) for v in results.values())
+        peak_bytes = alive_bytes
 
         # step 2: execute nodes
-        for node in self.rt_nodes_:
+        for index, node in enumerate(nodes):
             self._log(1, "%s(%s) -> %s", node.op_type, node.input, node.output)
             for i in node.input:
                 if i not in results:
@@ -598,12 +1062,20 @@ class ReferenceEvaluator:
             if node.has_linked_attribute and attributes:
                 linked_attributes["linked_attributes"] = attributes
             if node.need_context():
-                outputs = node.run(*inputs, context=results, **linked_attributes)
+                outputs = node.run(
+                    *inputs, context=self._context(results), **linked_attributes
+                )
             else:
                 outputs = node.run(*inputs, **linked_attributes)
             for name, value in zip(node.output, outputs, strict=False):
                 self._log(2, " + %s: %s", name, value)  # type: ignore[arg-type]
+                alive_bytes += _nbytes(value) - _nbytes(results.get(name))
                 results[name] = value
+            peak_bytes = max(peak_bytes, alive_bytes)
+            if release_plan is not None:
+                for name in release_plan[index]:
+                    alive_bytes -= _nbytes(results.pop(name, None))
+        self.peak_bytes_ = peak_bytes
 
         # return the results
         if intermediate:
@@ -615,3 +1087,264 @@ class ReferenceEvaluator:
                     f"Unable to find output name {name!r} in {sorted(results)}, proto is\n{self.proto_}"
                 )
         return [results[name] for name in output_names]
+
+    def _find_batch_dimension(self) -> str | None:
+        """Returns the name of the symbolic first dimension shared by
+        all inputs and outputs or None if there is none.
+        """
+        if not self.input_types_ or not self.output_types_:
+            return None
+        names = set()
+        for tp in [*self.input_types_, *self.output_types_]:
+            if (
+                not tp.HasField("tensor_type")
+                or not tp.tensor_type.HasField("shape")
+                or not tp.tensor_type.shape.dim
+            ):
+                return None
+            names.add(tp.tensor_type.shape.dim[0].dim_param)
+        if len(names) != 1 or "" in names:
+            return None
+        return names.pop()
+
+    def _batch_sizes(self, list_of_feeds: list[dict[str, Any]]) -> list[int] | None:
+        """Returns the batch size of every set of inputs or None
+        if they cannot be concatenated along the first dimension.
+        """
+        names = set(self.input_names_)
+        first = list_of_feeds[0]
+        if set(first) != names:
+            return None
+        sizes = []
+        for feeds in list_of_feeds:
+            if set(feeds) != names:
+                return None
+            batch_sizes = set()
+            for name, value in feeds.items():
+                ref = first[name]
+                if (
+                    not isinstance(value, np.ndarray)
+                    or value.ndim == 0
+                    or value.dtype != ref.dtype
+                    or value.shape[1:] != ref.shape[1:]
+                ):
+                    return None
+                batch_sizes.add(value.shape[0])
+            if len(batch_sizes) != 1:
+                return None
+            sizes.append(batch_sizes.pop())
+        return sizes
+
+    def run_batch(
+        self,
+        output_names,
+        list_of_feeds: list[dict[str, Any]],
+        attributes: dict[str, Any] | None = None,
+    ) -> list[list[Any]]:
+        """Executes the onnx model on many sets of inputs.
+
+        If all inputs and outputs share the same symbolic first dimension
+        (the batch dimension), the inputs are concatenated along this
+        dimension, the model is executed once and the outputs are split
+        back. This assumes the model processes every sample independently.
+        Otherwise, or if the inputs cannot be concatenated, method
+        :meth:`run` is called once for every set of inputs.
+
+        Args:
+            output_names: requested outputs by names, None for all
+            list_of_feeds: list of dictionaries `{ input name: input value }`
+            attributes: attributes value if the instance runs a
+                FunctionProto
+
+        Returns:
+            list of requested outputs for every set of inputs
+        """
+        if output_names is None:
+            output_names = self.output_names
+        sizes = None
+        if (
+            len(list_of_feeds) > 1
+            and self.batch_dimension_ is not None
+            and set(output_names).issubset(self.output_names_)
+        ):
+            sizes = self._batch_sizes(list_of_feeds)
+        if sizes is not None:
+            feeds = {
+                name: np.concatenate([f[name] for f in list_of_feeds], axis=0)
+                for name in self.input_names_
+            }
+            outputs = self.run(output_names, feeds, attributes=attributes)
+            total = sum(sizes)
+            if all(
+                isinstance(o, np.ndarray) and o.ndim > 0 and o.shape[0] == total
+                for o in outputs
+            ):
+                indices = np.cumsum(sizes)[:-1]
+                split = [np.split(o, indices, axis=0) for o in outputs]
+                return [[s[i] for s in split] for i in range(len(sizes))]
+        return [
+            self.run(output_names, feeds, attributes=attributes)
+            for feeds in list_of_feeds
+        ]
+
+    def _run_compiled(
+        self,
+        plan: _CompiledPlan,
+        feed_inputs: dict[str, Any],
+        attributes: dict[str, Any] | None,
+    ) -> list[Any]:
+        """Executes a compiled plan, see :meth:`run`."""
+        values = plan.template.copy()
+        for name, slot in plan.feeds:
+            if name in feed_inputs:
+                values[slot] = feed_inputs[name]
+        for name, slot in plan.required:
+            if values[slot] is _MISSING:
+                raise RuntimeError(
+                    f"Unable to find input {name!r}, "
+                    f"self.rt_inits_ has {sorted(self.rt_inits_)}, "
+                    f"feed_inputs has {sorted(feed_inputs)}."
+                )
+        free_intermediates = self.free_intermediates
+
+        for node, kwargs, in_slots, out_slots, released, captures in plan.steps:
+            inputs = [values[i] for i in in_slots]
+            if kwargs is not None:
+                try:
+                    res = node._run(*inputs, **kwargs)
+                except (TypeError, AttributeError) as e:
+                    raise TypeError(
+                        f"Issues with types {[type(_) for _ in inputs]} and attributes "
+                        f"{sorted(kwargs)} (operator {node.__class__.__name__!r})."
+                    ) from e
+                outputs = node._check_and_fix_outputs(res)
+            else:
+                extra: dict[str, Any] = {}
+                if captures is not None:
+                    extra["context"] = self._context(
+                        {
+                            name: values[slot]
+                            for name, slot in captures
+                            if values[slot] is not _MISSING
+                        }
+                    )
+                if node.has_linked_attribute and attributes:
+                    extra["linked_attributes"] = attributes
+                outputs = node.run(*inputs, **extra)
+            for slot, value in zip(out_slots, outputs, strict=False):
+                values[slot] = value
+            if free_intermediates:
+                for slot in released:
+                    values[slot] = None
+
+        for name, slot in plan.outputs:
+            if values[slot] is _MISSING:
+                raise RuntimeError(
+                    f"Unable to find output name {name!r}, proto is\n{self.proto_}"
+                )
+        return [values[slot] for _, slot in plan.outputs]
+
+    @staticmethod
+    def _run_node(
+        node: op_run.OpRun,
+        inputs: list[Any],
+        context: Mapping[str, Any] | None,
+        attributes: dict[str, Any] | None,
+    ) -> tuple[Any, ...]:
+        linked_attributes = {}
+        if node.has_linked_attribute and attributes:
+            linked_attributes["linked_attributes"] = attributes
+        if context is not None:
+            return node.run(*inputs, context=context, **linked_attributes)
+        return node.run(*inputs, **linked_attributes)
+
+    def _run_parallel(
+        self,
+        plan: _DependencyPlan,
+        output_names: list[str],
+        feed_inputs: dict[str, Any],
+        attributes: dict[str, Any] | None,
+    ) -> list[Any]:
+        """Executes the nodes on a pool of threads, see :meth:`run`.
+        Only the calling thread reads or writes the results.
+        """
+        if self.executor_ is None:
+            self.executor_ = ThreadPoolExecutor(
+                max_workers=self.parallel, thread_name_prefix="ReferenceEvaluator"
+            )
+        results = {"": None}  # optional input
+        results.update(self._get_initializers(tuple(output_names)))  # type: ignore[arg-type]
+        results.update(feed_inputs)
+        alive_bytes = sum(_nbytes(v) for v in results.values())
+        peak_bytes = alive_bytes
+        consumers = plan.consumers.copy() if self.free_intermediates else None
+        n_deps = plan.n_deps.copy()
+        ready = [index for index, n in enumerate(n_deps) if n == 0]
+        running: dict[Any, int] = {}
+
+        while ready or running:
+            done: list[tuple[int, tuple[Any, ...]]] = []
+            for index in ready:
+                node = plan.nodes[index]
+                for name in node.input:
+                    if name not in results:
+                        raise RuntimeError(
+                            f"Unable to find input {name!r} in known results {sorted(results)}, "
+                            f"self.rt_inits_ has {sorted(self.rt_inits_)}, "
+                            f"feed_inputs has {sorted(feed_inputs)}."
+                        )
+                inputs = [results[name] for name in node.input]
+                # The context is copied, results keep changing while the node runs.
+                context = (
+                    self._context(
+                        {
+                            name: results[name]
+                            for name in plan.uses[index]
+                            if name in results
+                        }
+                    )
+                    if node.need_context()
+                    else None
+                )
+                if consumers is not None:
+                    for name in plan.uses[index]:
+                        if name in consumers:
+                            consumers[name] -= 1
+                            if consumers[name] == 0:
+                                alive_bytes -= _nbytes(results.pop(name, None))
+                if len(ready) == 1 and not running:
+                    # Nothing to run in parallel, no need to use the pool.
+                    done.append(
+                        (index, self._run_node(node, inputs, context, attributes))
+                    )
+                else:
+                    future = self.executor_.submit(
+                        self._run_node, node, inputs, context, attributes
+                    )
+                    running[future] = index
+            ready = []
+            if running and not done:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                done.extend((running.pop(f), f.result()) for f in finished)
+
+            for index, outputs in done:
+                node = plan.nodes[index]
+                for name, value in zip(node.output, outputs, strict=False):
+                    alive_bytes += _nbytes(value) - _nbytes(results.get(name))
+                    results[name] = value
+                    if consumers is not None and consumers.get(name, -1) == 0:
+                        # Nobody consumes it.
+                        alive_bytes -= _nbytes(results.pop(name))
+                peak_bytes = max(peak_bytes, alive_bytes)
+                for succ in plan.successors[index]:
+                    n_deps[succ] -= 1
+                    if n_deps[succ] == 0:
+                        ready.append(succ)
+        self.peak_bytes_ = peak_bytes
+
+        for name in output_names:
+            if name not in results:
+                raise RuntimeError(
+                    f"Unable to find output name {name!r} in {sorted(results)}, proto is\n{self.proto_}"
+                )
+        return [results[name] for name in output_names]
@@ -13,13 +13,18 @@ import os
 from typing import TYPE_CHECKING
 
 import onnx
+import onnx.external_data_helper
 import onnx.onnx_cpp2py_export.shape_inference as C  # noqa: N812
 from onnx.onnx_pb import (
     IR_VERSION,
     AttributeProto,
     FunctionProto,
     ModelProto,
+    NodeProto,
+    OperatorSetIdProto,
+    TensorProto,
     TypeProto,
+    ValueInfoProto,
 )
 
 if TYPE_CHECKING:
@@ -34,6 +39,7 @@ def infer_shapes(
     check_type: bool = False,
     strict_mode: bool = False,
     data_prop: bool = False,
+    initializer_size_threshold: int | None = None,
 ) -> ModelProto:
     """Apply shape inference to the provided ModelProto.
 
@@ -49,10 +55,29 @@ def infer_shapes(
         strict_mode: Stricter shape inference, it will throw errors if any;
             Otherwise, simply stop if any error.
         data_prop: Enables data propagation for limited operators to perform shape computation.
+        initializer_size_threshold: If not None and model is a ModelProto, the raw data
+            of the initializers of the main graph holding at least this number of bytes
+            is not serialized, only their metadata is given to shape inference and
+            they are copied unchanged into the returned model. Models bigger than
+            2GB can then be processed in memory. Shape inference cannot use
+            the values of these initializers.
 
     Returns:
         (ModelProto) model with inferred shape information
     """
+    if isinstance(model, ModelProto) and initializer_size_threshold is not None:
+        stripped_model, stripped = onnx.external_data_helper._strip_initializer_data(
+            model, initializer_size_threshold
+        )
+        inferred_model = onnx.load_from_string(
+            C.infer_shapes(
+                stripped_model.SerializeToString(), check_type, strict_mode, data_prop
+            )
+        )
+        onnx.external_data_helper._restore_initializer_data(
+            inferred_model, model, stripped
+        )
+        return inferred_model
     if isinstance(model, (ModelProto, bytes)):
         model_str = model if isinstance(model, bytes) else model.SerializeToString()
         inferred_model_str = C.infer_shapes(
@@ -156,6 +181,82 @@ def infer_node_outputs(
     return {key: onnx.TypeProto.FromString(out) for key, out in outputs.items()}
 
 
+class IncrementalShapeInference:
+    """Infers the types of the outputs of nodes given one at a time.
+
+    The types of the values seen so far are kept in C++ between the calls,
+    a tool walking a graph node by node sends every node once instead of
+    sending the types of all its inputs with every call to
+    :func:`infer_node_outputs`.
+
+    Arguments:
+        opset_imports: Opsets the nodes are defined in.
+        functions: Model local functions the nodes may call.
+        ir_version: IR version of the model, initializers are only
+            used as typed values from version 4.
+        check_type: Checks the type-equality for input and output.
+        strict_mode: :meth:`infer_node` raises :class:`InferenceError`
+            if the inference of the node fails, otherwise the types of its
+            outputs stay unknown.
+        data_prop: Enables data propagation for limited operators to perform shape computation.
+
+    ::
+
+        inference = IncrementalShapeInference(model.opset_import)
+        inference.add_value_infos(model.graph.input)
+        inference.add_initializers(model.graph.initializer)
+        for node in model.graph.node:
+            output_types = inference.infer_node(node)
+    """
+
+    def __init__(
+        self,
+        opset_imports: Sequence[OperatorSetIdProto],
+        functions: Sequence[FunctionProto] = (),
+        ir_version: int = IR_VERSION,
+        check_type: bool = False,
+        strict_mode: bool = False,
+        data_prop: bool = False,
+    ):
+        self._impl = C.IncrementalShapeInference(
+            {opset.domain: opset.version for opset in opset_imports},
+            [f.SerializeToString() for f in functions],
+            ir_version,
+            check_type,
+            strict_mode,
+            data_prop,
+        )
+
+    def add_value_infos(self, value_infos: Sequence[ValueInfoProto]) -> None:
+        """Declares the types of graph inputs or of any other values."""
+        for value_info in value_infos:
+            self._impl.add_value_info(value_info.SerializeToString())
+
+    def add_initializers(self, initializers: Sequence[TensorProto]) -> None:
+        """Declares initializers, their values are used by the nodes consuming them."""
+        for initializer in initializers:
+            self._impl.add_initializer(initializer.SerializeToString())
+
+    def infer_node(self, node: NodeProto) -> dict[str, TypeProto]:
+        """Infers the types of the outputs of a node.
+
+        The node is evaluated with the types known so far, the inferred
+        types are kept for the next nodes. Returns the inferred types of
+        the outputs, outputs whose type is unknown are missing.
+        """
+        outputs = self._impl.infer_node(node.SerializeToString())
+        return {
+            name: TypeProto.FromString(out)
+            for name, out in zip(node.output, outputs, strict=True)
+            if out is not None
+        }
+
+    def get_type(self, name: str) -> TypeProto | None:
+        """Returns the type known for a value, None if there is none."""
+        out = self._impl.get_type(name)
+        return None if out is None else TypeProto.FromString(out)
+
+
 def infer_function_output_types(
     function: FunctionProto,
     input_types: Sequence[TypeProto],
@@ -574,32 +574,45 @@ class ShapeInferenceImplBase {
       UpdateType(vi);
     }
     for (const auto& tp : graph.initializer()) {
-      TypeProto initializer_type;
-      TypeProto_Tensor* initializer_tensor_type = initializer_type.mutable_tensor_type();
-      initializer_tensor_type->set_elem_type(tp.data_type());
-      // set the shape according to the initializer shape info
-      auto* shape = initializer_tensor_type->mutable_shape();
-      for (int i = 0; i < tp.dims_size(); ++i) {
-        shape->add_dim()->set_dim_value(tp.dims(i));
-      }
-      ProcessInitializer(tp.name(), tp, initializer_type, input_data_by_name);
+      ProcessInitializer(tp);
     }
     for (const auto& tp : graph.sparse_initializer()) {
-      TypeProto initializer_type;
-      auto* initializer_sparse_tensor_type = initializer_type.mutable_sparse_tensor_type();
-      initializer_sparse_tensor_type->set_elem_type(tp.values().data_type());
-      // set the shape according to the initializer shape info
-      auto* shape = initializer_sparse_tensor_type->mutable_shape();
-      for (int i = 0; i < tp.dims_size(); ++i) {
-        shape->add_dim()->set_dim_value(tp.dims(i));
-      }
-      ProcessInitializer(tp.values().name(), tp, initializer_type, input_sparse_data_by_name);
+      ProcessInitializer(tp);
     }
     for (auto& n : *graph.mutable_node()) {
       Process(n);
     }
   }
 
+  void ProcessInitializer(const TensorProto& tp) {
+    TypeProto initializer_type;
+    TypeProto_Tensor* initializer_tensor_type = initializer_type.mutable_tensor_type();
+    initializer_tensor_type->set_elem_type(tp.data_type());
+    // set the shape according to the initializer shape info
+    auto* shape = initializer_tensor_type->mutable_shape();
+    for (int i = 0; i < tp.dims_size(); ++i) {
+      shape->add_dim()->set_dim_value(tp.dims(i));
+    }
+    ProcessInitializer(tp.name(), tp, initializer_type, input_data_by_name);
+  }
+
+  void ProcessInitializer(const SparseTensorProto& tp) {
+    TypeProto initializer_type;
+    auto* initializer_sparse_tensor_type = initializer_type.mutable_sparse_tensor_type();
+    initializer_sparse_tensor_type->set_elem_type(tp.values().data_type());
+    // set the shape according to the initializer shape info
+    auto* shape = initializer_sparse_tensor_type->mutable_shape();
+    for (int i = 0; i < tp.dims_size(); ++i) {
+      shape->add_dim()->set_dim_value(tp.dims(i));
+    }
+    ProcessInitializer(tp.values().name(), tp, initializer_type, input_sparse_data_by_name);
+  }
+
+  const TypeProto* GetType(const std::string& name) const {
+    auto iter = value_types_by_name.find(name);
+    return iter == value_types_by_name.end() ? nullptr : iter->second;
+  }
+
   void Process(const NodeProto& n, internal::AttributeBinder& attribute_binder) {
     NodeProto copy_n(n);
     attribute_binder.VisitNode(copy_n);
@@ -855,6 +868,100 @@ void InferShapes(
   }
 }
 
+struct IncrementalShapeInference::Impl {
+  Impl(
+      const std::unordered_map<std::string, int>& opset_imports_in,
+      const ShapeInferenceOptions& options_in,
+      const std::vector<FunctionProto>& functions_in,
+      const ISchemaRegistry* schema_registry,
+      int ir_version)
+      : opset_imports(opset_imports_in),
+        options(options_in),
+        functions(functions_in),
+        functions_map(MakeFunctionsMap(functions)),
+        base(&graph,
+             {},
+             opset_imports,
+             options,
+             &symbol_table,
+             functions_map,
+             schema_registry,
+             &generated_shape_data_by_name,
+             ir_version) {}
+
+  static ModelLocalFunctionsMap MakeFunctionsMap(const std::vector<FunctionProto>& functions) {
+    ModelLocalFunctionsMap functions_map;
+    for (const auto& function_proto : functions) {
+      functions_map.insert({GetFunctionIdentifier(function_proto), &function_proto});
+    }
+    return functions_map;
+  }
+
+  // Holds the declared types, the initializers, the inferred types and the
+  // Constant nodes, the base keeps pointers to all of them.
+  GraphProto graph;
+  SymbolTableImpl symbol_table;
+  DataValueMap generated_shape_data_by_name;
+  const std::unordered_map<std::string, int> opset_imports;
+  const ShapeInferenceOptions options;
+  const std::vector<FunctionProto> functions;
+  const ModelLocalFunctionsMap functions_map;
+  ShapeInferenceImplBase base;
+};
+
+IncrementalShapeInference::IncrementalShapeInference(
+    const std::unordered_map<std::string, int>& opset_imports,
+    const ShapeInferenceOptions& options,
+    const std::vector<FunctionProto>& model_local_functions,
+    const ISchemaRegistry* schema_registry,
+    int ir_version)
+    : impl_(std::make_unique<Impl>(opset_imports, options, model_local_functions, schema_registry, ir_version)) {}
+
+IncrementalShapeInference::~IncrementalShapeInference() = default;
+
+void IncrementalShapeInference::AddValueInfo(const ValueInfoProto& value_info) {
+  GraphProto declared;
+  *declared.add_value_info() = value_info;
+  impl_->symbol_table.addFromGraph(declared);
+  auto* vi = impl_->graph.add_value_info();
+  *vi = value_info;
+  impl_->base.UpdateType(*vi);
+}
+
+void IncrementalShapeInference::AddInitializer(const TensorProto& initializer) {
+  auto* tp = impl_->graph.add_initializer();
+  *tp = initializer;
+  impl_->base.ProcessInitializer(*tp);
+}
+
+std::vector<const TypeProto*> IncrementalShapeInference::InferNode(const NodeProto& node) {
+  auto* nodes = impl_->graph.mutable_node();
+  auto* n = nodes->Add();
+  *n = node;
+  // The values of Constant nodes are read by the next nodes, the other ones can go.
+  ScopeExit guard([&]() noexcept {
+    if (!IsOnnxDomainOp(*n, "Constant")) {
+      nodes->RemoveLast();
+    }
+  });
+  const auto num_errors = impl_->base.getErrors().size();
+  impl_->base.Process(*n);
+  const auto& errors = impl_->base.getErrors();
+  if (errors.size() > num_errors && impl_->options.error_mode > 0) {
+    fail_shape_inference("Inference error(s): ", errors.back());
+  }
+  std::vector<const TypeProto*> output_types;
+  output_types.reserve(node.output_size());
+  for (const auto& output : node.output()) {
+    output_types.push_back(output.empty() ? nullptr : GetType(output));
+  }
+  return output_types;
+}
+
+const TypeProto* IncrementalShapeInference::GetType(const std::string& name) const {
+  return impl_->base.GetType(name);
+}
+
 static void InferShapeForFunctionNodeInternal(
     const FunctionProto& func_proto,
     const std::unordered_map<std::string, int>& func_opset_imports,
@@ -490,6 +490,38 @@ ONNX_API void InferShapes(
     const ShapeInferenceOptions& options = ShapeInferenceOptions(),
     DataValueMap* generated_shape_data_by_name = nullptr);
 
+///
+/// Infers the types of the outputs of nodes fed one at a time.
+/// The types of the values seen so far are kept between the calls, a tool walking
+/// a graph only sends the declared types, the initializers and every node once.
+/// Inference errors are thrown by InferNode when options.error_mode > 0.
+///
+class ONNX_API IncrementalShapeInference {
+ public:
+  explicit IncrementalShapeInference(
+      const std::unordered_map<std::string, int>& opset_imports,
+      const ShapeInferenceOptions& options = ShapeInferenceOptions(),
+      const std::vector<FunctionProto>& model_local_functions = {},
+      const ISchemaRegistry* schema_registry = OpSchemaRegistry::Instance(),
+      int ir_version = IR_VERSION);
+  ~IncrementalShapeInference();
+  ONNX_DISALLOW_COPY_ASSIGNMENT_AND_MOVE(IncrementalShapeInference);
+
+  // Declares the type of a graph input or of any other value.
+  void AddValueInfo(const ValueInfoProto& value_info);
+  // Declares an initializer, its values are used by the nodes consuming it.
+  void AddInitializer(const TensorProto& initializer);
+  // Returns the inferred types of the outputs of the node, nullptr for missing
+  // optional outputs or outputs whose type could not be inferred.
+  std::vector<const TypeProto*> InferNode(const NodeProto& node);
+  // Returns the type known for a value, nullptr if there is none.
+  const TypeProto* GetType(const std::string& name) const;
+
+ private:
+  struct Impl;
+  std::unique_ptr<Impl> impl_;
+};
+
 ///
 /// ModelLocalFunctionsMap is a map of function id -> model local function proto
 /// All the ONNX helper utilities expect the function id == <function_proto.domain>:<function_proto.name>
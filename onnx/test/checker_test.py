@@ -333,6 +333,37 @@ class TestChecker(unittest.TestCase):
         ):
             self.assertRaises(ValueError, checker.check_model, serialized)
 
+    def test_check_model_initializer_size_threshold(self) -> None:
+        node = helper.make_node("Add", ["X", "W"], ["Y"], name="test")
+        weight = numpy_helper.from_array(np.ones((256, 16), dtype=np.float32), "W")
+        graph = helper.make_graph(
+            [node],
+            "test",
+            [helper.make_tensor_value_info("X", TensorProto.FLOAT, [256, 16])],
+            [helper.make_tensor_value_info("Y", TensorProto.FLOAT, [256, 16])],
+            [weight],
+        )
+        model = helper.make_model(graph, producer_name="test")
+        expected = model.SerializeToString()
+
+        # only the metadata of the initializer is serialized
+        with unittest.mock.patch.object(checker, "MAXIMUM_PROTOBUF", 1024):
+            self.assertRaises(ValueError, checker.check_model, model)
+            checker.check_model(model, full_check=True, initializer_size_threshold=1024)
+        self.assertEqual(model.SerializeToString(), expected)
+
+        # the checker still looks into the data of packed types
+        weight = TensorProto(
+            name="W", data_type=TensorProto.INT4, dims=[256, 16], raw_data=b"\0" * 1024
+        )
+        model.graph.initializer[0].CopyFrom(weight)
+        self.assertRaises(
+            checker.ValidationError,
+            checker.check_model,
+            model,
+            initializer_size_threshold=16,
+        )
+
     def test_check_old_model(self) -> None:
         node = helper.make_node("Pad", ["X"], ["Y"], paddings=(0, 0, 0, 0))
         graph = helper.make_graph(
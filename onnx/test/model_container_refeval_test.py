@@ -135,6 +135,102 @@ class TestLargeOnnxReferenceEvaluator(unittest.TestCase):
             loaded_model = onnx.load_model(filename, load_external_data=True)
             self.common_check_reference_evaluator(loaded_model)
 
+    def test_large_one_weight_file_mmap(self):
+        large_model = _large_linear_regression()
+        with tempfile.TemporaryDirectory() as temp:
+            filename = os.path.join(temp, "model.onnx")
+            large_model.save(filename, True)
+            copy = onnx.model_container.ModelContainer()
+            copy.load(filename, mmap=True)
+            for value in copy.large_initializers.values():
+                self.assertFalse(value.flags.writeable)
+            self.common_check_reference_evaluator(copy)
+
+            # The evaluator maps the weights when it receives a filename.
+            self.common_check_reference_evaluator(filename)
+            ref = onnx.reference.ReferenceEvaluator(filename)
+            self.assertTrue(any(not v.flags.writeable for v in ref.rt_inits_.values()))
+            del copy, ref
+
+    def test_nested_external_data_loaded(self):
+        # W stays external, the initializer of the then branch and
+        # the tensor attribute of the else branch are loaded
+        then_branch = onnx.helper.make_graph(
+            [onnx.helper.make_node("Identity", ["W1"], ["Z"])],
+            "then",
+            [],
+            [onnx.helper.make_tensor_value_info("Z", onnx.TensorProto.FLOAT, None)],
+            [onnx.numpy_helper.from_array(np.full((4,), 10, np.float32), name="W1")],
+        )
+        else_branch = onnx.helper.make_graph(
+            [
+                onnx.helper.make_node(
+                    "Constant",
+                    [],
+                    ["Z"],
+                    value=onnx.numpy_helper.from_array(np.full((4,), 20, np.float32)),
+                )
+            ],
+            "else",
+            [],
+            [onnx.helper.make_tensor_value_info("Z", onnx.TensorProto.FLOAT, None)],
+        )
+        model = onnx.helper.make_model(
+            onnx.helper.make_graph(
+                [
+                    onnx.helper.make_node("Add", ["X", "W"], ["XW"]),
+                    onnx.helper.make_node(
+                        "If",
+                        ["C"],
+                        ["Z"],
+                        then_branch=then_branch,
+                        else_branch=else_branch,
+                    ),
+                    onnx.helper.make_node("Add", ["XW", "Z"], ["Y"]),
+                ],
+                "g",
+                [
+                    onnx.helper.make_tensor_value_info(
+                        "X", onnx.TensorProto.FLOAT, [4]
+                    ),
+                    onnx.helper.make_tensor_value_info("C", onnx.TensorProto.BOOL, []),
+                ],
+                [onnx.helper.make_tensor_value_info("Y", onnx.TensorProto.FLOAT, [4])],
+                [
+                    onnx.numpy_helper.from_array(
+                        np.arange(4, dtype=np.float32), name="W"
+                    )
+                ],
+            ),
+            opset_imports=[onnx.helper.make_opsetid("", 18)],
+        )
+        x = np.ones((4,), dtype=np.float32)
+        with tempfile.TemporaryDirectory() as temp:
+            filename = os.path.join(temp, "model.onnx")
+            onnx.save_model(
+                model,
+                filename,
+                save_as_external_data=True,
+                all_tensors_to_one_file=True,
+                size_threshold=0,
+            )
+            ref = onnx.reference.ReferenceEvaluator(filename)
+            graph = ref.proto_.graph
+            self.assertTrue(
+                onnx.external_data_helper.uses_external_data(graph.initializer[0])
+            )
+            for att in graph.node[1].attribute:
+                for tensor in onnx.external_data_helper._get_all_tensors(
+                    onnx.helper.make_model(att.g)
+                ):
+                    self.assertFalse(
+                        onnx.external_data_helper.uses_external_data(tensor)
+                    )
+            for cond, add in [(True, 10), (False, 20)]:
+                got = ref.run(None, {"X": x, "C": np.array(cond)})[0]
+                npt.assert_allclose(got, x + np.arange(4) + add)
+            del ref
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -132,6 +132,52 @@ class TestLargeOnnx(unittest.TestCase):
             loaded_model = onnx.load_model(filename, load_external_data=True)
             onnx.checker.check_model(loaded_model)
 
+    def test_large_one_weight_file_alignment(self):
+        large_model = _large_linear_regression()
+        with tempfile.TemporaryDirectory() as temp:
+            filename = os.path.join(temp, "model.onnx")
+            saved_proto = large_model.save(filename, True, alignment=4096)
+            offsets = []
+            for tensor in ext_data._get_all_tensors(saved_proto):
+                if ext_data.uses_external_data(tensor):
+                    info = ext_data.ExternalDataInfo(tensor)
+                    self.assertEqual(info.offset % 4096, 0)
+                    offsets.append(info.offset)
+            self.assertEqual(len(set(offsets)), len(large_model.large_initializers))
+            loaded_model = onnx.load_model(filename, load_external_data=True)
+            weights = {
+                init.name: onnx.numpy_helper.to_array(init)
+                for init in loaded_model.graph.initializer
+            }
+            np.testing.assert_array_equal(
+                weights["A"], large_model.large_initializers["#loc0"]
+            )
+            np.testing.assert_array_equal(
+                weights["C"], large_model.large_initializers["#loc1"]
+            )
+            with self.assertRaises(ValueError):
+                large_model.save(filename, True, alignment=0)
+
+    def test_large_one_weight_file_byte_order(self):
+        # big endian and non contiguous arrays are converted before being written
+        large_model = _large_linear_regression()
+        expected = {
+            "#loc0": large_model.large_initializers["#loc0"],
+            "#loc1": large_model.large_initializers["#loc1"],
+        }
+        large_model.large_initializers["#loc0"] = expected["#loc0"].astype(">f4")
+        large_model.large_initializers["#loc1"] = np.asfortranarray(expected["#loc1"])
+        with tempfile.TemporaryDirectory() as temp:
+            filename = os.path.join(temp, "model.onnx")
+            large_model.save(filename, True)
+            loaded_model = onnx.load_model(filename, load_external_data=True)
+            weights = {
+                init.name: onnx.numpy_helper.to_array(init)
+                for init in loaded_model.graph.initializer
+            }
+            np.testing.assert_array_equal(weights["A"], expected["#loc0"])
+            np.testing.assert_array_equal(weights["C"], expected["#loc1"])
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -0,0 +1,75 @@
+# Copyright (c) ONNX Project Contributors
+
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+
+import onnx
+from onnx import checker, inliner, parser, shape_inference, version_converter
+from onnx.model_session import ModelSession
+
+_MODEL = """
+    <ir_version: 8, opset_import: [ "" : 17, "local" : 1 ]>
+    agraph (float[N, 4] X) => (float[N, 4] Y)
+    {
+        T = local.foo (X)
+        Y = Relu (T)
+    }
+
+    <opset_import: [ "" : 17 ], domain: "local">
+    foo (x) => (y) {
+        temp = Add(x, x)
+        y = Mul(temp, x)
+    }
+"""
+
+
+class ModelSessionTest(unittest.TestCase):
+    def test_chain_same_as_functions(self):
+        model = parser.parse_model(_MODEL)
+        checker.check_model(model)
+        expected = inliner.inline_local_functions(model)
+        expected = shape_inference.infer_shapes(expected, strict_mode=True)
+        expected = version_converter.convert_version(expected, 18)
+        checker.check_model(expected, full_check=True)
+
+        session = ModelSession(model)
+        got = (
+            session.check_model()
+            .inline_local_functions()
+            .infer_shapes(strict_mode=True)
+            .convert_version(18)
+            .check_model(full_check=True)
+            .to_proto()
+        )
+        self.assertEqual(got, expected)
+        self.assertEqual(session.to_bytes(), expected.SerializeToString())
+        # the original model is not modified
+        self.assertEqual(model, parser.parse_model(_MODEL))
+
+    def test_path(self):
+        model = parser.parse_model(_MODEL)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "model.onnx")
+            onnx.save(model, path)
+            output = os.path.join(temp_dir, "inlined.onnx")
+            ModelSession(path).inline_local_functions().save(output)
+            self.assertEqual(onnx.load(output), inliner.inline_local_functions(model))
+
+    def test_check_model_fails(self):
+        model = parser.parse_model(_MODEL)
+        model.graph.node[1].op_type = "Unknown"
+        session = ModelSession(model.SerializeToString())
+        self.assertRaises(checker.ValidationError, session.check_model)
+
+    def test_wrong_types(self):
+        self.assertRaises(TypeError, ModelSession, parser.parse_model(_MODEL).graph)
+        session = ModelSession(parser.parse_model(_MODEL))
+        self.assertRaises(TypeError, session.convert_version, "18")
+
+
+if __name__ == "__main__":
+    unittest.main()
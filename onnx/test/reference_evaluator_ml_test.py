@@ -8,6 +8,7 @@ import importlib
 import itertools
 import os
 import unittest
+from unittest import mock
 
 import numpy as np
 from numpy.testing import assert_allclose
@@ -24,6 +25,12 @@ from onnx.helper import (
     make_tensor_value_info,
 )
 from onnx.reference import ReferenceEvaluator
+from onnx.reference.ops.aionnxml import (
+    op_svm_helper,
+    op_tree_ensemble,
+    op_tree_ensemble_helper,
+)
+from onnx.reference.ops.aionnxml.op_svm_helper import SVMCommon
 from onnx.reference.ops.aionnxml.op_tree_ensemble import (
     AggregationFunction,
     Mode,
@@ -1118,6 +1125,26 @@ class TestReferenceEvaluatorAiOnnxMl(unittest.TestCase):
         assert_allclose(got[0], expected, atol=1e-6)
         self.assertIn("op_type=TreeEnsembleRegressor", str(sess.rt_nodes_[0]))
 
+    @unittest.skipIf(not ONNX_ML, reason="onnx not compiled with ai.onnx.ml")
+    def test_tree_ensemble_regressor_many_rows(self):
+        rng = np.random.default_rng(0)
+        x = (rng.integers(-6, 6, size=(200, 3)) / 10).astype(np.float32)
+        x[rng.random(x.shape) < 0.1] = np.nan
+        models = [
+            self._get_test_tree_ensemble_regressor("SUM"),
+            self._get_test_tree_ensemble_opset_latest(AggregationFunction.SUM),
+        ]
+        for model in models:
+            sess = ReferenceEvaluator(model)
+            expected = np.vstack([sess.run(None, {"X": row[None]})[0] for row in x])
+            # rows are processed by chunks of a few rows
+            with (
+                mock.patch.object(op_tree_ensemble, "_CHUNK_SIZE", 8),
+                mock.patch.object(op_tree_ensemble_helper, "_CHUNK_SIZE", 8),
+            ):
+                got = sess.run(None, {"X": x})[0]
+            np.testing.assert_array_equal(expected, got)
+
     @unittest.skipIf(not ONNX_ML, reason="onnx not compiled with ai.onnx.ml")
     @parameterized.expand(
         [(input_type,) for input_type in [TensorProto.FLOAT, TensorProto.DOUBLE]]
@@ -1358,6 +1385,35 @@ class TestReferenceEvaluatorAiOnnxMl(unittest.TestCase):
                 got = sess.run(None, {"X": x})
                 assert_allclose(got[0], expected, atol=1e-6)
 
+    def test_svm_kernel_matrix(self):
+        rng = np.random.default_rng(0)
+        x = rng.standard_normal((7, 3)).astype(np.float32)
+        sv = rng.standard_normal((5, 3)).astype(np.float32)
+        svm = SVMCommon(kernel_params=[0.3, 0.1, 3.0])
+        for kernel in ["LINEAR", "POLY", "RBF", "SIGMOID"]:
+            with self.subTest(kernel=kernel):
+                expected = np.array(
+                    [[svm.kernel_dot(a, b, kernel) for b in sv] for a in x]
+                )
+                # rows are processed by chunks of two rows,
+                # one row for RBF which stores the differences
+                with mock.patch.object(op_svm_helper, "_CHUNK_SIZE", 10):
+                    chunks = list(svm.kernel_matrices(x, sv, kernel))
+                self.assertEqual(len(chunks), 7 if kernel == "RBF" else 4)
+                got = np.vstack([kernels for _, _, kernels in chunks])
+                assert_allclose(expected, got, rtol=1e-5, atol=1e-6)
+
+    def test_svm_kernel_matrix_rbf_not_centred(self):
+        # features far from zero, rows close to the support vectors
+        rng = np.random.default_rng(0)
+        sv = (1000 + rng.standard_normal((5, 20))).astype(np.float32)
+        x = (sv + 0.01).astype(np.float32)
+        svm = SVMCommon(kernel_params=[1.0, 0.0, 3.0])
+        expected = np.array([[svm.kernel_dot(a, b, "RBF") for b in sv] for a in x])
+        self.assertGreater(np.diag(expected).min(), 0.99)
+        got = svm.kernel_matrix(x, sv, "RBF")
+        assert_allclose(expected, got, rtol=1e-5, atol=1e-6)
+
     @staticmethod
     def _get_test_tree_ensemble_classifier_binary(post_transform):
         X = make_tensor_value_info("X", TensorProto.FLOAT, [None, None])
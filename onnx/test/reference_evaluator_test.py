@@ -23,6 +23,7 @@ from io import StringIO
 from os import getenv
 from textwrap import dedent
 from typing import TYPE_CHECKING
+from unittest import mock
 
 import ml_dtypes
 import numpy as np
@@ -59,7 +60,7 @@ from onnx.helper import (
 from onnx.numpy_helper import from_array
 from onnx.reference import ReferenceEvaluator
 from onnx.reference.op_run import OpRun, OpRunExpand
-from onnx.reference.ops import load_op
+from onnx.reference.ops import load_op, op_non_max_suppression
 from onnx.reference.ops._op_common_indices import _get_indices, _is_out
 from onnx.reference.ops._op_list import Cast_19, Celu
 from onnx.reference.ops.aionnx_preview_training._op_list import Adam
@@ -71,7 +72,6 @@ from onnx.reference.ops.op_col2im import (
 )
 from onnx.reference.ops.op_conv import Conv, _conv_implementation
 from onnx.reference.ops_optimized import Conv as ConvOptimized
-from onnx.reference.ops_optimized.op_conv_optimized import _conv_implementation_im2col
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
@@ -211,6 +211,49 @@ def im2col(
     return res.reshape(new_shape)
 
 
+def conv_im2col_gemm(
+    X: np.ndarray,
+    W: np.ndarray,
+    B: np.ndarray | None,
+    auto_pad: str,
+    dilations: Sequence[int],
+    group: int,
+    kernel_shape: Sequence[int],
+    pads: Sequence[int] | None,
+    strides: Sequence[int],
+) -> np.ndarray:
+    """Naive convolution, *Conv = im2col + Gemm*, used as a reference."""
+    n_dims = len(kernel_shape)
+    if auto_pad in {"SAME_LOWER", "SAME_UPPER"}:
+        head, tail = [], []
+        for i in range(n_dims):
+            d = X.shape[i + 2]
+            extent = (kernel_shape[i] - 1) * dilations[i] + 1
+            target_size = (d + strides[i] - 1) // strides[i]
+            pad_needed = max((target_size - 1) * strides[i] + extent - d, 0)
+            pad_head = (
+                (pad_needed + 1) // 2 if auto_pad == "SAME_LOWER" else pad_needed // 2
+            )
+            head.append(pad_head)
+            tail.append(pad_needed - pad_head)
+        pads = head + tail
+    elif pads is None:
+        pads = [0] * (n_dims * 2)
+    # cols has shape (N, C, *output_shape, kernel_size)
+    cols = im2col(X, tuple(kernel_shape), dilations, pads, strides)
+    n, c = X.shape[:2]
+    m = W.shape[0]
+    output_shape = cols.shape[2:-1]
+    cols = cols.reshape((n, group, c // group, -1, cols.shape[-1]))
+    cols = cols.transpose((0, 1, 3, 2, 4)).reshape((n, group, cols.shape[3], -1))
+    weights = W.reshape((group, m // group, -1))
+    res = np.matmul(cols, weights.transpose((0, 2, 1)))
+    res = res.transpose((0, 1, 3, 2)).reshape((n, m, *output_shape))
+    if B is not None:
+        res = res + B.reshape((1, -1) + (1,) * n_dims)
+    return res
+
+
 class TestReferenceEvaluator(unittest.TestCase):
     m2_def = """
         <
@@ -2189,7 +2232,6 @@ class TestReferenceEvaluator(unittest.TestCase):
                 dtype=np.float32,
             ),
         }
-        feeds["B"][:] = 0
 
         # model 2
         X = feeds["X"]
@@ -2207,9 +2249,12 @@ class TestReferenceEvaluator(unittest.TestCase):
 
         ref1 = ReferenceEvaluator(onnx_model)
         got1 = ref1.run(None, feeds)
-
         assert_allclose(Y, got1[0], atol=1e-5)
 
+        ref2 = ReferenceEvaluator(onnx_model, optimized=False)
+        got2 = ref2.run(None, feeds)
+        assert_allclose(Y, got2[0], atol=1e-5)
+
     def test_conv_strides(self):
         X = make_tensor_value_info("X", TensorProto.FLOAT, [1, 3, 6, 6])
         W = make_tensor_value_info("W", TensorProto.FLOAT, [2, 3, 3, 3])
@@ -2333,6 +2378,45 @@ class TestReferenceEvaluator(unittest.TestCase):
         got1 = ref1.run(None, feeds)
         assert_allclose(got1[0], expected)
 
+    def test_max_pool_2d_dilations_indices(self):
+        X = make_tensor_value_info("X", TensorProto.FLOAT, [None, None, None, None])
+        Y = make_tensor_value_info("Y", TensorProto.FLOAT, [None, None, None, None])
+        Ind = make_tensor_value_info("I", TensorProto.INT64, [None, None, None, None])
+
+        node = make_node(
+            "MaxPool",
+            ["X"],
+            ["Y", "I"],
+            kernel_shape=[2, 3],
+            pads=[1, 0, 0, 2],
+            strides=[2, 1],
+            dilations=[2, 2],
+            storage_order=1,
+        )
+        graph = make_graph([node], "g", [X], [Y, Ind])
+        onnx_model = make_model(graph, opset_imports=[make_opsetid("", 18)])
+
+        x = np.random.default_rng(0).standard_normal((2, 3, 6, 7)).astype(np.float32)
+        x[0, 1, 2, 3] = np.nan
+        n, c, h, w = x.shape
+        expected_y = np.empty((n, c, 3, 5), dtype=np.float32)
+        expected_i = np.empty((n, c, 3, 5), dtype=np.int64)
+        for b, ch, i, j in np.ndindex(expected_y.shape):
+            best, where = None, None
+            for ki, kj in np.ndindex(2, 3):
+                r, s = i * 2 - 1 + ki * 2, j + kj * 2
+                if 0 <= r < h and 0 <= s < w:
+                    v = x[b, ch, r, s]
+                    if best is None or v > best:
+                        best, where = v, (b * c + ch) * h * w + s * h + r
+            expected_y[b, ch, i, j] = best
+            expected_i[b, ch, i, j] = where
+
+        ref1 = ReferenceEvaluator(onnx_model)
+        got_y, got_i = ref1.run(None, {"X": x})
+        assert_allclose(got_y, expected_y)
+        assert_allclose(got_i, expected_i)
+
     def test_scatter_elements(self):
         X = make_tensor_value_info("X", TensorProto.FLOAT, [None, None])
         Ind = make_tensor_value_info("I", TensorProto.INT64, [None, None])
@@ -2496,6 +2580,59 @@ class TestReferenceEvaluator(unittest.TestCase):
         got1 = ref1.run(None, feeds)
         assert_allclose(got1[0], expected)
 
+    def test_conv_transpose_groups(self):
+        X = make_tensor_value_info("X", TensorProto.FLOAT, [None, None, None, None])
+        W = make_tensor_value_info("W", TensorProto.FLOAT, [None, None, None, None])
+        B = make_tensor_value_info("B", TensorProto.FLOAT, [None])
+        Y = make_tensor_value_info("Y", TensorProto.FLOAT, [None, None, None, None])
+
+        node = make_node(
+            "ConvTranspose",
+            ["X", "W", "B"],
+            ["Y"],
+            group=2,
+            dilations=[2, 1],
+            pads=[1, 0, 0, 1],
+            strides=[2, 3],
+        )
+        graph = make_graph([node], "g", [X, W, B], [Y])
+        onnx_model = make_model(graph, opset_imports=[make_opsetid("", 16)])
+        rng = np.random.default_rng(0)
+        feeds = {
+            "X": rng.standard_normal((2, 4, 3, 4)).astype(np.float32),
+            "W": rng.standard_normal((4, 3, 2, 3)).astype(np.float32),
+            "B": rng.standard_normal((6,)).astype(np.float32),
+        }
+
+        # every input pixel adds the kernel scaled by its value
+        x, w, b = feeds["X"], feeds["W"], feeds["B"]
+        expected = np.zeros((2, 6, 6, 11), dtype=np.float64)
+        for n, c, i, j in np.ndindex(x.shape):
+            g = c // 2
+            for m, ki, kj in np.ndindex(w.shape[1:]):
+                r, s = i * 2 + ki * 2 - 1, j * 3 + kj
+                if 0 <= r < 6 and 0 <= s < 11:
+                    expected[n, g * 3 + m, r, s] += x[n, c, i, j] * w[c, m, ki, kj]
+        expected += b.reshape((1, -1, 1, 1))
+
+        ref1 = ReferenceEvaluator(onnx_model)
+        got1 = ref1.run(None, feeds)
+        assert_allclose(got1[0], expected, rtol=1e-5, atol=1e-5)
+        feeds["X"] = feeds["X"] * 2
+        got2 = ref1.run(None, feeds)
+        assert_allclose(
+            got2[0], expected * 2 - b.reshape((1, -1, 1, 1)), rtol=1e-5, atol=1e-5
+        )
+        # the second run reuses the slices computed by the first one
+        self.assertEqual(len(ref1.rt_nodes_[0]._plans), 1)
+        # only the plans for the last shapes are kept
+        plans = ref1.rt_nodes_[0]._plans
+        for height in range(1, plans.maxsize + 5):
+            feeds["X"] = rng.standard_normal((2, 4, height, 4)).astype(np.float32)
+            ref1.run(None, feeds)
+        self.assertEqual(len(plans), plans.maxsize)
+        self.assertEqual(next(reversed(plans))[0], feeds["X"].shape)
+
     def test_stft(self):
         signal = make_tensor_value_info("signal", TensorProto.FLOAT, [None, None, None])
         frame_step = make_tensor_value_info("frame_step", TensorProto.INT64, [None])
@@ -2637,6 +2774,293 @@ class TestReferenceEvaluator(unittest.TestCase):
         # with self.subTest(mode="max"):
         #     self.common_test_roi_align_torch("max")
 
+    @parameterized.parameterized.expand([("avg",), ("max",)])
+    def test_roi_align_adaptive_grid(self, mode):
+        X = make_tensor_value_info("X", TensorProto.FLOAT, [None, None, None, None])
+        rois = make_tensor_value_info("rois", TensorProto.FLOAT, [None, None])
+        Y = make_tensor_value_info("Y", TensorProto.FLOAT, [None, None, None, None])
+        IS = make_tensor_value_info("I", TensorProto.INT64, [None])
+        node = make_node(
+            "RoiAlign",
+            ["X", "rois", "I"],
+            ["Y"],
+            output_height=3,
+            output_width=2,
+            sampling_ratio=0,
+            spatial_scale=0.5,
+            coordinate_transformation_mode="half_pixel",
+            mode=mode,
+        )
+        graph = make_graph([node], "g", [X, rois, IS], [Y])
+        onnx_model = make_model(graph, opset_imports=[make_opsetid("", 16)])
+        x = np.random.default_rng(0).standard_normal((2, 3, 10, 12))
+        feeds = {
+            "X": x.astype(np.float32),
+            # rois of different sizes get sampling grids of different sizes
+            "rois": np.array(
+                [[0, 0, 20, 18], [4, 2, 7, 6], [-4, 1, 30, 9], [3, 3, 3, 3]],
+                dtype=np.float32,
+            ),
+            "I": np.array([1, 0, 0, 1], dtype=np.int64),
+        }
+        ref = ReferenceEvaluator(onnx_model)
+        got = ref.run(None, feeds)[0]
+        self.assertEqual(got.shape, (4, 3, 3, 2))
+        # every roi computed alone gives the same result
+        for i in range(4):
+            single = ref.run(
+                None,
+                {
+                    "X": feeds["X"],
+                    "rois": feeds["rois"][i : i + 1],
+                    "I": feeds["I"][i : i + 1],
+                },
+            )[0]
+            assert_allclose(got[i : i + 1], single)
+        if mode == "avg":
+            # a constant feature map gives a constant output
+            # for a roi fully inside the image
+            feeds["X"] = np.full((2, 3, 10, 12), 2.5, dtype=np.float32)
+            got = ref.run(None, feeds)[0]
+            assert_allclose(got[:2], np.full((2, 3, 3, 2), 2.5), rtol=1e-6)
+
+    def test_non_max_suppression_tiles(self):
+        names = ["boxes", "scores", "max", "iou", "score"]
+        node = make_node("NonMaxSuppression", names, ["Y"])
+        graph = make_graph(
+            [node],
+            "g",
+            [
+                make_tensor_value_info("boxes", TensorProto.FLOAT, None),
+                make_tensor_value_info("scores", TensorProto.FLOAT, None),
+                make_tensor_value_info("max", TensorProto.INT64, None),
+                make_tensor_value_info("iou", TensorProto.FLOAT, None),
+                make_tensor_value_info("score", TensorProto.FLOAT, None),
+            ],
+            [make_tensor_value_info("Y", TensorProto.INT64, None)],
+        )
+        onnx_model = make_model(graph, opset_imports=[make_opsetid("", 11)])
+        rng = np.random.default_rng(0)
+        boxes = rng.uniform(0, 20, size=(2, 60, 4)).astype(np.float32)
+        feeds = {
+            "boxes": boxes,
+            "scores": np.round(rng.uniform(size=(2, 3, 60)), 1).astype(np.float32),
+            "max": np.array([25], dtype=np.int64),
+            "iou": np.array([0.3], dtype=np.float32),
+            "score": np.array([0.2], dtype=np.float32),
+        }
+        ref = ReferenceEvaluator(onnx_model)
+        expected = ref.run(None, feeds)[0]
+        with mock.patch.object(op_non_max_suppression, "_BLOCK_SIZE", 3):
+            got = ref.run(None, feeds)[0]
+        assert_allclose(got, expected)
+
+        for b, c in itertools.product(range(2), range(3)):
+            selected = expected[(expected[:, 0] == b) & (expected[:, 1] == c), 2]
+            self.assertLessEqual(len(selected), 25)
+            scores = feeds["scores"][b, c, selected]
+            self.assertTrue((scores > 0.2).all())
+            self.assertTrue((np.diff(scores) <= 0).all())
+            # no selected box overlaps another one above the threshold
+            corners = op_non_max_suppression.box_corners(boxes[b, selected], 0)
+            overlap = op_non_max_suppression.suppress_by_iou(corners, corners, 0.3)
+            np.fill_diagonal(overlap, False)
+            self.assertFalse(overlap.any())
+
+    def test_resize_plan_cache(self):
+        X = make_tensor_value_info("X", TensorProto.FLOAT, None)
+        sizes = make_tensor_value_info("sizes", TensorProto.INT64, None)
+        Y = make_tensor_value_info("Y", TensorProto.FLOAT, None)
+        node = make_node(
+            "Resize", ["X", "", "", "sizes"], ["Y"], mode="linear", axes=[-2, -1]
+        )
+        onnx_model = make_model(
+            make_graph([node], "g", [X, sizes], [Y]),
+            opset_imports=[make_opsetid("", 19)],
+        )
+        ref = ReferenceEvaluator(onnx_model)
+        x = np.arange(2 * 3 * 4 * 5).reshape((2, 3, 4, 5)).astype(np.float32)
+        feeds = {"X": x, "sizes": np.array([4, 10], dtype=np.int64)}
+        got = ref.run(None, feeds)[0]
+        self.assertEqual(got.shape, (2, 3, 4, 10))
+        # the first axis is unchanged, the second one is interpolated
+        # with half_pixel coordinates, the borders are repeated
+        expected_last = np.stack(
+            [
+                x[..., 0],
+                *[
+                    x[..., i] * w + x[..., i + 1] * (1 - w)
+                    for i in range(4)
+                    for w in (0.75, 0.25)
+                ],
+                x[..., 4],
+            ],
+            axis=-1,
+        )
+        assert_allclose(got, expected_last, rtol=1e-6)
+
+        resize = ref.rt_nodes_[0]
+        ref.run(None, {"X": x * 2, "sizes": feeds["sizes"]})
+        self.assertEqual(len(resize._plans), 1)
+        ref.run(None, {"X": x, "sizes": np.array([8, 5], dtype=np.int64)})
+        self.assertEqual(len(resize._plans), 2)
+
+    @parameterized.parameterized.expand(
+        [(mode,) for mode in ["nearest", "linear", "cubic"]]
+    )
+    def test_resize_empty_scales_with_axes(self, mode):
+        # exporters give an empty tensor for scales when sizes is used
+        def make(axes, sizes):
+            node = make_node(
+                "Resize", ["X", "roi", "scales", "sizes"], ["Y"], mode=mode, **axes
+            )
+            return make_model(
+                make_graph(
+                    [node],
+                    "g",
+                    [make_tensor_value_info("X", TensorProto.FLOAT, None)],
+                    [make_tensor_value_info("Y", TensorProto.FLOAT, None)],
+                    initializer=[
+                        from_array(np.array([], dtype=np.float32), name="roi"),
+                        from_array(np.array([], dtype=np.float32), name="scales"),
+                        from_array(np.array(sizes, dtype=np.int64), name="sizes"),
+                    ],
+                ),
+                opset_imports=[make_opsetid("", 19)],
+            )
+
+        x = np.arange(2 * 3 * 2 * 3).reshape((2, 3, 2, 3)).astype(np.float32)
+        got = ReferenceEvaluator(make(dict(axes=[2, 3]), [4, 4])).run(None, {"X": x})[0]
+        expected = ReferenceEvaluator(make({}, [2, 3, 4, 4])).run(None, {"X": x})[0]
+        self.assertEqual(got.shape, (2, 3, 4, 4))
+        assert_allclose(got, expected)
+
+    @parameterized.parameterized.expand(
+        [
+            (mode, padding_mode)
+            for mode in ["nearest", "linear", "cubic"]
+            for padding_mode in ["zeros", "border", "reflection"]
+        ]
+    )
+    def test_grid_sample_identity_3d(self, mode, padding_mode):
+        X = make_tensor_value_info("X", TensorProto.FLOAT, None)
+        grid = make_tensor_value_info("grid", TensorProto.FLOAT, None)
+        Y = make_tensor_value_info("Y", TensorProto.FLOAT, None)
+        node = make_node(
+            "GridSample",
+            ["X", "grid"],
+            ["Y"],
+            mode=mode,
+            padding_mode=padding_mode,
+            align_corners=1,
+        )
+        onnx_model = make_model(
+            make_graph([node], "g", [X, grid], [Y]),
+            opset_imports=[make_opsetid("", 22)],
+        )
+        x = np.random.rand(2, 3, 4, 5, 6).astype(np.float32)
+        # the last dimension of the grid is (w, h, d)
+        d, h, w = np.meshgrid(
+            np.linspace(-1, 1, 4),
+            np.linspace(-1, 1, 5),
+            np.linspace(-1, 1, 6),
+            indexing="ij",
+        )
+        g = np.stack([w, h, d], axis=-1)
+        g = np.stack([g, g]).astype(np.float32)
+        got = ReferenceEvaluator(onnx_model).run(None, {"X": x, "grid": g})[0]
+        assert_allclose(got, x, atol=1e-6)
+
+    def test_lstm_bidirectional_sequence_lens(self):
+        hidden_size = 3
+
+        def make_lstm(direction):
+            node = make_node(
+                "LSTM",
+                ["X", "W", "R", "B", "sequence_lens"],
+                ["Y", "Y_h", "Y_c"],
+                direction=direction,
+                hidden_size=hidden_size,
+            )
+            inputs = [
+                make_tensor_value_info(name, TensorProto.FLOAT, None)
+                for name in ["X", "W", "R", "B"]
+            ]
+            inputs.append(
+                make_tensor_value_info("sequence_lens", TensorProto.INT32, None)
+            )
+            outputs = [
+                make_tensor_value_info(name, TensorProto.FLOAT, None)
+                for name in ["Y", "Y_h", "Y_c"]
+            ]
+            return ReferenceEvaluator(
+                make_model(
+                    make_graph([node], "g", inputs, outputs),
+                    opset_imports=[make_opsetid("", 22)],
+                )
+            )
+
+        rng = np.random.default_rng(0)
+        x = rng.standard_normal((4, 2, 5)).astype(np.float32)
+        w = rng.standard_normal((2, 4 * hidden_size, 5)).astype(np.float32)
+        r = rng.standard_normal((2, 4 * hidden_size, hidden_size)).astype(np.float32)
+        b = rng.standard_normal((2, 8 * hidden_size)).astype(np.float32)
+        lens = np.array([4, 2], dtype=np.int32)
+        y, y_h, y_c = make_lstm("bidirectional").run(
+            None, {"X": x, "W": w, "R": r, "B": b, "sequence_lens": lens}
+        )
+        self.assertEqual(y.shape, (4, 2, 2, hidden_size))
+        self.assertEqual(y_c.shape, (2, 2, hidden_size))
+        # timesteps after the end of a sequence are zeros
+        assert_allclose(y[2:, :, 1], np.zeros((2, 2, hidden_size)))
+        # the forward state is the output of the last valid timestep,
+        # the reverse direction ends at the first timestep
+        assert_allclose(y_h[0], np.stack([y[3, 0, 0], y[1, 0, 1]]))
+        assert_allclose(y_h[1], y[0, 1])
+
+        # every direction of every sequence is computed independently
+        forward, reverse = make_lstm("forward"), make_lstm("reverse")
+        for i, length in enumerate(lens):
+            for d, ref in enumerate([forward, reverse]):
+                expected = ref.run(
+                    None,
+                    {
+                        "X": x[:length, i : i + 1],
+                        "W": w[d : d + 1],
+                        "R": r[d : d + 1],
+                        "B": b[d : d + 1],
+                        "sequence_lens": lens[i : i + 1],
+                    },
+                )
+                assert_allclose(y[:length, d, i], expected[0][:, 0, 0], atol=1e-6)
+                assert_allclose(y_h[d, i], expected[1][0, 0], atol=1e-6)
+                assert_allclose(y_c[d, i], expected[2][0, 0], atol=1e-6)
+
+    def test_tfidf_vectorizer_skip_grams(self):
+        X = make_tensor_value_info("X", TensorProto.STRING, None)
+        Y = make_tensor_value_info("Y", TensorProto.FLOAT, None)
+        node = make_node(
+            "TfIdfVectorizer",
+            ["X"],
+            ["Y"],
+            mode="TF",
+            min_gram_length=1,
+            max_gram_length=2,
+            max_skip_count=1,
+            ngram_counts=[0, 2],
+            ngram_indexes=[0, 1, 2, 3],
+            pool_strings=["a", "b", "a", "b", "b", "a"],
+        )
+        onnx_model = make_model(
+            make_graph([node], "g", [X], [Y]), opset_imports=[make_opsetid("", 9)]
+        )
+        x = np.array([["a", "b", "a", "c"], ["b", "c", "a", "a"]], dtype=object)
+        got = ReferenceEvaluator(onnx_model).run(None, {"X": x})[0]
+        # unigrams are counted once, bigrams (a, b) and (b, a)
+        # are counted when adjacent or with one item between them
+        expected = np.array([[2, 1, 1, 1], [2, 1, 0, 1]], dtype=np.float32)
+        assert_allclose(got, expected)
+
     def test_split(self):
         X = make_tensor_value_info("X", TensorProto.FLOAT, [None])
         Y1 = make_tensor_value_info("Y1", TensorProto.FLOAT, [None])
@@ -4083,8 +4507,8 @@ class TestReferenceEvaluator(unittest.TestCase):
             strides=[1],
             auto_pad="NOTSET",
         )
-        expected = _conv_implementation(**feeds, **kwargs)
-        got = _conv_implementation_im2col(**feeds, **kwargs)
+        expected = conv_im2col_gemm(**feeds, **kwargs)
+        got = _conv_implementation(**feeds, **kwargs)
         assert_allclose(got, expected)
 
     def test_conv_im2col_1d_pad0(self):
@@ -4101,8 +4525,8 @@ class TestReferenceEvaluator(unittest.TestCase):
             strides=[1],
             auto_pad="NOTSET",
         )
-        expected = _conv_implementation(**feeds, **kwargs)
-        got = _conv_implementation_im2col(**feeds, **kwargs)
+        expected = conv_im2col_gemm(**feeds, **kwargs)
+        got = _conv_implementation(**feeds, **kwargs)
         assert_allclose(got, expected)
 
     def test_conv_im2col_2d(self):
@@ -4120,8 +4544,8 @@ class TestReferenceEvaluator(unittest.TestCase):
             strides=[1, 1],
             auto_pad="NOTSET",
         )
-        expected = _conv_implementation(**feeds, **kwargs)
-        got = _conv_implementation_im2col(**feeds, **kwargs)
+        expected = conv_im2col_gemm(**feeds, **kwargs)
+        got = _conv_implementation(**feeds, **kwargs)
         assert_allclose(got, expected)
 
     def test_conv_im2col_2d_pad0(self):
@@ -4139,8 +4563,8 @@ class TestReferenceEvaluator(unittest.TestCase):
             strides=[1, 1],
             auto_pad="NOTSET",
         )
-        expected = _conv_implementation(**feeds, **kwargs)
-        got = _conv_implementation_im2col(**feeds, **kwargs)
+        expected = conv_im2col_gemm(**feeds, **kwargs)
+        got = _conv_implementation(**feeds, **kwargs)
         assert_allclose(got, expected)
 
     def test_conv_im2col_2d_autopad(self):
@@ -4157,8 +4581,8 @@ class TestReferenceEvaluator(unittest.TestCase):
             pads=None,
             auto_pad="SAME_LOWER",
         )
-        expected = _conv_implementation(**feeds, **kwargs)
-        got = _conv_implementation_im2col(**feeds, **kwargs)
+        expected = conv_im2col_gemm(**feeds, **kwargs)
+        got = _conv_implementation(**feeds, **kwargs)
         assert_allclose(got, expected)
 
     def test_conv_im2col_3d(self):
@@ -4178,8 +4602,8 @@ class TestReferenceEvaluator(unittest.TestCase):
             strides=[1, 1, 1],
             auto_pad="NOTSET",
         )
-        expected = _conv_implementation(**feeds, **kwargs)
-        got = _conv_implementation_im2col(**feeds, **kwargs)
+        expected = conv_im2col_gemm(**feeds, **kwargs)
+        got = _conv_implementation(**feeds, **kwargs)
         assert_allclose(got, expected)
 
     def test_conv_im2col_2d_strides(self):
@@ -4196,8 +4620,8 @@ class TestReferenceEvaluator(unittest.TestCase):
             strides=[2, 2],
             auto_pad="NOTSET",
         )
-        expected = _conv_implementation(**feeds, **kwargs)
-        got = _conv_implementation_im2col(**feeds, **kwargs)
+        expected = conv_im2col_gemm(**feeds, **kwargs)
+        got = _conv_implementation(**feeds, **kwargs)
         assert_allclose(got, expected)
 
     def test_conv_im2col_2d_dilations(self):
@@ -4214,10 +4638,75 @@ class TestReferenceEvaluator(unittest.TestCase):
             strides=[2, 2],
             auto_pad="NOTSET",
         )
-        expected = _conv_implementation(**feeds, **kwargs)
-        got = _conv_implementation_im2col(**feeds, **kwargs)
+        expected = conv_im2col_gemm(**feeds, **kwargs)
+        got = _conv_implementation(**feeds, **kwargs)
         assert_allclose(got, expected)
 
+    @parameterized.parameterized.expand(
+        [
+            (2, 4, [1, 2, 0, 1], "NOTSET"),
+            (6, 6, [1, 2, 0, 1], "NOTSET"),
+            (6, 12, None, "SAME_LOWER"),
+            (3, 6, None, "SAME_UPPER"),
+            (1, 2, None, "VALID"),
+        ]
+    )
+    def test_conv_groups(self, group, n_out, pads, auto_pad):
+        def direct(x, w, b, pads):
+            # x is padded, the convolution is computed element by element
+            x = np.pad(x, ((0, 0), (0, 0), (pads[0], pads[2]), (pads[1], pads[3])))
+            kh, kw = 2 * (w.shape[2] - 1) + 1, w.shape[3]
+            out_h, out_w = (x.shape[2] - kh) // 2 + 1, x.shape[3] - kw + 1
+            y = np.empty((x.shape[0], w.shape[0], out_h, out_w), dtype=np.float64)
+            for n, m, i, j in np.ndindex(y.shape):
+                g = m // (w.shape[0] // group)
+                c = slice(g * w.shape[1], (g + 1) * w.shape[1])
+                window = x[n, c, i * 2 : i * 2 + kh : 2, j : j + kw]
+                y[n, m, i, j] = (window * w[m]).sum() + b[m]
+            return y
+
+        rng = np.random.default_rng(0)
+        x = rng.standard_normal((2, 6, 9, 8)).astype(np.float32)
+        w = rng.standard_normal((n_out, 6 // group, 3, 2)).astype(np.float32)
+        b = rng.standard_normal((n_out,)).astype(np.float32)
+        kwargs = dict(
+            group=group,
+            dilations=[2, 1],
+            kernel_shape=[3, 2],
+            pads=pads,
+            strides=[2, 1],
+            auto_pad=auto_pad,
+        )
+        # output shape is (ceil(9 / 2), 8), dilated kernel is (5, 2)
+        explicit_pads = {
+            "NOTSET": pads,
+            "SAME_LOWER": [2, 1, 2, 0],
+            "SAME_UPPER": [2, 0, 2, 1],
+            "VALID": [0, 0, 0, 0],
+        }[auto_pad]
+        expected = direct(x, w, b, explicit_pads)
+        got = _conv_implementation(x, w, b, **kwargs)
+        assert_allclose(got, expected, rtol=1e-5, atol=1e-5)
+
+        node = make_node("Conv", ["X", "W", "B"], ["Y"], **kwargs)
+        model = make_model(
+            make_graph(
+                [node],
+                "g",
+                [
+                    make_tensor_value_info("X", TensorProto.FLOAT, None),
+                    make_tensor_value_info("W", TensorProto.FLOAT, None),
+                    make_tensor_value_info("B", TensorProto.FLOAT, None),
+                ],
+                [make_tensor_value_info("Y", TensorProto.FLOAT, None)],
+            )
+        )
+        for optimized in [False, True]:
+            ref = ReferenceEvaluator(model, optimized=optimized)
+            got = ref.run(None, {"X": x, "W": w, "B": b})[0]
+            self.assertEqual(got.dtype, np.float32)
+            assert_allclose(got, expected, rtol=1e-5, atol=1e-5)
+
     @parameterized.parameterized.expand(
         [
             ("ReduceSum",),
@@ -5669,6 +6158,31 @@ class TestReferenceEvaluator(unittest.TestCase):
         with self.assertRaises(ValueError):
             ref.run(None, {"X": np.array(["x"])})
 
+    def test_string_normalizer_repeated_values(self):
+        X = make_tensor_value_info("X", TensorProto.STRING, None)
+        Y = make_tensor_value_info("Y", TensorProto.STRING, None)
+        node = make_node(
+            "StringNormalizer",
+            inputs=["X"],
+            outputs=["Y"],
+            case_change_action="UPPER",
+            is_case_sensitive=0,
+            stopwords=["the"],
+        )
+        model = make_model(make_graph([node], "g", [X], [Y]))
+        ref = ReferenceEvaluator(model)
+        x = np.array(
+            [["The café", "monday"], ["the", "The café"], ["monday", np.nan]],
+            dtype=object,
+        )
+        expected = np.array(
+            [["CAFE", "MONDAY"], ["", "CAFE"], ["MONDAY", ""]], dtype=object
+        )
+        for _ in range(2):
+            result = ref.run(None, {"X": x})[0]
+            self.assertEqual(result.tolist(), expected.tolist())
+        self.assertEqual(len(ref.rt_nodes_[0]._stops), 1)
+
     @parameterized.parameterized.expand(
         [
             (
@@ -6338,6 +6852,167 @@ class TestReferenceEvaluator(unittest.TestCase):
         assert_allclose(got, expected)
         self.assertEqual(got.shape, (1, 1, 1))
 
+    def test_loop_scan_outputs_many_iterations(self):
+        # Scan outputs are concatenated along the first axis like np.vstack,
+        # the number of iterations exceeds several times the buffer capacity.
+        body = make_graph(
+            [
+                make_node("Identity", ["cond_in"], ["cond_out"]),
+                make_node("Add", ["s_in", "one"], ["s_out"]),
+                make_node("Identity", ["iter"], ["iter_out"]),
+                make_node("Identity", ["s_out"], ["s_scan"]),
+            ],
+            "body",
+            [
+                make_tensor_value_info("iter", TensorProto.INT64, []),
+                make_tensor_value_info("cond_in", TensorProto.BOOL, []),
+                make_tensor_value_info("s_in", TensorProto.FLOAT, [2]),
+            ],
+            [
+                make_tensor_value_info("cond_out", TensorProto.BOOL, []),
+                make_tensor_value_info("s_out", TensorProto.FLOAT, [2]),
+                make_tensor_value_info("iter_out", TensorProto.INT64, []),
+                make_tensor_value_info("s_scan", TensorProto.FLOAT, [2]),
+            ],
+        )
+        graph = make_graph(
+            [
+                make_node("Constant", [], ["one"], value_float=1.0),
+                make_node(
+                    "Loop",
+                    ["M", "cond", "X"],
+                    ["S", "iters", "states"],
+                    body=body,
+                ),
+            ],
+            "g",
+            [
+                make_tensor_value_info("M", TensorProto.INT64, []),
+                make_tensor_value_info("cond", TensorProto.BOOL, []),
+                make_tensor_value_info("X", TensorProto.FLOAT, [2]),
+            ],
+            [
+                make_tensor_value_info("S", TensorProto.FLOAT, [2]),
+                make_tensor_value_info("iters", TensorProto.INT64, None),
+                make_tensor_value_info("states", TensorProto.FLOAT, None),
+            ],
+        )
+        sess = ReferenceEvaluator(
+            make_model(graph, opset_imports=[make_opsetid("", 18)])
+        )
+        x = np.array([0, 10], dtype=np.float32)
+        s, iters, states = sess.run(
+            None, {"M": np.array(100, dtype=np.int64), "cond": np.array(True), "X": x}
+        )
+        assert_allclose(s, x + 100)
+        assert_allclose(iters, np.arange(100).reshape((-1, 1)))
+        assert_allclose(states, x + np.arange(1, 101, dtype=np.float32)[:, None])
+
+    def test_loop_nested_if_captured_names(self):
+        # The If branches read Y and Z from the main graph through the loop
+        # body, the else branch returns Z without computing it.
+        then_branch = make_graph(
+            [make_node("Add", ["s_in", "Y"], ["a"])],
+            "then_branch",
+            [],
+            [make_tensor_value_info("a", TensorProto.FLOAT, [2])],
+        )
+        else_branch = make_graph(
+            [], "else_branch", [], [make_tensor_value_info("Z", TensorProto.FLOAT, [2])]
+        )
+        body = make_graph(
+            [
+                make_node("Identity", ["cond_in"], ["cond_out"]),
+                make_node("Mod", ["iter", "two"], ["r"]),
+                make_node("Equal", ["r", "zero"], ["even"]),
+                make_node(
+                    "If",
+                    ["even"],
+                    ["t"],
+                    then_branch=then_branch,
+                    else_branch=else_branch,
+                ),
+                make_node("Identity", ["t"], ["s_out"]),
+                make_node("Identity", ["t"], ["s_scan"]),
+            ],
+            "body",
+            [
+                make_tensor_value_info("iter", TensorProto.INT64, []),
+                make_tensor_value_info("cond_in", TensorProto.BOOL, []),
+                make_tensor_value_info("s_in", TensorProto.FLOAT, [2]),
+            ],
+            [
+                make_tensor_value_info("cond_out", TensorProto.BOOL, []),
+                make_tensor_value_info("s_out", TensorProto.FLOAT, [2]),
+                make_tensor_value_info("s_scan", TensorProto.FLOAT, [2]),
+            ],
+        )
+        graph = make_graph(
+            [
+                make_node("Constant", [], ["two"], value_int=2),
+                make_node("Constant", [], ["zero"], value_int=0),
+                make_node("Neg", ["Y"], ["Z"]),
+                make_node("Loop", ["M", "cond", "X"], ["S", "states"], body=body),
+            ],
+            "g",
+            [
+                make_tensor_value_info("M", TensorProto.INT64, []),
+                make_tensor_value_info("cond", TensorProto.BOOL, []),
+                make_tensor_value_info("X", TensorProto.FLOAT, [2]),
+                make_tensor_value_info("Y", TensorProto.FLOAT, [2]),
+            ],
+            [
+                make_tensor_value_info("S", TensorProto.FLOAT, [2]),
+                make_tensor_value_info("states", TensorProto.FLOAT, None),
+            ],
+        )
+        model = make_model(graph, opset_imports=[make_opsetid("", 18)])
+        x = np.array([1, 2], dtype=np.float32)
+        y = np.array([10, 20], dtype=np.float32)
+        feeds = {"M": np.array(3, dtype=np.int64), "cond": np.array(True)}
+        feeds.update({"X": x, "Y": y})
+        for compiled in [False, True]:
+            with self.subTest(compiled=compiled):
+                sess = ReferenceEvaluator(model, compiled=compiled)
+                self.assertEqual(
+                    sess.rt_nodes_[-1].subgraph_captures_,
+                    {"body": ["two", "zero", "Z", "Y"]},
+                )
+                s, states = sess.run(None, feeds)
+                assert_allclose(s, np.zeros_like(x))
+                assert_allclose(states, np.vstack([x + y, -y, np.zeros_like(x)]))
+
+    def test_sequence_map_captured_name(self):
+        body = make_graph(
+            [make_node("Add", ["x", "Y"], ["z"])],
+            "body",
+            [make_tensor_value_info("x", TensorProto.FLOAT, None)],
+            [make_tensor_value_info("z", TensorProto.FLOAT, None)],
+        )
+        graph = make_graph(
+            [
+                make_node("SplitToSequence", ["X"], ["seq"], keepdims=0),
+                make_node("SequenceMap", ["seq"], ["res"], body=body),
+            ],
+            "g",
+            [
+                make_tensor_value_info("X", TensorProto.FLOAT, [3, 2]),
+                make_tensor_value_info("Y", TensorProto.FLOAT, [2]),
+            ],
+            [
+                make_tensor_sequence_value_info("res", TensorProto.FLOAT, None),
+            ],
+        )
+        sess = ReferenceEvaluator(
+            make_model(graph, opset_imports=[make_opsetid("", 18)])
+        )
+        x = np.arange(6, dtype=np.float32).reshape((3, 2))
+        y = np.array([10, 20], dtype=np.float32)
+        (got,) = sess.run(None, {"X": x, "Y": y})
+        self.assertEqual(len(got), 3)
+        for row, value in zip(x, got, strict=True):
+            assert_allclose(value, row + y)
+
     def test_scan_zero_scan_outputs(self):
         # Regression test: a Scan node with K=0 scan outputs (only loop-state
         # variables threaded through, no per-iteration accumulated outputs) is
@@ -6552,6 +7227,374 @@ class TestReferenceEvaluator(unittest.TestCase):
         assert_allclose(got_state, expected_state)
         assert_allclose(got_output, expected_output)
 
+    @staticmethod
+    def _chain_model(n_nodes: int = 5) -> ModelProto:
+        X = make_tensor_value_info("X", TensorProto.FLOAT, [None, None])
+        Y = make_tensor_value_info("Y", TensorProto.FLOAT, [None, None])
+        nodes = [
+            make_node("Neg", [f"X{i}" if i else "X"], [f"X{i + 1}"])
+            for i in range(n_nodes - 1)
+        ]
+        nodes.append(make_node("Neg", [f"X{n_nodes - 1}"], ["Y"]))
+        return make_model(
+            make_graph(nodes, "chain", [X], [Y]),
+            opset_imports=[make_opsetid("", 18)],
+        )
+
+    def test_free_intermediates_peak_bytes(self):
+        model = self._chain_model()
+        x = np.ones((100, 100), dtype=np.float32)
+        sess = ReferenceEvaluator(model)
+        got = sess.run(None, {"X": x})[0]
+        assert_allclose(-x, got)
+        # input, one intermediate and the output
+        self.assertEqual(sess.peak_bytes, 3 * x.nbytes)
+
+        sess_keep = ReferenceEvaluator(model, free_intermediates=False)
+        got = sess_keep.run(None, {"X": x})[0]
+        assert_allclose(-x, got)
+        self.assertEqual(sess_keep.peak_bytes, 6 * x.nbytes)
+
+        results = sess.run(None, {"X": x}, intermediate=True)
+        self.assertEqual(set(results), {"", "X", "X1", "X2", "X3", "X4", "Y"})
+
+    def test_free_intermediates_requested_intermediate(self):
+        model = self._chain_model()
+        x = np.ones((2, 2), dtype=np.float32)
+        sess = ReferenceEvaluator(model)
+        x2, y = sess.run(["X2", "Y"], {"X": x})
+        assert_allclose(x, x2)
+        assert_allclose(-x, y)
+
+    @staticmethod
+    def _if_capture_model() -> ModelProto:
+        # "XN" is only consumed inside the branches of If.
+        then_out = make_tensor_value_info("T", TensorProto.FLOAT, [None])
+        then_body = make_graph(
+            [
+                make_node(
+                    "If",
+                    ["cond"],
+                    ["T"],
+                    then_branch=make_graph(
+                        [make_node("Identity", ["XN"], ["T"])], "inner", [], [then_out]
+                    ),
+                    else_branch=make_graph(
+                        [make_node("Neg", ["XN"], ["T"])], "inner2", [], [then_out]
+                    ),
+                )
+            ],
+            "gthen",
+            [],
+            [then_out],
+        )
+        else_body = make_graph(
+            [make_node("Abs", ["XN"], ["T"])], "gelse", [], [then_out]
+        )
+        X = make_tensor_value_info("X", TensorProto.FLOAT, [None])
+        cond = make_tensor_value_info("cond", TensorProto.BOOL, [])
+        Z = make_tensor_value_info("Z", TensorProto.FLOAT, [None])
+        graph = make_graph(
+            [
+                make_node("Neg", ["X"], ["XN"]),
+                make_node("Identity", ["cond"], ["cond2"]),
+                make_node(
+                    "If",
+                    ["cond2"],
+                    ["Z"],
+                    then_branch=then_body,
+                    else_branch=else_body,
+                ),
+            ],
+            "g",
+            [X, cond],
+            [Z],
+        )
+        return make_model(graph, opset_imports=[make_opsetid("", 18)])
+
+    def test_free_intermediates_subgraph_capture(self):
+        # "XN" must remain available until If is executed.
+        sess = ReferenceEvaluator(self._if_capture_model())
+        _, release_plan = sess._get_plan(("Z",))
+        self.assertEqual(release_plan, [[], [], ["XN", "cond2"]])
+        x = np.array([1, -2], dtype=np.float32)
+        got = sess.run(None, {"X": x, "cond": np.array(True)})[0]
+        assert_allclose(-x, got)
+        got = sess.run(None, {"X": x, "cond": np.array(False)})[0]
+        assert_allclose(np.abs(x), got)
+
+    def test_run_prunes_unrequested_outputs(self):
+        X1 = make_tensor_value_info("X1", TensorProto.FLOAT, [None])
+        X2 = make_tensor_value_info("X2", TensorProto.FLOAT, [None])
+        Y1 = make_tensor_value_info("Y1", TensorProto.FLOAT, [None])
+        Y2 = make_tensor_value_info("Y2", TensorProto.FLOAT, [None])
+        model = make_model(
+            make_graph(
+                [
+                    make_node("Neg", ["X1"], ["N1"]),
+                    make_node("Neg", ["X2"], ["N2"]),
+                    make_node("Abs", ["N1"], ["Y1"]),
+                    make_node("Add", ["N1", "N2"], ["Y2"]),
+                ],
+                "heads",
+                [X1, X2],
+                [Y1, Y2],
+            ),
+            opset_imports=[make_opsetid("", 18)],
+        )
+        sess = ReferenceEvaluator(model)
+        x1 = np.array([1, -2], dtype=np.float32)
+        x2 = np.array([3, 4], dtype=np.float32)
+
+        # X2 is not needed to compute Y1.
+        got = sess.run(["Y1"], {"X1": x1})[0]
+        assert_allclose(np.abs(x1), got)
+        nodes, release_plan = sess._get_plan(("Y1",))
+        self.assertEqual([n.op_type for n in nodes], ["Neg", "Abs"])
+        self.assertEqual(release_plan, [[], ["N1"]])
+        self.assertIn(("Y1",), sess.plans_)
+
+        got = sess.run(["Y2"], {"X1": x1, "X2": x2})[0]
+        assert_allclose(-x1 - x2, got)
+        nodes, _ = sess._get_plan(("Y2",))
+        self.assertEqual([n.op_type for n in nodes], ["Neg", "Neg", "Add"])
+
+        y1, y2 = sess.run(None, {"X1": x1, "X2": x2})
+        assert_allclose(np.abs(x1), y1)
+        assert_allclose(-x1 - x2, y2)
+        self.assertEqual(len(sess._get_plan(("Y1", "Y2"))[0]), 4)
+
+    def test_compiled_run(self):
+        model = self._chain_model()
+        x = np.arange(6).reshape((2, 3)).astype(np.float32)
+        sess = ReferenceEvaluator(model, compiled=True)
+        got = sess.run(None, {"X": x})[0]
+        assert_allclose(-x, got)
+        self.assertIn(("Y",), sess.compiled_plans_)
+        x2, y = sess.run(["X2", "Y"], {"X": x})
+        assert_allclose(x, x2)
+        assert_allclose(-x, y)
+        with self.assertRaises(RuntimeError):
+            sess.run(None, {"Z": x})
+
+        sess = ReferenceEvaluator(self._if_capture_model(), compiled=True)
+        x = np.array([1, -2], dtype=np.float32)
+        got = sess.run(None, {"X": x, "cond": np.array(True)})[0]
+        assert_allclose(-x, got)
+        got = sess.run(None, {"X": x, "cond": np.array(False)})[0]
+        assert_allclose(np.abs(x), got)
+        self.assertTrue(sess.rt_nodes_[-1].then_branch.compiled)
+
+    def test_parallel_run(self):
+        n_branches = 8
+        X = make_tensor_value_info("X", TensorProto.FLOAT, [None, None])
+        Y = make_tensor_value_info("Y", TensorProto.FLOAT, [None, None])
+        nodes = [make_node("Identity", ["X"], ["X0"])]
+        inits = []
+        for i in range(n_branches):
+            inits.append(
+                from_array(
+                    np.arange(16).reshape((4, 4)).astype(np.float32) / (i + 1),
+                    name=f"W{i}",
+                )
+            )
+            nodes.extend(
+                [
+                    make_node("MatMul", ["X0", f"W{i}"], [f"M{i}"]),
+                    make_node("Tanh", [f"M{i}"], [f"T{i}"]),
+                ]
+            )
+        nodes.append(
+            make_node("Concat", [f"T{i}" for i in range(n_branches)], ["Y"], axis=1)
+        )
+        model = make_model(
+            make_graph(nodes, "branches", [X], [Y], initializer=inits),
+            opset_imports=[make_opsetid("", 18)],
+        )
+        x = np.random.default_rng(0).standard_normal((32, 4)).astype(np.float32)
+        expected = ReferenceEvaluator(model).run(None, {"X": x})[0]
+
+        sess = ReferenceEvaluator(model, parallel=4)
+        for _ in range(3):
+            got = sess.run(None, {"X": x})[0]
+            np.testing.assert_array_equal(expected, got)
+        plan = sess._get_dependency_plan(("Y",))
+        self.assertEqual(len(plan.successors[0]), n_branches)
+        self.assertEqual(plan.n_deps[-1], n_branches)
+        self.assertIsNotNone(sess.executor_)
+        sess.close()
+        self.assertIsNone(sess.executor_)
+
+        with ReferenceEvaluator(model, parallel=4) as sess:
+            got = sess.run(None, {"X": x})[0]
+            np.testing.assert_array_equal(expected, got)
+            executor = sess.executor_
+            self.assertIsNotNone(executor)
+        self.assertIsNone(sess.executor_)
+        self.assertTrue(executor._shutdown)
+
+        with self.assertRaises(RuntimeError):
+            sess.run(None, {"Z": x})
+
+        sess = ReferenceEvaluator(self._if_capture_model(), parallel=2)
+        x = np.array([1, -2], dtype=np.float32)
+        got = sess.run(None, {"X": x, "cond": np.array(True)})[0]
+        assert_allclose(-x, got)
+
+    def test_run_batch(self):
+        X = make_tensor_value_info("X", TensorProto.FLOAT, ["N", 3])
+        Y = make_tensor_value_info("Y", TensorProto.FLOAT, ["N", 2])
+        W = from_array(np.arange(6).reshape((3, 2)).astype(np.float32), name="W")
+        model = make_model(
+            make_graph(
+                [
+                    make_node("MatMul", ["X", "W"], ["XW"]),
+                    make_node("Relu", ["XW"], ["Y"]),
+                ],
+                "batch",
+                [X],
+                [Y],
+                initializer=[W],
+            ),
+            opset_imports=[make_opsetid("", 18)],
+        )
+        sess = ReferenceEvaluator(model)
+        self.assertEqual(sess.batch_dimension_, "N")
+        rng = np.random.default_rng(0)
+        list_of_feeds = [
+            {"X": rng.standard_normal((n, 3)).astype(np.float32)} for n in [1, 3, 2]
+        ]
+        got = sess.run_batch(None, list_of_feeds)
+        self.assertEqual(len(got), 3)
+        for feeds, outputs in zip(list_of_feeds, got, strict=True):
+            expected = sess.run(None, feeds)
+            self.assertEqual(len(outputs), 1)
+            assert_allclose(expected[0], outputs[0])
+
+        # incompatible shapes, every set of inputs is run separately
+        self.assertIsNone(
+            sess._batch_sizes(
+                [
+                    {"X": np.zeros((1, 3), dtype=np.float32)},
+                    {"X": np.zeros((1, 3), dtype=np.float64)},
+                ]
+            )
+        )
+
+        # no named batch dimension
+        sess = ReferenceEvaluator(self._chain_model())
+        self.assertIsNone(sess.batch_dimension_)
+        x = np.ones((2, 2), dtype=np.float32)
+        got = sess.run_batch(None, [{"X": x}, {"X": 2 * x}])
+        assert_allclose(-x, got[0][0])
+        assert_allclose(-2 * x, got[1][0])
+
+    def test_lazy_initializers(self):
+        out = make_tensor_value_info("T", TensorProto.FLOAT, [None])
+        then_branch = make_graph(
+            [make_node("Add", ["X", "A"], ["T"])],
+            "then",
+            [],
+            [out],
+            initializer=[from_array(np.array([1], dtype=np.float32), name="A")],
+        )
+        else_branch = make_graph(
+            [make_node("Add", ["X", "B"], ["T"])],
+            "else",
+            [],
+            [out],
+            initializer=[from_array(np.array([2], dtype=np.float32), name="B")],
+        )
+        model = make_model(
+            make_graph(
+                [
+                    make_node(
+                        "If",
+                        ["cond"],
+                        ["Z"],
+                        then_branch=then_branch,
+                        else_branch=else_branch,
+                    ),
+                    make_node("Mul", ["X", "U"], ["W"]),
+                ],
+                "g",
+                [
+                    make_tensor_value_info("X", TensorProto.FLOAT, [None]),
+                    make_tensor_value_info("cond", TensorProto.BOOL, []),
+                ],
+                [
+                    make_tensor_value_info("Z", TensorProto.FLOAT, [None]),
+                    make_tensor_value_info("W", TensorProto.FLOAT, [None]),
+                ],
+                initializer=[from_array(np.array([3], dtype=np.float32), name="U")],
+            ),
+            opset_imports=[make_opsetid("", 18)],
+        )
+        x = np.array([1, -2], dtype=np.float32)
+        for compiled in [False, True]:
+            with self.subTest(compiled=compiled):
+                sess = ReferenceEvaluator(
+                    model, lazy_initializers=True, compiled=compiled
+                )
+                if_node = sess.rt_nodes_[0]
+                self.assertEqual(sess.rt_inits_.cache, {})
+                got = sess.run(["Z"], {"X": x, "cond": np.array(True)})[0]
+                assert_allclose(x + 1, got)
+                self.assertEqual(sess.rt_inits_.cache, {})
+                self.assertEqual(list(if_node.then_branch.rt_inits_.cache), ["A"])
+                self.assertEqual(if_node.else_branch.rt_inits_.cache, {})
+                got = sess.run(None, {"X": x, "cond": np.array(False)})
+                assert_allclose(x + 2, got[0])
+                assert_allclose(x * 3, got[1])
+                self.assertEqual(list(sess.rt_inits_.cache), ["U"])
+                self.assertEqual(list(if_node.else_branch.rt_inits_.cache), ["B"])
+        self.assertIsInstance(ReferenceEvaluator(model).rt_inits_, dict)
+
+    def test_lazy_initializers_captured(self):
+        # W1 and W2 are initializers of the main graph only
+        # the branch taken reads
+        out = make_tensor_value_info("T", TensorProto.FLOAT, [None])
+        model = make_model(
+            make_graph(
+                [
+                    make_node(
+                        "If",
+                        ["cond"],
+                        ["Z"],
+                        then_branch=make_graph(
+                            [make_node("Add", ["X", "W1"], ["T"])], "then", [], [out]
+                        ),
+                        else_branch=make_graph(
+                            [make_node("Add", ["X", "W2"], ["T"])], "else", [], [out]
+                        ),
+                    )
+                ],
+                "g",
+                [
+                    make_tensor_value_info("X", TensorProto.FLOAT, [None]),
+                    make_tensor_value_info("cond", TensorProto.BOOL, []),
+                ],
+                [make_tensor_value_info("Z", TensorProto.FLOAT, [None])],
+                initializer=[
+                    from_array(np.array([1], dtype=np.float32), name="W1"),
+                    from_array(np.array([2], dtype=np.float32), name="W2"),
+                ],
+            ),
+            opset_imports=[make_opsetid("", 18)],
+        )
+        x = np.array([1, -2], dtype=np.float32)
+        for kwargs in [{}, {"compiled": True}, {"parallel": 2}]:
+            with (
+                self.subTest(**kwargs),
+                ReferenceEvaluator(model, lazy_initializers=True, **kwargs) as sess,
+            ):
+                got = sess.run(None, {"X": x, "cond": np.array(False)})[0]
+                assert_allclose(x + 2, got)
+                self.assertEqual(list(sess.rt_inits_.cache), ["W2"])
+                got = sess.run(None, {"X": x, "cond": np.array(True)})[0]
+                assert_allclose(x + 1, got)
+                self.assertEqual(sorted(sess.rt_inits_.cache), ["W1", "W2"])
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -13291,6 +13291,88 @@ class TestShapeInference(TestShapeInferenceHelper):
         with self.assertRaises(onnx.shape_inference.InferenceError):
             onnx.shape_inference.infer_shapes(model, strict_mode=True)
 
+    def test_infer_shapes_initializer_size_threshold(self) -> None:
+        graph = make_graph(
+            [
+                make_node("Add", ["X", "W"], ["T"]),
+                make_node("Reshape", ["T", "shape"], ["Y"]),
+            ],
+            "g",
+            [make_tensor_value_info("X", TensorProto.FLOAT, ["N", 4096])],
+            [make_tensor_value_info("Y", TensorProto.FLOAT, None)],
+            [
+                onnx.numpy_helper.from_array(np.arange(4096, dtype=np.float32), "W"),
+                onnx.numpy_helper.from_array(np.array([-1, 1024]), "shape"),
+            ],
+        )
+        model = make_model(graph, opset_imports=[make_opsetid(ONNX_DOMAIN, 18)])
+        expected = onnx.shape_inference.infer_shapes(model, strict_mode=True)
+        # the values of shape are still available to shape inference
+        inferred = onnx.shape_inference.infer_shapes(
+            model, strict_mode=True, initializer_size_threshold=1024
+        )
+        self.assertEqual(inferred, expected)
+        self.assertEqual(
+            inferred.graph.output[0].type.tensor_type.shape.dim[1].dim_value, 1024
+        )
+
+    def test_incremental_shape_inference(self) -> None:
+        graph = make_graph(
+            [
+                make_node("Constant", [], ["axes"], value_ints=[0]),
+                make_node("Unsqueeze", ["X", "axes"], ["U"]),
+                make_node("Add", ["U", "W"], ["T"]),
+                make_node("Reshape", ["T", "shape"], ["Y"]),
+                make_node("Shape", ["Y"], ["S"]),
+            ],
+            "g",
+            [make_tensor_value_info("X", TensorProto.FLOAT, ["N", 4])],
+            [make_tensor_value_info("Y", TensorProto.FLOAT, None)],
+            [
+                onnx.numpy_helper.from_array(np.arange(4, dtype=np.float32), "W"),
+                onnx.numpy_helper.from_array(np.array([-1, 2]), "shape"),
+            ],
+        )
+        model = make_model(graph, opset_imports=[make_opsetid(ONNX_DOMAIN, 18)])
+        expected = onnx.shape_inference.infer_shapes(model, strict_mode=True)
+        expected_types = {vi.name: vi.type for vi in expected.graph.value_info}
+        expected_types["Y"] = expected.graph.output[0].type
+
+        inference = onnx.shape_inference.IncrementalShapeInference(
+            model.opset_import, ir_version=model.ir_version, strict_mode=True
+        )
+        inference.add_value_infos(model.graph.input)
+        inference.add_initializers(model.graph.initializer)
+        for node in model.graph.node:
+            output_types = inference.infer_node(node)
+            self.assertEqual(
+                output_types, {name: expected_types[name] for name in node.output}
+            )
+        # the values of shape are used by Reshape
+        self.assertEqual(
+            inference.get_type("Y").tensor_type.shape.dim[1].dim_value,  # type: ignore[union-attr]
+            2,
+        )
+        self.assertEqual(inference.get_type("X"), model.graph.input[0].type)
+        self.assertIsNone(inference.get_type("Z"))
+
+    def test_incremental_shape_inference_errors(self) -> None:
+        node = make_node("Add", ["X", "W"], ["Y"])
+        inputs = [
+            make_tensor_value_info("X", TensorProto.FLOAT, [2]),
+            make_tensor_value_info("W", TensorProto.FLOAT, [3]),
+        ]
+        opset_imports = [make_opsetid(ONNX_DOMAIN, 18)]
+        inference = onnx.shape_inference.IncrementalShapeInference(opset_imports)
+        inference.add_value_infos(inputs)
+        self.assertEqual(inference.infer_node(node), {})
+        inference = onnx.shape_inference.IncrementalShapeInference(
+            opset_imports, strict_mode=True
+        )
+        inference.add_value_infos(inputs)
+        with self.assertRaises(onnx.shape_inference.InferenceError):
+            inference.infer_node(node)
+
     def test_infer_shapes_pathlike_error(self) -> None:
         with self.assertRaisesRegex(
             TypeError,
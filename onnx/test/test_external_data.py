@@ -33,6 +33,7 @@ from onnx.external_data_helper import (
     convert_model_to_external_data,
     load_external_data_for_model,
     load_external_data_for_tensor,
+    map_external_data_for_tensor,
     save_external_data,
     set_external_data,
 )
@@ -1320,6 +1321,44 @@ class TestLoadExternalDataFileSizeValidation(TestLoadExternalDataBase):
         load_external_data_for_tensor(tensor, self.temp_dir)
         self.assertEqual(tensor.raw_data, raw)
 
+    def test_map_external_data_with_offset(self) -> None:
+        """Mapped data starting at an unaligned offset must match the array."""
+        array = np.array([1.0, 2.0, 3.0, 4.0], dtype=np.float32)
+        tensor = from_array(array, name="weight")
+        raw = tensor.raw_data
+
+        data_path = os.path.join(self.temp_dir, "data.bin")
+        with open(data_path, "wb") as f:
+            f.write(b"\x00" * 12)
+            f.write(raw)
+
+        set_external_data(tensor, location="data.bin", offset=12, length=len(raw))
+        tensor.ClearField("raw_data")
+
+        view = map_external_data_for_tensor(tensor, self.temp_dir)
+        self.assertEqual(view.tobytes(), raw)
+        self.assertFalse(tensor.HasField("raw_data"))
+
+        mapped = to_array(tensor, self.temp_dir, mmap=True)
+        np.testing.assert_array_equal(mapped, array)
+        self.assertFalse(mapped.flags.writeable)
+        self.assertFalse(tensor.HasField("raw_data"))
+
+    def test_map_length_exceeds_available_data_raises(self) -> None:
+        """Mapping checks the bounds the same way loading does."""
+        array = np.ones((4,), dtype=np.float32)
+        tensor = from_array(array, name="weight")
+
+        data_path = os.path.join(self.temp_dir, "data.bin")
+        with open(data_path, "wb") as f:
+            f.write(tensor.raw_data)
+
+        set_external_data(tensor, location="data.bin", length=1000)
+        tensor.ClearField("raw_data")
+
+        with self.assertRaisesRegex(ValueError, "length.*exceeds available data"):
+            map_external_data_for_tensor(tensor, self.temp_dir)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,98 @@
+# Copyright (c) ONNX Project Contributors
+#
+# SPDX-License-Identifier: Apache-2.0
+"""Measure the per-node overhead of ReferenceEvaluator.
+
+The benchmark builds a graph made of many small operators
+(Shape, Gather, Unsqueeze, Concat, Reshape) for which the time spent
+in python dispatch dominates the time spent in numpy and compares
+the default execution with ``compiled=True``.
+
+::
+
+    python tools/benchmark_reference_evaluator.py --blocks 1000 --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+import onnx
+from onnx import TensorProto
+from onnx.helper import (
+    make_graph,
+    make_model,
+    make_node,
+    make_opsetid,
+    make_tensor_value_info,
+)
+from onnx.numpy_helper import from_array
+from onnx.reference import ReferenceEvaluator
+
+
+def make_shape_model(n_blocks: int) -> onnx.ModelProto:
+    """Every block reshapes its input into the same shape."""
+    nodes = []
+    name = "X"
+    for i in range(n_blocks):
+        nodes.extend(
+            [
+                make_node("Shape", [name], [f"shape{i}"]),
+                make_node("Gather", [f"shape{i}", "zero"], [f"dim0_{i}"]),
+                make_node("Gather", [f"shape{i}", "one"], [f"dim1_{i}"]),
+                make_node("Unsqueeze", [f"dim0_{i}", "axis"], [f"u0_{i}"]),
+                make_node("Unsqueeze", [f"dim1_{i}", "axis"], [f"u1_{i}"]),
+                make_node("Concat", [f"u0_{i}", f"u1_{i}"], [f"new_shape{i}"], axis=0),
+                make_node("Reshape", [name, f"new_shape{i}"], [f"X{i}"]),
+            ]
+        )
+        name = f"X{i}"
+    nodes.append(make_node("Identity", [name], ["Y"]))
+    graph = make_graph(
+        nodes,
+        "shape_arithmetic",
+        [make_tensor_value_info("X", TensorProto.FLOAT, [None, None])],
+        [make_tensor_value_info("Y", TensorProto.FLOAT, [None, None])],
+        initializer=[
+            from_array(np.array(0, dtype=np.int64), name="zero"),
+            from_array(np.array(1, dtype=np.int64), name="one"),
+            from_array(np.array([0], dtype=np.int64), name="axis"),
+        ],
+    )
+    return make_model(graph, opset_imports=[make_opsetid("", 18)])
+
+
+def measure(sess: ReferenceEvaluator, feeds: dict[str, np.ndarray], repeat: int):
+    sess.run(None, feeds)  # warmup, the compiled plan is built here
+    begin = time.perf_counter()
+    for _ in range(repeat):
+        sess.run(None, feeds)
+    return (time.perf_counter() - begin) / repeat
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--blocks", type=int, default=500, help="number of blocks")
+    parser.add_argument("--repeat", type=int, default=10, help="number of runs")
+    args = parser.parse_args()
+
+    model = make_shape_model(args.blocks)
+    feeds = {"X": np.ones((4, 3), dtype=np.float32)}
+    n_nodes = len(model.graph.node)
+    timings = {}
+    for compiled in [False, True]:
+        sess = ReferenceEvaluator(model, compiled=compiled)
+        timings[compiled] = measure(sess, feeds, args.repeat)
+        print(
+            f"compiled={compiled!s:5}: {timings[compiled] * 1e3:.2f} ms per run, "
+            f"{timings[compiled] / n_nodes * 1e6:.2f} us per node"
+        )
+    print(f"speedup: {timings[False] / timings[True]:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,149 @@
+# Copyright (c) ONNX Project Contributors
+#
+# SPDX-License-Identifier: Apache-2.0
+"""Measure how ReferenceEvaluator scales with the number of iterations of Loop and Scan.
+
+Both models carry a state and produce one scan output per iteration,
+the way an autoregressive decoding loop does. The time per iteration
+should not depend on the number of iterations.
+
+::
+
+    python tools/benchmark_reference_loop.py --iterations 1000 2000 4000 8000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+import onnx
+from onnx import TensorProto
+from onnx.helper import (
+    make_graph,
+    make_model,
+    make_node,
+    make_opsetid,
+    make_tensor_value_info,
+)
+from onnx.reference import ReferenceEvaluator
+
+
+def make_loop_model(size: int) -> onnx.ModelProto:
+    """Loop(M, cond, state) -> (state, scan), state += 1 at every iteration."""
+    body = make_graph(
+        [
+            make_node("Identity", ["cond_in"], ["cond_out"]),
+            make_node("Add", ["state_in", "one"], ["state_out"]),
+            make_node("Identity", ["state_out"], ["scan_out"]),
+        ],
+        "body",
+        [
+            make_tensor_value_info("iter", TensorProto.INT64, []),
+            make_tensor_value_info("cond_in", TensorProto.BOOL, []),
+            make_tensor_value_info("state_in", TensorProto.FLOAT, [size]),
+        ],
+        [
+            make_tensor_value_info("cond_out", TensorProto.BOOL, []),
+            make_tensor_value_info("state_out", TensorProto.FLOAT, [size]),
+            make_tensor_value_info("scan_out", TensorProto.FLOAT, [size]),
+        ],
+    )
+    graph = make_graph(
+        [
+            make_node("Constant", [], ["one"], value_float=1.0),
+            make_node("Loop", ["M", "cond", "X"], ["state", "scan"], body=body),
+        ],
+        "loop",
+        [
+            make_tensor_value_info("M", TensorProto.INT64, []),
+            make_tensor_value_info("cond", TensorProto.BOOL, []),
+            make_tensor_value_info("X", TensorProto.FLOAT, [size]),
+        ],
+        [
+            make_tensor_value_info("state", TensorProto.FLOAT, [size]),
+            make_tensor_value_info("scan", TensorProto.FLOAT, [None, size]),
+        ],
+    )
+    return make_model(graph, opset_imports=[make_opsetid("", 18)])
+
+
+def make_scan_model(size: int) -> onnx.ModelProto:
+    """Scan(state, X) -> (state, scan), a cumulative sum over the rows of X."""
+    body = make_graph(
+        [
+            make_node("Add", ["state_in", "x"], ["state_out"]),
+            make_node("Identity", ["state_out"], ["scan_out"]),
+        ],
+        "body",
+        [
+            make_tensor_value_info("state_in", TensorProto.FLOAT, [size]),
+            make_tensor_value_info("x", TensorProto.FLOAT, [size]),
+        ],
+        [
+            make_tensor_value_info("state_out", TensorProto.FLOAT, [size]),
+            make_tensor_value_info("scan_out", TensorProto.FLOAT, [size]),
+        ],
+    )
+    graph = make_graph(
+        [
+            make_node(
+                "Scan", ["S", "X"], ["state", "scan"], body=body, num_scan_inputs=1
+            )
+        ],
+        "scan",
+        [
+            make_tensor_value_info("S", TensorProto.FLOAT, [size]),
+            make_tensor_value_info("X", TensorProto.FLOAT, [None, size]),
+        ],
+        [
+            make_tensor_value_info("state", TensorProto.FLOAT, [size]),
+            make_tensor_value_info("scan", TensorProto.FLOAT, [None, size]),
+        ],
+    )
+    return make_model(graph, opset_imports=[make_opsetid("", 18)])
+
+
+def measure(sess: ReferenceEvaluator, feeds: dict[str, np.ndarray], repeat: int):
+    sess.run(None, feeds)  # warmup
+    begin = time.perf_counter()
+    for _ in range(repeat):
+        sess.run(None, feeds)
+    return (time.perf_counter() - begin) / repeat
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        nargs="+",
+        default=[1000, 2000, 4000, 8000],
+        help="numbers of iterations",
+    )
+    parser.add_argument("--size", type=int, default=16, help="size of the state")
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs")
+    args = parser.parse_args()
+
+    loop = ReferenceEvaluator(make_loop_model(args.size))
+    scan = ReferenceEvaluator(make_scan_model(args.size))
+    x = np.zeros((args.size,), dtype=np.float32)
+    for n in args.iterations:
+        loop_feeds = {"M": np.array(n, dtype=np.int64), "cond": np.array(True), "X": x}
+        scan_feeds = {"S": x, "X": np.ones((n, args.size), dtype=np.float32)}
+        for name, sess, feeds in [
+            ("Loop", loop, loop_feeds),
+            ("Scan", scan, scan_feeds),
+        ]:
+            duration = measure(sess, feeds, args.repeat)
+            print(
+                f"{name} iterations={n:6d}: {duration * 1e3:8.2f} ms per run, "
+                f"{duration / n * 1e6:6.2f} us per iteration"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())